@@ -0,0 +1,120 @@
+"""added fingerprint field to address table
+
+Revision ID: a4c9e2f07b31
+Revises: f2a7d3c68e15
+Create Date: 2026-10-17 13:51:44.127389
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a4c9e2f07b31"
+down_revision = "f2a7d3c68e15"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def get_address_fingerprint(city, street, street_number, postal_code):
+    # copy of the model function, so the migration doesn't change with it
+    normalized_address = "\x1f".join(
+        " ".join(str(part).split()).casefold()
+        for part in (city, street, street_number, postal_code)
+    )
+    return hashlib.sha256(normalized_address.encode()).hexdigest()[:32]
+
+
+def upgrade() -> None:
+    op.add_column(
+        "addresses", sa.Column("fingerprint", sa.String(length=32), nullable=True)
+    )
+
+    connection = op.get_bind()
+    addresses = sa.table(
+        "addresses",
+        sa.column("id", sa.Integer),
+        sa.column("city", sa.String),
+        sa.column("street", sa.String),
+        sa.column("street_number", sa.Integer),
+        sa.column("postal_code", sa.String),
+        sa.column("fingerprint", sa.String),
+    )
+    update_fingerprint = (
+        sa.update(addresses)
+        .where(addresses.c.id == sa.bindparam("address_id"))
+        .values(fingerprint=sa.bindparam("address_fingerprint"))
+    )
+    last_id = 0
+
+    while rows := connection.execute(
+        sa.select(
+            addresses.c.id,
+            addresses.c.city,
+            addresses.c.street,
+            addresses.c.street_number,
+            addresses.c.postal_code,
+        )
+        .where(addresses.c.id > last_id)
+        .order_by(addresses.c.id)
+        .limit(BATCH_SIZE)
+    ).all():
+        connection.execute(
+            update_fingerprint,
+            [
+                {
+                    "address_id": row.id,
+                    "address_fingerprint": get_address_fingerprint(
+                        row.city, row.street, row.street_number, row.postal_code
+                    ),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    # orders of the addresses, which differ only by case or spaces, are moved
+    # to the oldest one
+    op.execute(
+        """
+        WITH duplicates AS (
+            SELECT id, min(id) OVER (PARTITION BY user_id, fingerprint) AS kept_id
+            FROM addresses
+        )
+        UPDATE orders SET address_id = duplicates.kept_id
+        FROM duplicates
+        WHERE orders.address_id = duplicates.id
+            AND duplicates.id != duplicates.kept_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM addresses USING addresses AS kept
+        WHERE addresses.user_id = kept.user_id
+            AND addresses.fingerprint = kept.fingerprint
+            AND addresses.id > kept.id
+        """
+    )
+    op.alter_column("addresses", "fingerprint", nullable=False)
+    op.create_index(
+        "ix_addresses_user_id_fingerprint",
+        "addresses",
+        ["user_id", "fingerprint"],
+        unique=True,
+    )
+    op.drop_index("ix_addresses_user_id_address", table_name="addresses")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_addresses_user_id_address",
+        "addresses",
+        ["user_id", "city", "street", "street_number", "postal_code"],
+        unique=True,
+    )
+    op.drop_index("ix_addresses_user_id_fingerprint", table_name="addresses")
+    op.drop_column("addresses", "fingerprint")
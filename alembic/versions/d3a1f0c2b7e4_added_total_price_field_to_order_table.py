@@ -0,0 +1,52 @@
+"""added total_price field to order table
+
+Revision ID: d3a1f0c2b7e4
+Revises: ac649cad1d9f
+Create Date: 2026-10-17 03:05:12.418265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d3a1f0c2b7e4"
+down_revision = "ac649cad1d9f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "orders",
+        sa.Column(
+            "total_price",
+            sa.Numeric(precision=10, scale=2),
+            server_default="0",
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE orders SET total_price = order_totals.total_price
+        FROM (
+            SELECT order_id, sum(product_price * quantity) AS total_price
+            FROM order_items
+            GROUP BY order_id
+        ) AS order_totals
+        WHERE orders.id = order_totals.order_id
+        """
+    )
+    op.create_index(
+        "ix_orders_user_id_total_price",
+        "orders",
+        ["user_id", "total_price"],
+        unique=False,
+    )
+    op.drop_index("ix_orders_user_id", table_name="orders")
+
+
+def downgrade() -> None:
+    op.create_index("ix_orders_user_id", "orders", ["user_id"], unique=False)
+    op.drop_index("ix_orders_user_id_total_price", table_name="orders")
+    op.drop_column("orders", "total_price")
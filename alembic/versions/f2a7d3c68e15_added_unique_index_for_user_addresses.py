@@ -0,0 +1,54 @@
+"""added unique index for user addresses
+
+Revision ID: f2a7d3c68e15
+Revises: e5b8c1d94a27
+Create Date: 2026-10-17 11:18:05.392746
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f2a7d3c68e15"
+down_revision = "e5b8c1d94a27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # orders of the duplicated addresses are moved to the oldest duplicate
+    op.execute(
+        """
+        WITH duplicates AS (
+            SELECT id, min(id) OVER (
+                PARTITION BY user_id, city, street, street_number, postal_code
+            ) AS kept_id
+            FROM addresses
+        )
+        UPDATE orders SET address_id = duplicates.kept_id
+        FROM duplicates
+        WHERE orders.address_id = duplicates.id
+            AND duplicates.id != duplicates.kept_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM addresses USING addresses AS kept
+        WHERE addresses.user_id = kept.user_id
+            AND addresses.city = kept.city
+            AND addresses.street = kept.street
+            AND addresses.street_number = kept.street_number
+            AND addresses.postal_code = kept.postal_code
+            AND addresses.id > kept.id
+        """
+    )
+    op.create_index(
+        "ix_addresses_user_id_address",
+        "addresses",
+        ["user_id", "city", "street", "street_number", "postal_code"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_addresses_user_id_address", table_name="addresses")
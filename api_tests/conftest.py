@@ -1,14 +1,28 @@
 import pytest
 import os
 from fastapi.testclient import TestClient
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from src.apis.token_backend import JWTTokenBackend
+from sqlalchemy.pool import NullPool
+from src.apis.pagination import count_cache
+from src.apis.services.last_login import last_login_recorder
+from src.apis.services.user_cache import authenticated_user_cache
+from src.apis.token_backend import JWTTokenBackend, token_revocation_list
 from jose import jwt
-from src.database.db import get_db_session
+from src.database.db import (
+    RoutingSession,
+    begin_async_request_session,
+    get_async_connection_url,
+    get_async_db_session,
+    get_db_session,
+    get_read_only_bind,
+)
 from src.database.models import Base, User
 from sqlalchemy_utils import database_exists, create_database
+from api_tests.utils import QueryCounter
 from api_tests.factories import (
     UserFactory,
     AddressFactory,
@@ -20,16 +34,43 @@ from api_tests.factories import (
 from src.settings import settings
 
 SQLALCHEMY_TEST_DATABASE_URL = settings.test_db_connection_string
+# separate database, which plays a role of the replica in the replication tests
+SQLALCHEMY_TEST_REPLICA_DATABASE_URL = make_url(SQLALCHEMY_TEST_DATABASE_URL).set(
+    database=f"{make_url(SQLALCHEMY_TEST_DATABASE_URL).database}_replica"
+)
 
 engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL, echo=True)
 TestingSessionLocal = sessionmaker(autocommit=False, bind=engine)
 
-if not database_exists(engine.url):
-    create_database(engine.url)
+# every TestClient runs its own event loop, so asyncpg connections can't be pooled
+async_engine = create_async_engine(
+    get_async_connection_url(SQLALCHEMY_TEST_DATABASE_URL), poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    read_only_bind=get_read_only_bind(async_engine.sync_engine),
+)
+
+replica_engine = create_engine(SQLALCHEMY_TEST_REPLICA_DATABASE_URL, echo=True)
+TestingReplicaSessionLocal = sessionmaker(autocommit=False, bind=replica_engine)
+async_replica_engine = create_async_engine(
+    get_async_connection_url(SQLALCHEMY_TEST_REPLICA_DATABASE_URL), poolclass=NullPool
+)
+
+for test_engine in (engine, replica_engine):
+    if not database_exists(test_engine.url):
+        create_database(test_engine.url)
 
 
-def pytest_configure():
+def pytest_configure(config):
     os.environ["SUPPRESS_SEND"] = "1"
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries): maximal number of SQL statements executed "
+        "inside the `with query_counter:` block of the test",
+    )
 
 
 def pytest_unconfigure():
@@ -38,15 +79,69 @@ def pytest_unconfigure():
 
 @pytest.fixture
 def db_session():
-    with TestingSessionLocal.begin() as session:
+    with TestingSessionLocal() as session:
         yield session
+        session.commit()
 
 
 @pytest.fixture
-def application(db_session):
+def replica_db_session():
+    Base.metadata.drop_all(replica_engine)
+    Base.metadata.create_all(replica_engine)
+
+    with TestingReplicaSessionLocal() as session:
+        yield session
+        session.commit()
+
+
+@pytest.fixture
+def query_counter(request):
+    """Fail the test when its `with query_counter:` block exceeds query budget.
+
+    Budget is declared by the `query_budget` marker. Without it only
+    N+1 queries are checked.
+    """
+    marker = request.node.get_closest_marker("query_budget")
+    counter = QueryCounter(max_queries=marker.args[0] if marker else None)
+    test_engines = (
+        engine,
+        replica_engine,
+        async_engine.sync_engine,
+        async_replica_engine.sync_engine,
+    )
+
+    for test_engine in test_engines:
+        counter.recorder.instrument(test_engine)
+
+    yield counter
+
+    for test_engine in test_engines:
+        counter.recorder.remove(test_engine)
+
+
+@pytest.fixture
+def async_session_factory():
+    return TestingAsyncSessionLocal
+
+
+@pytest.fixture
+def application(db_session, async_session_factory, monkeypatch):
     from src.app import app
 
+    monkeypatch.setattr(last_login_recorder, "engine", async_engine)
+    monkeypatch.setattr(token_revocation_list, "engine", async_engine)
+
+    async def get_test_async_db_session(request: Request):
+        # async session uses its own connection, so it sees committed data only
+        db_session.commit()
+
+        async with begin_async_request_session(
+            async_session_factory, request
+        ) as session:
+            yield session
+
     app.dependency_overrides[get_db_session] = lambda: db_session
+    app.dependency_overrides[get_async_db_session] = get_test_async_db_session
 
     return app
 
@@ -92,6 +187,11 @@ def create_all_tables():
     """Delete and recreate all tables."""
     Base.metadata.drop_all(engine)
     Base.metadata.create_all(engine)
+    # ids of the recreated users are reused by other users
+    authenticated_user_cache.clear()
+    count_cache.clear()
+    last_login_recorder.clear()
+    token_revocation_list.clear()
 
 
 @pytest.fixture(autouse=True)
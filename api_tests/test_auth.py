@@ -1,3 +1,5 @@
+import asyncio
+from datetime import datetime, timedelta
 from typing import Any
 import pytest
 from fastapi.testclient import TestClient
@@ -5,9 +7,23 @@ from fastapi import status
 from src.app import app
 from api_tests.utils import assert_api_error
 from src.settings import settings
-from src.database.models import User
-from src.apis.token_backend import create_jwt_token_backend
+from src.database.models import RevokedToken, User
+from jose import jwt
+from sqlalchemy import select
+from src.apis import token_backend as token_backend_module
+from src.apis.token_backend import (
+    HS256JWTCodec,
+    InvalidToken,
+    JWTTokenBackend,
+    BloomFilter,
+    create_jwt_token_backend,
+    jwt_token_backend,
+    token_revocation_list,
+    verified_token_cache,
+)
 from api_tests.factories import UserFactory
+from src.apis.services.last_login import last_login_recorder
+from src.apis.services.password_hasher import password_hasher
 from src.database.models.constants import MAX_FIRST_NAME_LENGTH
 from src.database.models.constants import MAX_LAST_NAME_LENGTH
 from src.apis.users.schemas import MIN_PASSWORD_LENGTH
@@ -19,13 +35,23 @@ from api_tests.utils import assert_basic_user_data, create_wrong_user_payload
     (
         (app.url_path_for("create_category_api"), "post"),
         (app.url_path_for("get_categories_list_api"), "get"),
+        (app.url_path_for("get_categories_cursor_list_api"), "get"),
         (app.url_path_for("delete_category_api", category_id=1), "delete"),
         (app.url_path_for("create_product_api"), "post"),
         (app.url_path_for("get_products_list_api"), "get"),
+        (app.url_path_for("get_products_cursor_list_api"), "get"),
+        (app.url_path_for("export_products_api"), "get"),
         (app.url_path_for("create_user_by_admin_api"), "post"),
         (app.url_path_for("get_users_list_api"), "get"),
+        (app.url_path_for("get_users_cursor_list_api"), "get"),
+        (app.url_path_for("export_users_api"), "get"),
+        (app.url_path_for("export_orders_api"), "get"),
         (app.url_path_for("get_user_api", user_id=1), "get"),
         (app.url_path_for("delete_user_api", user_id=1), "delete"),
+        (app.url_path_for("get_db_pools_stats_api"), "get"),
+        (app.url_path_for("get_slow_queries_api"), "get"),
+        (app.url_path_for("get_result_cache_stats_api"), "get"),
+        (app.url_path_for("get_password_hasher_stats_api"), "get"),
     ),
 )
 def test_admin_endpoints_are_protected(
@@ -49,6 +75,7 @@ def test_admin_endpoints_are_protected(
         (app.url_path_for("update_authenticated_user_info"), "patch"),
         (app.url_path_for("create_authenticated_user_address_api"), "post"),
         (app.url_path_for("create_authenticated_user_order_api"), "post"),
+        (app.url_path_for("get_auth_user_orders_by_cursor"), "get"),
     ),
 )
 def test_authenticated_user_endpoints_return_403_with_non_auth_request(
@@ -72,6 +99,7 @@ def test_authenticated_user_endpoints_return_403_with_non_auth_request(
         (app.url_path_for("update_authenticated_user_info"), "patch"),
         (app.url_path_for("create_authenticated_user_address_api"), "post"),
         (app.url_path_for("create_authenticated_user_order_api"), "post"),
+        (app.url_path_for("get_auth_user_orders_by_cursor"), "get"),
     ),
 )
 def test_authenticated_user_endpoints_return_403_when_token_is_invalid(
@@ -267,3 +295,326 @@ def test_create_user_returns_400_when_user_with_the_provided_email_already_exist
     assert_api_error(
         response.json(), expected_error_message, status.HTTP_400_BAD_REQUEST
     )
+
+
+def test_create_user_checks_email_before_password_is_hashed(
+    api_client: TestClient, admin_user: User, monkeypatch
+):
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    url = app.url_path_for("create_user_api")
+    new_user_data = {
+        "email": admin_user.email,
+        "first_name": "test_user",
+        "last_name": "test_user",
+        "phone_number": "+48567863891",
+        "birth_date": "1995-06-25",
+        "password": MIN_PASSWORD_LENGTH * "a",
+    }
+
+    response = api_client.post(url, json=new_user_data)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class CountingJWTBackend:
+    def __init__(self):
+        self.decode_calls = 0
+
+    def encode(self, payload, secret, algorithm):
+        return jwt.encode(payload, secret, algorithm)
+
+    def decode(self, token, secret, algorithm):
+        self.decode_calls += 1
+        return jwt.decode(token, secret, algorithm)
+
+
+@pytest.fixture
+def empty_verified_token_cache():
+    verified_token_cache.clear()
+    yield verified_token_cache
+    verified_token_cache.clear()
+
+
+@pytest.mark.usefixtures("empty_verified_token_cache")
+def test_verified_token_is_not_decoded_again():
+    jwt_backend = CountingJWTBackend()
+    token_backend = JWTTokenBackend(jwt_backend)
+    token = token_backend.create_api_token_for_user(
+        UserFactory.build(id=1), settings.access_token_lifetime
+    )
+
+    first_payload = token_backend.verify(token)
+    second_payload = JWTTokenBackend(jwt_backend).verify(token)
+
+    assert second_payload == first_payload
+    assert jwt_backend.decode_calls == 1
+
+
+@pytest.mark.usefixtures("empty_verified_token_cache")
+def test_cached_token_payload_is_not_returned_after_expiration(monkeypatch):
+    token_backend = JWTTokenBackend(jwt)
+    token = token_backend.create_api_token_for_user(
+        UserFactory.build(id=1), settings.access_token_lifetime
+    )
+    payload = token_backend.verify(token)
+    cache_key = verified_token_cache.get_key(
+        token, token_backend.shared_secret, token_backend.algorithm
+    )
+
+    monkeypatch.setattr(token_backend_module.time, "time", lambda: payload["exp"])
+
+    assert verified_token_cache.get(cache_key) is None
+
+
+@pytest.mark.usefixtures("empty_verified_token_cache")
+def test_cached_token_is_not_accepted_with_other_secret():
+    token = JWTTokenBackend(jwt).create_api_token_for_user(
+        UserFactory.build(id=1), settings.access_token_lifetime
+    )
+    JWTTokenBackend(jwt).verify(token)
+
+    with pytest.raises(InvalidToken):
+        JWTTokenBackend(jwt, shared_secret="other secret").verify(token)
+
+
+def test_get_tokens_for_user_returns_503_when_password_hasher_is_busy(
+    api_client: TestClient, monkeypatch
+):
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    user = UserFactory.create(password="strongpassword")
+    url = app.url_path_for("get_tokens_for_user")
+
+    response = api_client.post(
+        url, data={"username": user.email, "password": "strongpassword"}
+    )
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["retry-after"] == "1"
+    assert_api_error(
+        response.json(),
+        "Too many login attempts, please retry later.",
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+def test_password_hasher_stats_count_hashings(
+    api_client: TestClient, admin_user_client: TestClient
+):
+    password_hasher.reset_stats()
+    user = UserFactory.create(password="strongpassword")
+    api_client.post(
+        app.url_path_for("get_tokens_for_user"),
+        data={"username": user.email, "password": "wrongpassword"},
+    )
+
+    response = admin_user_client.get(app.url_path_for("get_password_hasher_stats_api"))
+    stats = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert stats["pending"] == 0
+    assert stats["rejected"] == 0
+    assert stats["duration"]["count"] == 1
+
+
+def test_hs256_codec_tokens_are_compatible_with_jose():
+    codec = HS256JWTCodec(settings.secret_key)
+    payload = {"user_id": 1, "iat": 1, "exp": 2**32}
+
+    token = codec.encode(payload, settings.secret_key, "HS256")
+
+    assert token == jwt.encode(payload, settings.secret_key, "HS256")
+    assert codec.decode(token, settings.secret_key, "HS256") == payload
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "token",
+        jwt.encode({"user_id": 1}, "other secret", "HS256"),
+        jwt.encode({"user_id": 1}, settings.secret_key, "HS512"),
+        jwt.encode({"user_id": 1, "exp": 1}, settings.secret_key, "HS256"),
+        jwt.encode({"user_id": 1, "aud": "other"}, settings.secret_key, "HS256"),
+    ],
+)
+def test_hs256_codec_rejects_invalid_tokens(token):
+    codec = HS256JWTCodec(settings.secret_key)
+
+    with pytest.raises(jwt.JWTError):
+        codec.decode(token, settings.secret_key, "HS256")
+
+
+@pytest.mark.usefixtures("empty_verified_token_cache")
+def test_token_backend_is_shared_and_reads_clock_per_token(monkeypatch):
+    token_backend = create_jwt_token_backend()
+    user = UserFactory.build(id=1)
+    first_payload = token_backend.verify(
+        token_backend.create_api_token_for_user(user, settings.access_token_lifetime)
+    )
+
+    monkeypatch.setattr(
+        token_backend_module,
+        "datetime",
+        type("LaterDatetime", (), {"utcnow": lambda: datetime.utcnow() + timedelta(1)}),
+    )
+    second_payload = token_backend.verify(
+        token_backend.create_api_token_for_user(user, settings.access_token_lifetime)
+    )
+
+    assert create_jwt_token_backend() is token_backend
+    assert second_payload["iat"] - first_payload["iat"] >= timedelta(1).total_seconds()
+
+
+@pytest.fixture
+def claims_only_authentication(monkeypatch):
+    monkeypatch.setattr(settings, "claims_only_authentication", True)
+    monkeypatch.setattr(jwt_token_backend, "role_claims", True)
+
+
+def create_client_with_access_token(application, user):
+    client = TestClient(app=application)
+    access_token = jwt_token_backend.create_access_token_for_user(user)
+    client.headers = {"Authorization": f"Bearer {access_token}"}
+    return client
+
+
+@pytest.mark.usefixtures("claims_only_authentication")
+def test_login_returns_access_token_with_role_claims(api_client: TestClient):
+    user = UserFactory.create(password="strongpassword", is_admin=True)
+
+    response = api_client.post(
+        app.url_path_for("get_tokens_for_user"),
+        data={"username": user.email, "password": "strongpassword"},
+    )
+    access_payload = jwt.decode(
+        response.json()["access_token"], settings.secret_key, "HS256"
+    )
+    refresh_payload = jwt.decode(
+        response.json()["refresh_token"], settings.secret_key, "HS256"
+    )
+
+    assert access_payload["is_admin"] is True
+    assert access_payload["is_employee"] is False
+    assert "is_admin" not in refresh_payload
+
+
+@pytest.mark.usefixtures("claims_only_authentication")
+def test_admin_endpoint_is_authorized_by_claims_without_user_query(
+    application, admin_user: User, query_counter
+):
+    client = create_client_with_access_token(application, admin_user)
+
+    with query_counter as stats:
+        response = client.get(app.url_path_for("get_password_hasher_stats_api"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not any("FROM users" in statement for statement in stats.statements)
+    assert last_login_recorder._pending == {}
+
+
+@pytest.mark.usefixtures("claims_only_authentication")
+def test_admin_endpoint_is_forbidden_by_claims(application, basic_user: User):
+    client = create_client_with_access_token(application, basic_user)
+
+    response = client.get(app.url_path_for("get_password_hasher_stats_api"))
+
+    assert_api_error(response.json(), "Access denied.", status.HTTP_403_FORBIDDEN)
+
+
+def test_role_claims_are_ignored_without_claims_only_mode(
+    application, admin_user: User, monkeypatch
+):
+    monkeypatch.setattr(jwt_token_backend, "role_claims", True)
+    client = create_client_with_access_token(application, admin_user)
+    admin_user.is_admin = False
+
+    response = client.get(app.url_path_for("get_password_hasher_stats_api"))
+
+    assert_api_error(response.json(), "Access denied.", status.HTTP_403_FORBIDDEN)
+
+
+def test_revoked_refresh_token_is_not_accepted(
+    api_client: TestClient, basic_user: User
+):
+    refresh_token = jwt_token_backend.create_api_token_for_user(
+        basic_user, settings.refresh_token_lifetime
+    )
+
+    revoke_response = api_client.post(
+        app.url_path_for("revoke_token"), json={"token": refresh_token}
+    )
+    response = api_client.post(
+        app.url_path_for("refresh_token"), json={"refresh_token": refresh_token}
+    )
+
+    assert revoke_response.status_code == status.HTTP_204_NO_CONTENT
+    assert_api_error(
+        response.json(), "Refresh token is invalid", status.HTTP_401_UNAUTHORIZED
+    )
+
+
+def test_revoked_access_token_is_not_accepted(basic_user_client: TestClient):
+    access_token = basic_user_client.headers["Authorization"].removeprefix("Bearer ")
+    basic_user_client.post(
+        app.url_path_for("revoke_token"), json={"token": access_token}
+    )
+
+    response = basic_user_client.get(app.url_path_for("get_authenticated_user_info"))
+
+    assert_api_error(response.json(), "Token is not valid.", status.HTTP_403_FORBIDDEN)
+
+
+def test_revoke_token_returns_401_when_token_is_invalid(api_client: TestClient):
+    response = api_client.post(app.url_path_for("revoke_token"), json={"token": "x"})
+
+    assert_api_error(response.json(), "Token is invalid", status.HTTP_401_UNAUTHORIZED)
+
+
+@pytest.mark.usefixtures("application")
+def test_revocations_of_other_workers_are_loaded_by_refresh(db_session, basic_user):
+    token = jwt_token_backend.create_api_token_for_user(
+        basic_user, settings.access_token_lifetime
+    )
+    jti = jwt_token_backend.verify(token)["jti"]
+    db_session.add(
+        RevokedToken(jti=jti, expires_at=datetime.utcnow() + timedelta(days=1))
+    )
+    db_session.commit()
+
+    assert asyncio.run(token_revocation_list.refresh_async()) == 1
+    with pytest.raises(InvalidToken):
+        jwt_token_backend.verify(token)
+
+
+@pytest.mark.usefixtures("application")
+def test_rebuild_deletes_expired_revocations(db_session):
+    now = datetime.utcnow()
+    db_session.add_all(
+        [
+            RevokedToken(jti="expired", expires_at=now - timedelta(seconds=1)),
+            RevokedToken(jti="active", expires_at=now + timedelta(days=1)),
+        ]
+    )
+    db_session.commit()
+
+    async def restart_worker():
+        await token_revocation_list.start(interval=3600)
+        await token_revocation_list.stop()
+
+    asyncio.run(restart_worker())
+
+    assert db_session.scalars(select(RevokedToken.jti)).all() == ["active"]
+    assert token_revocation_list.is_revoked("active")
+    assert not token_revocation_list.is_revoked("expired")
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom_filter = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    added_items = [f"added-{index}" for index in range(1000)]
+
+    for item in added_items:
+        bloom_filter.add(item)
+
+    false_positives = sum(f"other-{index}" in bloom_filter for index in range(10000))
+
+    assert all(item in bloom_filter for item in added_items)
+    assert false_positives < 300
@@ -14,10 +14,12 @@ from api_tests.utils import (
 )
 from api_tests.factories import CategoryFactory
 from src.apis.constants import DEFAULT_LIMIT, DEFAULT_OFFSET
+from src.apis.pagination import count_cache
 
 ENDPOINTS = {
     "CREATE": app.url_path_for("create_category_api"),
     "LIST": app.url_path_for("get_categories_list_api"),
+    "CURSOR_LIST": app.url_path_for("get_categories_cursor_list_api"),
 }
 
 
@@ -129,6 +131,71 @@ def test_get_categories_list_returns_200_when_pagination_parameters_provided(
     )
 
 
+def test_get_categories_list_returns_exact_total_when_page_is_after_last_row(
+    admin_user_client: TestClient,
+):
+    [CategoryFactory.create() for _ in range(3)]
+
+    response = admin_user_client.get(ENDPOINTS["LIST"], params={"offset": 10})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert_offset_limit_pagination_data(
+        response.json(),
+        expected_items_len=0,
+        expected_offset=10,
+        expected_limit=DEFAULT_LIMIT,
+        expected_total=3,
+    )
+
+
+@pytest.mark.parametrize("offset, expected_has_more", ((0, True), (2, False)))
+def test_get_categories_list_returns_has_more_flag_when_count_is_omitted(
+    admin_user_client: TestClient, offset: int, expected_has_more: bool
+):
+    [CategoryFactory.create() for _ in range(4)]
+
+    response = admin_user_client.get(
+        ENDPOINTS["LIST"], params={"count": "none", "limit": 2, "offset": offset}
+    )
+    response_json = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response_json["items"]) == 2
+    assert response_json["total"] is None
+    assert response_json["has_more"] is expected_has_more
+
+
+def test_get_categories_list_reuses_cached_total(admin_user_client: TestClient):
+    count_cache.clear()
+    [CategoryFactory.create() for _ in range(3)]
+    params = {"count": "cached"}
+
+    first_response = admin_user_client.get(ENDPOINTS["LIST"], params=params)
+    CategoryFactory.create()
+    second_response = admin_user_client.get(ENDPOINTS["LIST"], params=params)
+
+    assert first_response.json()["total"] == 3
+    assert second_response.json()["total"] == 3
+    assert len(second_response.json()["items"]) == 4
+
+
+@pytest.mark.parametrize("params", ({}, {"search": "Category"}))
+def test_get_categories_list_returns_estimated_total(
+    admin_user_client: TestClient, params: dict[str, Any]
+):
+    [CategoryFactory.create() for _ in range(3)]
+
+    response = admin_user_client.get(
+        ENDPOINTS["LIST"], params={**params, "count": "estimated"}
+    )
+    response_json = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response_json["items"]) == 3
+    assert isinstance(response_json["total"], int)
+    assert response_json["total"] >= 0
+
+
 @pytest.mark.parametrize("searched_pattern", ("CATEGORY", "CaTeGoRY", "category"))
 def test_get_categories_list_returns_200_when_search_parameter_provided(
     admin_user_client: TestClient, searched_pattern: str
@@ -165,6 +232,103 @@ def test_get_categories_list_returns_200_when_search_parameter_provided(
     )
 
 
+@pytest.mark.parametrize(
+    "searched_pattern, expected_name",
+    (("%", "100% pizza"), ("_", "pizza_house"), ("\\", "pizza\\pasta")),
+)
+def test_get_categories_list_search_matches_wildcards_literally(
+    admin_user_client: TestClient, searched_pattern: str, expected_name: str
+):
+    for name in (
+        "100% pizza",
+        "100 pizza",
+        "pizza_house",
+        "pizzaXhouse",
+        "pizza\\pasta",
+    ):
+        CategoryFactory.create(name=name)
+
+    response = admin_user_client.get(
+        ENDPOINTS["LIST"], params={"search": searched_pattern}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["category"]["name"] for item in response.json()["items"]] == [
+        expected_name
+    ]
+
+
+@pytest.mark.parametrize("sort", (None, "name", "-name"))
+def test_get_categories_cursor_list_returns_all_categories_page_by_page(
+    admin_user_client: TestClient, sort: str | None
+):
+    categories = [CategoryFactory.create(name=f"Category {6 - i}") for i in range(7)]
+    expected_ids = [
+        category.id
+        for category in sorted(
+            categories,
+            key=lambda x: (x.name, x.id) if sort else x.id,
+            reverse=sort == "-name",
+        )
+    ]
+    params = {"size": 3, "sort": sort} if sort else {"size": 3}
+    received_ids = []
+    pages_number = 0
+
+    while True:
+        response = admin_user_client.get(ENDPOINTS["CURSOR_LIST"], params=params)
+        response_json = response.json()
+        pages_number += 1
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response_json["items"]) <= 3
+        received_ids.extend(item["category"]["id"] for item in response_json["items"])
+
+        if response_json["next_cursor"] is None:
+            break
+
+        params["cursor"] = response_json["next_cursor"]
+
+    assert received_ids == expected_ids
+    assert pages_number == 3
+
+
+@pytest.mark.parametrize(
+    "params",
+    (
+        {"cursor": "not a cursor"},
+        {"cursor": "eyJzb3J0IjogbnVsbH0"},
+    ),
+)
+def test_get_categories_cursor_list_returns_400_when_cursor_is_invalid(
+    admin_user_client: TestClient, params: dict[str, Any]
+):
+    response = admin_user_client.get(ENDPOINTS["CURSOR_LIST"], params=params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert_api_error(
+        response.json(),
+        expected_error_message="Invalid cursor.",
+        expected_error_code=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+def test_get_categories_cursor_list_returns_400_when_sort_is_changed(
+    admin_user_client: TestClient,
+):
+    [CategoryFactory.create() for _ in range(3)]
+    response = admin_user_client.get(
+        ENDPOINTS["CURSOR_LIST"], params={"size": 1, "sort": "name"}
+    )
+
+    response = admin_user_client.get(
+        ENDPOINTS["CURSOR_LIST"],
+        params={"size": 1, "sort": "-name", "cursor": response.json()["next_cursor"]},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 def test_delete_category_returns_204_on_delete(admin_user_client: TestClient):
     category = CategoryFactory.create()
     url = app.url_path_for("delete_category_api", category_id=category.id)
@@ -0,0 +1,109 @@
+# type: ignore
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import InternalError
+from sqlalchemy.orm import sessionmaker
+from src.app import app
+from src.apis.services.last_login import last_login_recorder
+from src.apis.token_backend import create_jwt_token_backend
+from src.database.db import (
+    RoutingSession,
+    begin_request_session,
+    get_read_only_bind,
+)
+from src.database.models import User
+from api_tests.conftest import engine
+
+ENDPOINTS = {
+    "ME_ORDERS": app.url_path_for("get_auth_user_orders"),
+}
+
+
+@pytest.fixture
+def session_factory():
+    return sessionmaker(
+        engine, class_=RoutingSession, read_only_bind=get_read_only_bind(engine)
+    )
+
+
+def build_request(method: str) -> Request:
+    return Request({"type": "http", "method": method, "headers": []})
+
+
+def is_transaction_read_only(session) -> bool:
+    return session.scalar(text("SHOW transaction_read_only")) == "on"
+
+
+def test_read_only_request_uses_read_only_transaction(session_factory):
+    with begin_request_session(session_factory, build_request("GET")) as session:
+        assert is_transaction_read_only(session)
+
+        with pytest.raises(InternalError):
+            session.execute(text("CREATE TEMPORARY TABLE read_only_test (id int)"))
+
+
+def test_write_request_uses_read_write_transaction(session_factory):
+    with begin_request_session(session_factory, build_request("POST")) as session:
+        assert not is_transaction_read_only(session)
+
+
+def test_read_only_request_records_last_login_date(
+    basic_user_client: TestClient, basic_user: User, db_session
+):
+    previous_login_date = datetime.utcnow() - timedelta(days=1)
+    basic_user.last_login_date = previous_login_date
+    db_session.commit()
+
+    response = basic_user_client.get(ENDPOINTS["ME_ORDERS"])
+    db_session.refresh(basic_user)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert basic_user.last_login_date == previous_login_date
+
+    assert asyncio.run(last_login_recorder.flush_async()) == 1
+    db_session.refresh(basic_user)
+
+    assert datetime.utcnow() - basic_user.last_login_date < timedelta(minutes=1)
+
+
+def test_recent_login_is_not_recorded_again(
+    basic_user_client: TestClient, basic_user: User, db_session
+):
+    basic_user.last_login_date = datetime.utcnow() - timedelta(days=1)
+    db_session.commit()
+
+    basic_user_client.get(ENDPOINTS["ME_ORDERS"])
+    basic_user_client.get(ENDPOINTS["ME_ORDERS"])
+
+    assert asyncio.run(last_login_recorder.flush_async()) == 1
+
+    basic_user_client.get(ENDPOINTS["ME_ORDERS"])
+
+    assert asyncio.run(last_login_recorder.flush_async()) == 0
+
+
+def test_recorded_login_dates_are_written_on_shutdown(
+    application, basic_user: User, db_session
+):
+    previous_login_date = datetime.utcnow() - timedelta(days=1)
+    basic_user.last_login_date = previous_login_date
+    db_session.commit()
+    access_token = create_jwt_token_backend().create_api_token_for_user(
+        basic_user, timedelta(minutes=5)
+    )
+
+    with TestClient(app=application) as client:
+        client.get(
+            ENDPOINTS["ME_ORDERS"],
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+
+    db_session.refresh(basic_user)
+
+    assert basic_user.last_login_date > previous_login_date
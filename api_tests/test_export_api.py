@@ -0,0 +1,80 @@
+# type: ignore
+
+import csv
+import io
+import json
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from src.app import app
+from src.database.models import User
+from src.settings import settings
+from api_tests.factories import OrderFactory, ProductFactory, UserFactory
+
+ENDPOINTS = {
+    "USERS": app.url_path_for("export_users_api"),
+    "PRODUCTS": app.url_path_for("export_products_api"),
+    "ORDERS": app.url_path_for("export_orders_api"),
+}
+
+
+@pytest.fixture
+def small_export_batch(monkeypatch):
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+
+
+def read_ndjson(content: str) -> list[dict]:
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.usefixtures("small_export_batch")
+def test_export_users_streams_filtered_and_sorted_ndjson(
+    admin_user_client: TestClient,
+):
+    users = [UserFactory.create(last_name=f"Exported {i}") for i in (3, 1, 2)]
+    UserFactory.create(last_name="Other")
+
+    response = admin_user_client.get(
+        ENDPOINTS["USERS"], params={"search": "Exported", "sort": "-last_name"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [user["id"] for user in read_ndjson(response.text)] == [
+        user.id for user in sorted(users, key=lambda x: x.last_name, reverse=True)
+    ]
+
+
+def test_export_products_returns_csv(admin_user_client: TestClient):
+    products = ProductFactory.create_batch(3)
+
+    response = admin_user_client.get(ENDPOINTS["PRODUCTS"], params={"format": "csv"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="products.csv"' in response.headers["content-disposition"]
+    assert [(int(row["id"]), row["name"]) for row in rows] == [
+        (product.id, product.name) for product in products
+    ]
+
+
+@pytest.mark.usefixtures("small_export_batch")
+def test_export_orders_of_user_returns_gzipped_ndjson(
+    admin_user_client: TestClient, basic_user: User
+):
+    orders = OrderFactory.create_batch(5, user=basic_user)
+    OrderFactory.create()
+
+    response = admin_user_client.get(
+        ENDPOINTS["ORDERS"], params={"gzip": True, "user_id": basic_user.id}
+    )
+    exported_orders = read_ndjson(response.text)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert [order["id"] for order in exported_orders] == [order.id for order in orders]
+    assert [len(order["order_items"]) for order in exported_orders] == [
+        len(order.order_items) for order in orders
+    ]
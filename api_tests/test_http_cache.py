@@ -0,0 +1,125 @@
+# type: ignore
+
+import time
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from src.app import app
+from src.apis.http_cache import create_etag, etag_matches
+from src.apis.services.result_cache import RedisCacheBackend, result_cache
+from src.settings import settings
+from api_tests.factories import CategoryFactory
+from api_tests.utils import FakeRedis
+
+ENDPOINTS = {
+    "ME": app.url_path_for("get_authenticated_user_info"),
+    "UPDATE_ME": app.url_path_for("update_authenticated_user_info"),
+    "CATEGORIES": app.url_path_for("get_categories_list_api"),
+    "CREATE_CATEGORY": app.url_path_for("create_category_api"),
+}
+
+
+@pytest.fixture
+def shared_result_cache(monkeypatch):
+    monkeypatch.setattr(result_cache, "backend", RedisCacheBackend(FakeRedis()))
+
+
+def test_get_response_has_etag_and_cache_control(basic_user_client: TestClient):
+    response = basic_user_client.get(ENDPOINTS["ME"])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == settings.default_cache_control
+    assert response.headers["vary"] == "Authorization"
+
+
+def test_matching_if_none_match_returns_304_without_body(
+    basic_user_client: TestClient,
+):
+    etag = basic_user_client.get(ENDPOINTS["ME"]).headers["etag"]
+
+    response = basic_user_client.get(
+        ENDPOINTS["ME"], headers={"If-None-Match": f'"other", W/{etag}'}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+def test_changed_response_has_new_etag(basic_user_client: TestClient):
+    etag = basic_user_client.get(ENDPOINTS["ME"]).headers["etag"]
+    basic_user_client.patch(ENDPOINTS["UPDATE_ME"], json={"first_name": "Changed"})
+
+    response = basic_user_client.get(ENDPOINTS["ME"], headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+
+
+def test_cache_control_is_configured_per_route(
+    admin_user_client: TestClient, monkeypatch
+):
+    monkeypatch.setattr(
+        settings, "route_cache_control", {"get_categories_list_api": "max-age=30"}
+    )
+
+    response = admin_user_client.get(ENDPOINTS["CATEGORIES"])
+
+    assert response.headers["cache-control"] == "max-age=30"
+
+
+@pytest.mark.usefixtures("shared_result_cache")
+def test_list_etag_is_checked_without_page_query(
+    admin_user_client: TestClient, query_counter
+):
+    CategoryFactory.create_batch(2)
+    etag = admin_user_client.get(ENDPOINTS["CATEGORIES"]).headers["etag"]
+
+    with query_counter as stats:
+        response = admin_user_client.get(
+            ENDPOINTS["CATEGORIES"], headers={"If-None-Match": etag}
+        )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert not any("FROM categories" in statement for statement in stats.statements)
+
+
+@pytest.mark.usefixtures("shared_result_cache")
+def test_list_etag_changes_when_table_is_changed(admin_user_client: TestClient):
+    etag = admin_user_client.get(ENDPOINTS["CATEGORIES"]).headers["etag"]
+    admin_user_client.post(ENDPOINTS["CREATE_CATEGORY"], json={"name": "New"})
+
+    response = admin_user_client.get(
+        ENDPOINTS["CATEGORIES"], headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total"] == 1
+
+
+@pytest.mark.usefixtures("shared_result_cache")
+def test_list_etag_is_body_hash_when_reads_go_to_replica(
+    admin_user_client: TestClient, monkeypatch
+):
+    monkeypatch.setattr(settings, "db_replica_connection_strings", ["replica"])
+    CategoryFactory.create_batch(2)
+
+    replica_response = admin_user_client.get(ENDPOINTS["CATEGORIES"])
+    admin_user_client.cookies.set(
+        settings.primary_pin_cookie_name, str(int(time.time()) + 60)
+    )
+    primary_response = admin_user_client.get(ENDPOINTS["CATEGORIES"])
+
+    assert replica_response.headers["etag"] == create_etag(replica_response.content)
+    assert primary_response.headers["etag"] != create_etag(primary_response.content)
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected_result",
+    [(None, False), ("*", True), ('"a", "b"', True), ('W/"b"', True), ('"c"', False)],
+)
+def test_etag_matches(if_none_match, expected_result):
+    assert etag_matches(if_none_match, '"b"') is expected_result
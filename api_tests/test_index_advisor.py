@@ -0,0 +1,123 @@
+# type: ignore
+
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from src.database.index_advisor import (
+    BTREE,
+    GIN_TRIGRAM,
+    ExistingIndex,
+    IndexSuggestion,
+    suggest_indexes,
+)
+from src.database.models import Base
+
+
+class AdvisorBase(DeclarativeBase):
+    """Separate registry, so the models aren't created with the real tables."""
+
+
+class Author(AdvisorBase):
+    __tablename__ = "authors"
+
+    SEARCHABLE_FIELDS = ("name",)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(50))
+
+
+class Post(AdvisorBase):
+    __tablename__ = "posts"
+    __table_args__ = (Index("ix_posts_reviewer_id_title", "reviewer_id", "title"),)
+
+    FILTERABLE_FIELDS = ("author_id",)
+    SORTABLE_FIELDS = ("title", "created_at")
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String(50))
+    created_at: Mapped[datetime]
+    author_id: Mapped[int] = mapped_column(ForeignKey("authors.id"))
+    editor_id: Mapped[int] = mapped_column(ForeignKey("authors.id"))
+    reviewer_id: Mapped[int] = mapped_column(ForeignKey("authors.id"))
+
+
+MAPPERS = [Author.__mapper__, Post.__mapper__]
+
+AUTHOR_NAME_TRGM = IndexSuggestion(
+    "authors", ("name",), frozenset(), "searchable field", GIN_TRIGRAM
+)
+POST_AUTHOR_CREATED_AT = IndexSuggestion(
+    "posts",
+    ("author_id", "created_at"),
+    frozenset({"created_at"}),
+    "filter by author_id, sort by created_at",
+)
+POST_AUTHOR_TITLE = IndexSuggestion(
+    "posts", ("author_id", "title"), frozenset(), "filter by author_id, sort by title"
+)
+POST_EDITOR = IndexSuggestion("posts", ("editor_id",), frozenset(), "foreign key")
+
+
+def test_models_declare_all_suggested_indexes():
+    suggestions = suggest_indexes(Base.registry.mappers)
+
+    assert suggestions == [], "Models miss indexes: " + ", ".join(map(str, suggestions))
+
+
+def test_suggest_indexes_of_metadata():
+    suggestions = suggest_indexes(MAPPERS)
+
+    # author_id foreign key is covered by the suggested composite index,
+    # reviewer_id one is covered by the existing composite index
+    assert suggestions == [
+        AUTHOR_NAME_TRGM,
+        POST_AUTHOR_CREATED_AT,
+        POST_AUTHOR_TITLE,
+        POST_EDITOR,
+    ]
+
+
+def test_suggest_indexes_of_database_is_covered_only_by_same_index_type():
+    existing_indexes = {
+        "authors": [ExistingIndex(["id"]), ExistingIndex(["name"], BTREE)],
+        "posts": [
+            ExistingIndex(["id"]),
+            ExistingIndex(["author_id", "created_at", "title"]),
+            ExistingIndex(["editor_id"]),
+        ],
+    }
+
+    suggestions = suggest_indexes(MAPPERS, existing_indexes)
+
+    assert suggestions == [
+        AUTHOR_NAME_TRGM,
+        POST_AUTHOR_TITLE,
+        IndexSuggestion("posts", ("reviewer_id",), frozenset(), "foreign key"),
+    ]
+
+
+def test_index_suggestion_to_operation():
+    trgm_operation = AUTHOR_NAME_TRGM.to_operation()
+    composite_operation = POST_AUTHOR_CREATED_AT.to_operation()
+    foreign_key_operation = POST_EDITOR.to_operation()
+
+    assert trgm_operation.index_name == "ix_authors_name_trgm"
+    assert trgm_operation.table_name == "authors"
+    assert trgm_operation.columns == ["name"]
+    assert trgm_operation.kw == {
+        "postgresql_using": "gin",
+        "postgresql_ops": {"name": "gin_trgm_ops"},
+    }
+    assert composite_operation.index_name == "ix_posts_author_id_created_at"
+    assert composite_operation.table_name == "posts"
+    assert list(map(str, composite_operation.columns)) == [
+        "author_id",
+        "created_at DESC",
+    ]
+    assert composite_operation.kw == {}
+    assert foreign_key_operation.index_name == "ix_posts_editor_id"
+    assert foreign_key_operation.table_name == "posts"
+    assert foreign_key_operation.columns == ["editor_id"]
+    assert foreign_key_operation.kw == {}
@@ -0,0 +1,137 @@
+# type: ignore
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete, func, select, text, update
+from sqlalchemy.exc import TimeoutError
+from src.app import app
+from src.apis.admin.monitoring import api as monitoring_api
+from src.database.models import Category
+from src.database.pool_metrics import InstrumentedQueuePool, instrument_engine_pool
+from src.database.query_log import QueryLogger
+from src.settings import settings
+
+ENDPOINTS = {
+    "DB_POOLS": app.url_path_for("get_db_pools_stats_api"),
+    "SLOW_QUERIES": app.url_path_for("get_slow_queries_api"),
+}
+
+
+@pytest.fixture
+def instrumented_engine(monkeypatch):
+    engine = create_engine(
+        settings.test_db_connection_string,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    instrument_engine_pool(engine)
+    monkeypatch.setattr(monitoring_api, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def logged_engine(monkeypatch):
+    engine = create_engine(settings.test_db_connection_string)
+    query_logger = QueryLogger(
+        slow_query_threshold=0, explain_threshold=0, explain_enabled=True
+    )
+    query_logger.instrument(engine)
+    monkeypatch.setattr(monitoring_api, "query_logger", query_logger)
+    yield engine
+    engine.dispose()
+
+
+def test_get_db_pools_stats_returns_200_on_success(admin_user_client: TestClient):
+    response = admin_user_client.get(ENDPOINTS["DB_POOLS"])
+    response_json = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+
+    for pool_name in ("sync_pool", "async_pool"):
+        assert pool_name in response_json, f"Stats for '{pool_name}' not found."
+        assert response_json[pool_name]["size"] == settings.db_pool_size
+
+
+def test_get_db_pools_stats_returns_pool_usage_metrics(
+    admin_user_client: TestClient, instrumented_engine
+):
+    with instrumented_engine.connect():
+        with pytest.raises(TimeoutError):
+            instrumented_engine.connect()
+
+        response = admin_user_client.get(ENDPOINTS["DB_POOLS"])
+
+    pool_stats = response.json()["sync_pool"]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert pool_stats["size"] == 1
+    assert pool_stats["checked_out"] == 1
+    assert pool_stats["checkouts"] == 1
+    assert pool_stats["checkout_timeouts"] == 1
+    assert pool_stats["connections_created"] == 1
+    assert pool_stats["max_checked_out"] == 1
+    assert pool_stats["checkout_wait_time"]["count"] == 1
+
+
+def test_get_slow_queries_returns_queries_with_explain_plan(
+    admin_user_client: TestClient, logged_engine
+):
+    with logged_engine.connect() as connection:
+        connection.execute(select(Category.id).where(Category.name == "Pizza"))
+
+    response = admin_user_client.get(ENDPOINTS["SLOW_QUERIES"])
+    slow_query = response.json()[0]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "FROM categories" in slow_query["statement"]
+    assert slow_query["parameters_shape"] == {"name_1": "str"}
+    assert "Execution Time" in slow_query["explain_plan"]
+
+
+def test_get_slow_queries_does_not_explain_modifying_queries(
+    admin_user_client: TestClient, logged_engine
+):
+    with logged_engine.begin() as connection:
+        connection.execute(
+            update(Category).where(Category.id == 1).values(name="Pizza")
+        )
+        connection.execute(text("SELECT 1"))
+
+    response = admin_user_client.get(ENDPOINTS["SLOW_QUERIES"])
+    select_query, update_query = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert update_query["statement"].startswith("UPDATE categories")
+    assert update_query["explain_plan"] is None
+    assert select_query["explain_plan"] is not None
+
+
+def test_get_slow_queries_explain_does_not_repeat_modifying_with_queries(
+    admin_user_client: TestClient, logged_engine
+):
+    with logged_engine.begin() as connection:
+        connection.execute(
+            text(
+                "WITH new_category AS ("
+                "INSERT INTO categories (name) "
+                "VALUES ('Explained ' || clock_timestamp()) RETURNING id"
+                ") SELECT id FROM new_category"
+            )
+        )
+        categories_count = connection.scalar(
+            select(func.count()).where(Category.name.startswith("Explained "))
+        )
+        connection.execute(
+            delete(Category).where(Category.name.startswith("Explained "))
+        )
+
+    response = admin_user_client.get(ENDPOINTS["SLOW_QUERIES"])
+    with_query = response.json()[-1]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "Execution Time" in with_query["explain_plan"]
+    assert categories_count == 1
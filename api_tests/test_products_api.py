@@ -18,6 +18,7 @@ from src.apis.constants import DEFAULT_LIMIT, DEFAULT_OFFSET
 ENDPOINTS = {
     "CREATE": app.url_path_for("create_product_api"),
     "LIST": app.url_path_for("get_products_list_api"),
+    "CURSOR_LIST": app.url_path_for("get_products_cursor_list_api"),
 }
 
 
@@ -264,6 +265,33 @@ def test_get_products_list_returns_products_in_required_order(
     )
 
 
+@pytest.mark.parametrize("sort_field, reverse", (("-price", True), ("price", False)))
+def test_get_products_cursor_list_pages_through_products_with_equal_prices(
+    admin_user_client: TestClient, sort_field: str, reverse: bool
+):
+    products = [ProductFactory.create(price=10 + i % 2) for i in range(5)]
+    expected_ids = [
+        product.id
+        for product in sorted(products, key=lambda x: (x.price, x.id), reverse=reverse)
+    ]
+    params = {"size": 2, "sort": sort_field}
+    received_ids = []
+
+    while True:
+        response = admin_user_client.get(ENDPOINTS["CURSOR_LIST"], params=params)
+        response_json = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        received_ids.extend(item["product"]["id"] for item in response_json["items"])
+
+        if response_json["next_cursor"] is None:
+            break
+
+        params["cursor"] = response_json["next_cursor"]
+
+    assert received_ids == expected_ids
+
+
 def test_delete_product_returns_204_on_delete(admin_user_client: TestClient):
     product = ProductFactory.create()
     url = app.url_path_for("delete_product_api", product_id=product.id)
@@ -0,0 +1,102 @@
+# type: ignore
+
+import time
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from src.app import app
+from src.apis.services.result_cache import InMemoryCacheBackend, result_cache
+from src.database.db import RoutingSession, get_read_only_bind
+from src.database.models import Category, User
+from src.settings import settings
+from api_tests.conftest import async_engine, async_replica_engine
+from api_tests.factories import CategoryFactory
+
+ENDPOINTS = {
+    "CREATE": app.url_path_for("create_category_api"),
+    "LIST": app.url_path_for("get_categories_list_api"),
+}
+
+
+@pytest.fixture
+def async_session_factory():
+    return async_sessionmaker(
+        async_engine,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        replicas=[async_replica_engine.sync_engine],
+        read_only_bind=get_read_only_bind(async_engine.sync_engine),
+    )
+
+
+@pytest.fixture(autouse=True)
+def replicated_admin_user(replica_db_session, admin_user: User):
+    replica_db_session.merge(admin_user)
+    replica_db_session.commit()
+
+
+def get_category_names(response_data) -> list[str]:
+    return [item["category"]["name"] for item in response_data["items"]]
+
+
+def test_read_only_request_reads_from_replica(
+    admin_user_client: TestClient, replica_db_session
+):
+    CategoryFactory.create(name="Primary category")
+    replica_db_session.add(Category(name="Replica category"))
+    replica_db_session.commit()
+
+    response = admin_user_client.get(ENDPOINTS["LIST"])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert get_category_names(response.json()) == ["Replica category"]
+
+
+def test_client_reads_from_primary_after_write_request(
+    admin_user_client: TestClient,
+):
+    response = admin_user_client.post(ENDPOINTS["CREATE"], json={"name": "New"})
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert settings.primary_pin_cookie_name in response.cookies
+
+    response = admin_user_client.get(ENDPOINTS["LIST"])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert get_category_names(response.json()) == ["New"]
+
+
+def test_client_reads_from_replica_when_primary_pin_expired(
+    admin_user_client: TestClient, replica_db_session
+):
+    CategoryFactory.create(name="Primary category")
+    replica_db_session.add(Category(name="Replica category"))
+    replica_db_session.commit()
+    admin_user_client.cookies.set(
+        settings.primary_pin_cookie_name, str(int(time.time()) - 1)
+    )
+
+    response = admin_user_client.get(ENDPOINTS["LIST"])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert get_category_names(response.json()) == ["Replica category"]
+
+
+def test_pages_read_from_replica_are_not_cached_for_pinned_clients(
+    admin_user_client: TestClient, replica_db_session, monkeypatch
+):
+    monkeypatch.setattr(result_cache, "backend", InMemoryCacheBackend(max_size=10))
+    CategoryFactory.create(name="Primary category")
+    replica_db_session.add(Category(name="Replica category"))
+    replica_db_session.commit()
+
+    replica_response = admin_user_client.get(ENDPOINTS["LIST"])
+    admin_user_client.cookies.set(
+        settings.primary_pin_cookie_name, str(int(time.time()) + 60)
+    )
+    primary_response = admin_user_client.get(ENDPOINTS["LIST"])
+
+    assert get_category_names(replica_response.json()) == ["Replica category"]
+    assert get_category_names(primary_response.json()) == ["Primary category"]
@@ -0,0 +1,181 @@
+# type: ignore
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from src.app import app
+from src.apis.services.last_login import last_login_recorder
+from src.apis.services import result_cache as result_cache_module
+from src.apis.services.result_cache import (
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+    ResultCache,
+    get_dependent_tables,
+    result_cache,
+)
+from src.database.models import Address, Category, Order, OrderItem, User
+from api_tests.factories import CategoryFactory
+from api_tests.utils import FakeRedis
+
+ENDPOINTS = {
+    "CATEGORIES": app.url_path_for("get_categories_list_api"),
+    "CREATE_CATEGORY": app.url_path_for("create_category_api"),
+    "STATS": app.url_path_for("get_result_cache_stats_api"),
+    "USERS": app.url_path_for("get_users_list_api"),
+    "ME_ORDERS": app.url_path_for("get_auth_user_orders"),
+}
+
+
+@pytest.fixture(params=["memory", "redis"])
+def enabled_result_cache(request, monkeypatch):
+    backend = (
+        InMemoryCacheBackend(max_size=100)
+        if request.param == "memory"
+        else RedisCacheBackend(FakeRedis())
+    )
+    monkeypatch.setattr(result_cache, "backend", backend)
+    result_cache.reset_stats()
+    yield result_cache
+    result_cache.reset_stats()
+
+
+@pytest.mark.usefixtures("enabled_result_cache")
+def test_repeated_list_request_is_served_from_cache(admin_user_client: TestClient):
+    CategoryFactory.create_batch(3)
+
+    first_response = admin_user_client.get(ENDPOINTS["CATEGORIES"])
+    second_response = admin_user_client.get(ENDPOINTS["CATEGORIES"])
+    stats = admin_user_client.get(ENDPOINTS["STATS"]).json()
+
+    assert second_response.status_code == status.HTTP_200_OK
+    assert second_response.json() == first_response.json()
+    assert stats == {"enabled": True, "hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+@pytest.mark.usefixtures("enabled_result_cache")
+def test_different_pages_are_cached_separately(admin_user_client: TestClient):
+    CategoryFactory.create_batch(3)
+
+    first_page = admin_user_client.get(ENDPOINTS["CATEGORIES"], params={"limit": 2})
+    second_page = admin_user_client.get(
+        ENDPOINTS["CATEGORIES"], params={"limit": 2, "offset": 2}
+    )
+
+    assert len(first_page.json()["items"]) == 2
+    assert len(second_page.json()["items"]) == 1
+    assert result_cache.get_stats()["misses"] == 2
+
+
+@pytest.mark.usefixtures("enabled_result_cache")
+def test_created_record_invalidates_cached_list(admin_user_client: TestClient):
+    CategoryFactory.create_batch(2)
+    admin_user_client.get(ENDPOINTS["CATEGORIES"])
+
+    response = admin_user_client.post(
+        ENDPOINTS["CREATE_CATEGORY"], json={"name": "New category"}
+    )
+    list_response = admin_user_client.get(ENDPOINTS["CATEGORIES"])
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert list_response.json()["total"] == 3
+    assert result_cache.get_stats()["misses"] == 2
+
+
+@pytest.mark.usefixtures("enabled_result_cache")
+def test_written_last_login_dates_invalidate_cached_users_list(
+    admin_user_client: TestClient,
+    basic_user_client: TestClient,
+    admin_user: User,
+    basic_user: User,
+    db_session,
+):
+    admin_user.last_login_date = datetime.utcnow()
+    basic_user.last_login_date = datetime.utcnow() - timedelta(days=1)
+    db_session.commit()
+    params = {"sort": "-last_login_date"}
+
+    cached_page = admin_user_client.get(ENDPOINTS["USERS"], params=params).json()
+    basic_user_client.get(ENDPOINTS["ME_ORDERS"])
+    asyncio.run(last_login_recorder.flush_async())
+    page = admin_user_client.get(ENDPOINTS["USERS"], params=params).json()
+
+    assert cached_page["items"][0]["user"]["id"] == admin_user.id
+    assert page["items"][0]["user"]["id"] == basic_user.id
+
+
+def test_get_result_cache_stats_when_cache_is_disabled(
+    admin_user_client: TestClient, monkeypatch
+):
+    monkeypatch.setattr(result_cache, "backend", None)
+
+    admin_user_client.get(ENDPOINTS["CATEGORIES"])
+    response = admin_user_client.get(ENDPOINTS["STATS"])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["enabled"] is False
+
+
+def test_in_memory_backend_evicts_least_recently_used_results():
+    backend = InMemoryCacheBackend(max_size=2)
+    backend.set("first", b"1", ttl=60)
+    backend.set("second", b"2", ttl=60)
+    backend.get("first")
+
+    backend.set("third", b"3", ttl=60)
+
+    assert backend.get("first") == b"1"
+    assert backend.get("second") is None
+    assert backend.get("third") == b"3"
+
+
+def test_in_memory_backend_expires_results(monkeypatch):
+    backend = InMemoryCacheBackend(max_size=2)
+    backend.set("key", b"value", ttl=10)
+
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: float("inf"))
+
+    assert backend.get("key") is None
+
+
+def test_rolled_back_changes_do_not_invalidate_results(db_session):
+    cache = ResultCache(InMemoryCacheBackend(max_size=10), ttl=60)
+    load_count = 0
+
+    def load():
+        nonlocal load_count
+        load_count += 1
+        return load_count
+
+    cache.get_or_load([Category.__table__], "key", load)
+    db_session.execute(select(Category.id))
+    cache.invalidate(db_session, [Category.__table__])
+    db_session.rollback()
+    cache._bump_versions(db_session)
+
+    assert cache.get_or_load([Category.__table__], "key", load) == 1
+
+
+def test_results_are_stored_as_json():
+    backend = InMemoryCacheBackend(max_size=10)
+    cache = ResultCache(backend, ttl=60)
+
+    result = cache.get_or_load(
+        [Category.__table__], "key", lambda: {"created_at": datetime(2024, 1, 1)}
+    )
+    (stored_value,) = [value for _, value in backend._results.values()]
+
+    assert result == {"created_at": "2024-01-01T00:00:00"}
+    assert json.loads(stored_value) == result
+
+
+def test_dependent_tables_include_tables_changed_by_on_delete_actions():
+    tables = get_dependent_tables(User.__table__)
+
+    assert Address.__table__ in tables
+    assert Order.__table__ in tables
+    assert OrderItem.__table__ not in tables
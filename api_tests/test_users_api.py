@@ -5,7 +5,9 @@ from fastapi.testclient import TestClient
 from fastapi import status
 import pytest
 from src.app import app
-from src.database.models import User
+from sqlalchemy import select
+from src.database.models import Order, User
+from src.database.models.address import get_address_fingerprint
 from api_tests.utils import (
     assert_offset_limit_pagination_data,
     prepare_extended_user_data,
@@ -26,8 +28,15 @@ from api_tests.factories import (
     OrderFactory,
 )
 from src.apis.services.email_service import fm
+from src.apis.services.user_cache import authenticated_user_cache
+from src.apis.services.order_service import OrderService, ProductDoesNotExist
+from src.apis.services.user_service import UserService
 from src.settings import settings
-from src.apis.users.schemas import MIN_PASSWORD_LENGTH
+from src.apis.users.schemas import (
+    MIN_PASSWORD_LENGTH,
+    AddressSchema,
+    OrderCreateSchema,
+)
 from src.apis.token_backend import create_jwt_token_backend
 from src.apis.constants import DEFAULT_LIMIT, DEFAULT_OFFSET
 from src.database.models.order import OrderStatus
@@ -63,6 +72,23 @@ def test_get_users_list_returns_200_on_success(
     )
 
 
+def test_get_users_list_reuses_cached_total_by_default(
+    admin_user_client: TestClient, admin_user
+):
+    UserFactory.create()
+    url = app.url_path_for("get_users_list_api")
+
+    first_response = admin_user_client.get(url)
+    UserFactory.create()
+    second_response = admin_user_client.get(url)
+    exact_response = admin_user_client.get(url, params={"count": "exact"})
+
+    assert first_response.json()["total"] == 2
+    assert len(second_response.json()["items"]) == 3
+    assert second_response.json()["total"] == 2
+    assert exact_response.json()["total"] == 3
+
+
 def test_get_auth_user_info_returns_200_on_success(
     basic_user_client: TestClient, basic_user: User
 ):
@@ -154,6 +180,45 @@ def test_create_auth_user_order_returns_400_when_product_does_not_exist(
     )
 
 
+def test_create_auth_user_order_does_not_create_order_when_product_does_not_exist(
+    basic_user: User, db_session
+):
+    product = ProductFactory.create()
+    address = AddressFactory.create(user=basic_user)
+    db_session.commit()
+    order_service = OrderService(db_session)
+    order_data = OrderCreateSchema(
+        comments="some comments",
+        order_items=[
+            {"product_id": product.id, "quantity": 1},
+            {"product_id": product.id + 1, "quantity": 1},
+        ],
+    )
+
+    with pytest.raises(ProductDoesNotExist):
+        order_service.create_order(basic_user, order_data, address)
+
+    assert db_session.scalars(select(Order.id)).all() == []
+
+
+def test_add_address_returns_existing_address(basic_user: User, db_session):
+    service = UserService(db_session)
+    address_data = AddressSchema(
+        city="City", street="Street", street_number=1, postal_code="00-001"
+    )
+
+    first_address = service.add_address(basic_user, address_data)
+    second_address = service.add_address(
+        basic_user,
+        AddressSchema(
+            city=" CITY ", street="street", street_number=1, postal_code="00-001"
+        ),
+    )
+
+    assert second_address.id == first_address.id
+    assert second_address.city == "City"
+
+
 def test_create_auth_user_order_returns_422_when_duplicated_order_items_provided(
     basic_user_client: TestClient, basic_user: User
 ):
@@ -182,6 +247,29 @@ def test_create_auth_user_order_returns_422_when_duplicated_order_items_provided
     assert response.json()["detail"][0]["msg"] == "Order items must be unique."
 
 
+def test_create_auth_user_order_returns_422_when_no_order_items_provided(
+    basic_user_client: TestClient, basic_user: User
+):
+    address = AddressFactory.create(user=basic_user)
+    delivery_address = {
+        "city": address.city,
+        "street": address.street,
+        "street_number": address.street_number,
+        "postal_code": address.postal_code,
+    }
+    order_data = {"comments": "some comments", "order_items": []}
+    url = app.url_path_for("create_authenticated_user_order_api")
+
+    response = basic_user_client.post(
+        url, json={"order": order_data, "delivery_address": delivery_address}
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert (
+        response.json()["detail"][0]["msg"] == "ensure this value has at least 1 items"
+    )
+
+
 def test_obtain_reset_password_email_returns_202_on_success(
     api_client: TestClient, basic_user: User
 ):
@@ -491,6 +579,39 @@ def test_update_user_address_returns_400_when_address_does_not_exist(
     )
 
 
+def test_update_user_address_returns_400_when_same_address_exists(
+    basic_user_client: TestClient, basic_user: User
+):
+    address, other_address = AddressFactory.create_batch(2, user=basic_user)
+    url = app.url_path_for("update_auth_user_address", address_id=address.id)
+
+    response = basic_user_client.patch(
+        url,
+        json={
+            "city": other_address.city.upper(),
+            "street": other_address.street,
+            "street_number": other_address.street_number,
+            "postal_code": other_address.postal_code,
+        },
+    )
+
+    assert_api_error(
+        response.json(),
+        "The same address already exists.",
+        status.HTTP_400_BAD_REQUEST,
+    )
+
+
+def test_address_fingerprint_is_updated_with_address(db_session):
+    address = AddressFactory.create()
+    address.street = f"  {address.street.upper()}  "
+    db_session.flush()
+
+    assert address.fingerprint == get_address_fingerprint(
+        address.city, address.street.strip(), address.street_number, address.postal_code
+    )
+
+
 def test_get_auth_user_orders_returns_200_on_success(
     basic_user_client: TestClient, basic_user: User
 ):
@@ -616,6 +737,78 @@ def test_get_auth_user_orders_returns_orders_in_required_order(
     )
 
 
+def test_get_auth_user_orders_by_cursor_returns_only_user_orders_in_order(
+    basic_user_client: TestClient, basic_user: User
+):
+    address = AddressFactory.create(user=basic_user)
+    orders = [
+        OrderFactory.create(user=basic_user, delivery_address=address) for _ in range(5)
+    ]
+    OrderFactory.create()
+    expected_ids = [
+        order.id
+        for order in sorted(orders, key=lambda x: (x.total_price, x.id), reverse=True)
+    ]
+    url = app.url_path_for("get_auth_user_orders_by_cursor")
+    params = {"size": 2, "sort": "-total_price"}
+    received_ids = []
+
+    while True:
+        response = basic_user_client.get(url, params=params)
+        response_json = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        received_ids.extend(item["order"]["id"] for item in response_json["items"])
+
+        if response_json["next_cursor"] is None:
+            break
+
+        params["cursor"] = response_json["next_cursor"]
+
+    assert received_ids == expected_ids
+
+
+def test_order_total_price_is_updated_when_order_items_change(db_session):
+    order = OrderFactory.create()
+    first_item, second_item, third_item = order.order_items
+
+    first_item.quantity += 1
+    db_session.delete(second_item)
+    order.order_items.remove(second_item)
+    db_session.flush()
+    db_session.expire(order, ["total_price"])
+
+    assert order.total_price == (
+        first_item.product_price * first_item.quantity
+        + third_item.product_price * third_item.quantity
+    )
+
+
+def test_new_order_of_user_does_not_load_existing_orders(
+    basic_user: User, db_session, query_counter
+):
+    address = AddressFactory.create(user=basic_user)
+    OrderFactory.create_batch(3, user=basic_user, delivery_address=address)
+
+    with query_counter as stats:
+        basic_user.orders.add(
+            OrderFactory.build(user=None, delivery_address=address, order_items=[])
+        )
+        db_session.flush()
+
+    orders = db_session.scalars(basic_user.orders.select()).all()
+    orders_page = db_session.scalars(
+        basic_user.orders.select().order_by(Order.id).limit(2)
+    ).all()
+
+    assert not any(
+        statement.startswith("SELECT") and "FROM orders" in statement
+        for statement in stats.statements
+    )
+    assert len(orders) == 4
+    assert orders_page == sorted(orders, key=lambda order: order.id)[:2]
+
+
 def test_get_auth_user_orders_returns_422_when_wrong_sorting_parameter_provided(
     basic_user_client: TestClient,
 ):
@@ -629,3 +822,93 @@ def test_get_auth_user_orders_returns_422_when_wrong_sorting_parameter_provided(
 
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     assert response.json()["detail"][0]["msg"] == expected_error_message
+
+
+@pytest.mark.query_budget(5)
+def test_get_auth_user_orders_stays_within_query_budget(
+    basic_user_client: TestClient, basic_user: User, db_session, query_counter
+):
+    address = AddressFactory.create(user=basic_user)
+    OrderFactory.create_batch(5, user=basic_user, delivery_address=address)
+    db_session.commit()
+
+    with query_counter:
+        response = basic_user_client.get(app.url_path_for("get_auth_user_orders"))
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.query_budget(4)
+@pytest.mark.parametrize("products_count", [1, 20])
+def test_create_auth_user_order_stays_within_query_budget(
+    basic_user_client: TestClient,
+    basic_user: User,
+    db_session,
+    query_counter,
+    products_count,
+):
+    products = ProductFactory.create_batch(products_count)
+    address = AddressFactory.create(user=basic_user)
+    db_session.commit()
+    delivery_address = {
+        "city": address.city,
+        "street": address.street,
+        "street_number": address.street_number,
+        "postal_code": address.postal_code,
+    }
+    order_data = {
+        "comments": "some comments",
+        "order_items": [
+            {"product_id": product.id, "quantity": 1} for product in products
+        ],
+    }
+
+    with query_counter:
+        response = basic_user_client.post(
+            app.url_path_for("create_authenticated_user_order_api"),
+            json={"order": order_data, "delivery_address": delivery_address},
+        )
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+def test_authenticated_user_is_not_read_from_database_on_repeated_requests(
+    basic_user_client: TestClient, query_counter
+):
+    url = app.url_path_for("get_authenticated_user_info")
+    basic_user_client.get(url)
+
+    with query_counter as stats:
+        response = basic_user_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not any(
+        statement.startswith("SELECT") and "FROM users" in statement
+        for statement in stats.statements
+    )
+
+
+def test_updated_authenticated_user_is_not_served_from_cache(
+    basic_user_client: TestClient,
+):
+    url = app.url_path_for("get_authenticated_user_info")
+    basic_user_client.get(url)
+
+    basic_user_client.patch(
+        app.url_path_for("update_authenticated_user_info"),
+        json={"first_name": "Updated"},
+    )
+    response = basic_user_client.get(url)
+
+    assert response.json()["user"]["first_name"] == "Updated"
+
+
+def test_committed_user_update_removes_user_from_cache(db_session, basic_user: User):
+    user_id = basic_user.id
+    authenticated_user_cache.set(basic_user)
+
+    UserService(db_session).update_user_data(user_id, {"first_name": "New"})
+    db_session.commit()
+    db_session.expunge_all()
+
+    assert authenticated_user_cache.get(db_session, user_id) is None
@@ -1,7 +1,9 @@
 from typing import Any, Mapping, Sequence
 from datetime import datetime
 from src.database.models import User
+from src.database.query_stats import QueryStats, QueryStatsRecorder
 from src.apis.users.schemas import MIN_PASSWORD_LENGTH
+from src.settings import settings
 
 ResponseData = Mapping[str, Any]
 ExpectedData = Mapping[str, Any]
@@ -285,3 +287,68 @@ def create_wrong_user_payload(wrong_field_name: str, wrong_field_value: str):
     new_user_data[wrong_field_name] = wrong_field_value
 
     return new_user_data
+
+
+class QueryCounter:
+    """Count SQL statements executed inside the `with` block.
+
+    On exit the test fails if the block executed more statements than
+    `max_queries`, or if some statement was repeated at least
+    `repeated_query_threshold` times, which is a sign of the N+1 queries.
+
+    Args:
+        max_queries (int | None): query budget of the block, not checked if None
+        repeated_query_threshold (int): number of the same statement executions
+            treated as N+1 queries
+    """
+
+    def __init__(
+        self,
+        max_queries: int | None = None,
+        repeated_query_threshold: int = settings.repeated_query_threshold,
+    ) -> None:
+        self.max_queries = max_queries
+        self.repeated_query_threshold = repeated_query_threshold
+        self.stats: QueryStats | None = None
+        self.recorder = QueryStatsRecorder(lambda: self.stats)
+
+    def __enter__(self) -> QueryStats:
+        self.stats = QueryStats()
+        return self.stats
+
+    def __exit__(self, exc_type, *args: Any) -> None:
+        stats, self.stats = self.stats, None
+
+        if exc_type is not None:
+            return
+
+        executed_statements = "\n".join(
+            f"{count} x {statement}" for statement, count in stats.statements.items()
+        )
+        repeated_statements = stats.get_repeated_statements(
+            self.repeated_query_threshold
+        )
+
+        assert (
+            not repeated_statements
+        ), f"Possible N+1 queries, statements were repeated: {repeated_statements}"
+        assert self.max_queries is None or stats.count <= self.max_queries, (
+            f"{stats.count} queries executed, but the budget is {self.max_queries}:"
+            f"\n{executed_statements}"
+        )
+
+
+class FakeRedis:
+    """Local replacement of the Redis client, which ignores expiration."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, px=None):
+        self.values[key] = value
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1).encode()
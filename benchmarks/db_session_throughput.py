@@ -0,0 +1,107 @@
+"""Compare throughput of the sync and async database session paths.
+
+Both endpoints run the same products list query, the only difference is
+whether they use `get_db_session` (psycopg2, executed in the threadpool)
+or `get_async_db_session` (asyncpg, executed in the event loop).
+
+Usage:
+    poetry run python benchmarks/db_session_throughput.py --requests 2000 \
+        --concurrency 15 --db-latency 0.01
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi_pagination import LimitOffsetPage, add_pagination
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.apis.admin.products.schemas import ProductOutSchema
+from src.apis.services.product_service import AsyncProductService, ProductService
+from src.database.db import get_async_db_session, get_db_session
+
+DB_LATENCY = 0.0
+
+app = FastAPI()
+
+
+@app.get("/sync/products", response_model=LimitOffsetPage[ProductOutSchema])
+def sync_products_list(
+    db_session: Session = Depends(get_db_session),
+) -> Any:
+    if DB_LATENCY:
+        db_session.execute(select(func.pg_sleep(DB_LATENCY)))
+
+    return ProductService(db_session).read_all(None, {})
+
+
+@app.get("/async/products", response_model=LimitOffsetPage[ProductOutSchema])
+async def async_products_list(
+    db_session: AsyncSession = Depends(get_async_db_session),
+) -> Any:
+    if DB_LATENCY:
+        await db_session.execute(select(func.pg_sleep(DB_LATENCY)))
+
+    return await AsyncProductService(db_session).read_all(None, {})
+
+
+add_pagination(app)
+
+
+async def run_benchmark(path: str, requests_number: int, concurrency: int) -> float:
+    """Send requests to the given path and return the number of requests per second."""
+    semaphore = asyncio.Semaphore(concurrency)
+    # httpx 0.24 types ASGI scope as Dict, Starlette as MutableMapping
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def send_request():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await send_request()  # warm up connection pool
+
+        start = time.perf_counter()
+        await asyncio.gather(*(send_request() for _ in range(requests_number)))
+        elapsed = time.perf_counter() - start
+
+    return requests_number / elapsed
+
+
+def main():
+    global DB_LATENCY
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=15,
+        help="should not exceed DB_POOL_SIZE + DB_MAX_OVERFLOW",
+    )
+    parser.add_argument(
+        "--db-latency",
+        type=float,
+        default=0.01,
+        help="simulated query latency in seconds (pg_sleep)",
+    )
+    args = parser.parse_args()
+    DB_LATENCY = args.db_latency
+
+    for name, path in (("sync", "/sync/products"), ("async", "/async/products")):
+        throughput = asyncio.run(run_benchmark(path, args.requests, args.concurrency))
+        print(f"{name:>5}: {throughput:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
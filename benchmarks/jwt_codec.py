@@ -0,0 +1,77 @@
+"""Measure CPU time of the token operations of the auth endpoints.
+
+Compares the backend created by every request with the python-jose backend
+and the process-wide backend with the HS256 codec. Signup and login create
+access and refresh tokens, authenticated requests verify the access token.
+Verified token cache is disabled, so every verification decodes the token.
+No database is needed.
+
+Usage:
+    poetry run python benchmarks/jwt_codec.py --iterations 20000
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from jose import jwt
+
+from src.apis import token_backend
+from src.apis.token_backend import (
+    APITokenBackend,
+    JWTTokenBackend,
+    VerifiedTokenCache,
+    jwt_token_backend,
+)
+from src.database.models import User
+from src.settings import settings
+
+
+def create_tokens_pair(backend: APITokenBackend, user: User) -> None:
+    backend.create_api_token_for_user(user, settings.access_token_lifetime)
+    backend.create_api_token_for_user(user, settings.refresh_token_lifetime)
+
+
+def measure(
+    operation: Callable[[APITokenBackend], None],
+    create_backend: Callable[[], APITokenBackend],
+    iterations: int,
+) -> float:
+    started_at = time.process_time()
+
+    for _ in range(iterations):
+        # backend is obtained by the dependency of every request
+        operation(create_backend())
+
+    return (time.process_time() - started_at) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    token_backend.verified_token_cache = VerifiedTokenCache(max_size=0)
+    user = User(id=1)
+    token = jwt_token_backend.create_api_token_for_user(
+        user, settings.access_token_lifetime
+    )
+    operations = {
+        "signup, login": lambda backend: create_tokens_pair(backend, user),
+        "verify": lambda backend: backend.verify(token),
+    }
+
+    for name, operation in operations.items():
+        before_time = measure(operation, lambda: JWTTokenBackend(jwt), args.iterations)
+        after_time = measure(operation, lambda: jwt_token_backend, args.iterations)
+        print(
+            f"{name:>13}: {before_time * 1e6:7.1f} us -> {after_time * 1e6:7.1f} us "
+            f"per request"
+        )
+
+
+if __name__ == "__main__":
+    main()
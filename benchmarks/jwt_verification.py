@@ -0,0 +1,83 @@
+"""Measure per-request CPU time of the JWT verification with and without cache.
+
+Requests use tokens of the active users, some users send much more requests
+than others, and a part of the requests comes with tokens, which have just
+been issued and were never verified before. Without the cache every request
+decodes the token and checks its signature. No database is needed.
+
+Usage:
+    poetry run python benchmarks/jwt_verification.py --requests 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from jose import jwt
+
+from src.apis import token_backend
+from src.apis.token_backend import JWTTokenBackend, VerifiedTokenCache
+from src.database.models import User
+from src.settings import settings
+
+
+def create_token(user_id: int) -> str:
+    return JWTTokenBackend(jwt).create_api_token_for_user(
+        User(id=user_id), settings.access_token_lifetime
+    )
+
+
+def create_request_tokens(
+    requests: int, active_users: int, new_tokens_ratio: float
+) -> list[str]:
+    user_tokens = [create_token(user_id) for user_id in range(1, active_users + 1)]
+    # activity of the users follows the power law
+    weights = [1 / rank for rank in range(1, active_users + 1)]
+    tokens = random.choices(user_tokens, weights=weights, k=requests)
+    new_tokens = int(requests * new_tokens_ratio)
+
+    for index in random.sample(range(requests), new_tokens):
+        tokens[index] = create_token(active_users + index + 1)
+
+    return tokens
+
+
+def measure(tokens: list[str], cache: VerifiedTokenCache) -> float:
+    token_backend.verified_token_cache = cache
+    started_at = time.process_time()
+
+    for token in tokens:
+        # backend is created by the dependency of every request
+        JWTTokenBackend(jwt).verify(token)
+
+    return (time.process_time() - started_at) / len(tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--active-users", type=int, default=1000)
+    parser.add_argument("--new-tokens-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    random.seed(0)
+    tokens = create_request_tokens(
+        args.requests, args.active_users, args.new_tokens_ratio
+    )
+    # cache of zero size evicts every payload right after it is stored
+    before_time = measure(tokens, VerifiedTokenCache(max_size=0))
+    after_time = measure(
+        tokens, VerifiedTokenCache(settings.verified_token_cache_max_size)
+    )
+
+    print(
+        f"verify: {before_time * 1e6:7.1f} us -> {after_time * 1e6:7.1f} us "
+        f"per request"
+    )
+
+
+if __name__ == "__main__":
+    main()
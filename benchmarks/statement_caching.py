@@ -0,0 +1,103 @@
+"""Measure per-call overhead of preparing the hot service queries.
+
+SQLAlchemy builds the statement and generates its cache key before it can
+look up the compiled SQL in the compiled cache. The benchmark compares this
+overhead for statements built on every call with the prebuilt statements
+and lambda statements used by the services. No database is needed.
+
+Usage:
+    poetry run python benchmarks/statement_caching.py --calls 20000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import and_, lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from src.apis.services.user_service import UserService
+from src.database.models import Address, Order, OrderItem, User
+from sqlalchemy.sql import func
+
+USER_ID = 1
+ADDRESS_ID = 1
+EMAIL = "user@example.com"
+
+user_service = UserService(Session())
+
+
+def get_by_field_value_before():
+    query = select(User).where(User.email == EMAIL)
+    return query._generate_cache_key()
+
+
+def get_by_field_value_after():
+    query = user_service._get_by_field_value_query("email")
+    return query._generate_cache_key()
+
+
+def get_user_delivery_address_before():
+    filters = [Address.user_id == USER_ID, Address.id == ADDRESS_ID]
+    query = (
+        select(Address)
+        .where(and_(*filters))
+        .order_by(Address.created_at.desc())
+        .limit(1)
+    )
+    return query._generate_cache_key()
+
+
+def get_user_delivery_address_after():
+    user_id = USER_ID
+    address_id = ADDRESS_ID
+    query = lambda_stmt(lambda: select(Address).where(Address.user_id == user_id))
+    query += lambda s: s.where(Address.id == address_id)
+    query += lambda s: s.order_by(Address.created_at.desc()).limit(1)
+    return query._generate_cache_key()
+
+
+def orders_list_before():
+    subquery = (
+        select(
+            OrderItem.order_id,
+            func.sum(OrderItem.product_price * OrderItem.quantity).label("total_price"),
+        )
+        .group_by(OrderItem.order_id)
+        .subquery()
+    )
+    query = select(Order).join(subquery, Order.id == subquery.c.order_id)
+    return query.add_columns(subquery.c.total_price)._generate_cache_key()
+
+
+def orders_list_after():
+    # total price is stored in the orders table
+    return select(Order)._generate_cache_key()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    for name, before, after in (
+        ("get_by_field_value", get_by_field_value_before, get_by_field_value_after),
+        (
+            "get_user_delivery_address",
+            get_user_delivery_address_before,
+            get_user_delivery_address_after,
+        ),
+        ("orders list", orders_list_before, orders_list_after),
+    ):
+        before_time = timeit.timeit(before, number=args.calls) / args.calls
+        after_time = timeit.timeit(after, number=args.calls) / args.calls
+        print(
+            f"{name:>26}: {before_time * 1e6:7.1f} us -> {after_time * 1e6:7.1f} us "
+            f"per call"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends
-from src.apis.auth_dependencies import authenticated_admin_user
+from src.apis.auth_dependencies import async_authenticated_admin
 from src.apis.admin.categories.api import ROUTER as category_router
+from src.apis.admin.monitoring.api import ROUTER as monitoring_router
+from src.apis.admin.orders.api import ROUTER as orders_router
 from src.apis.admin.products.api import ROUTER as products_router
 from src.apis.admin.users.api import ROUTER as admin_users_router
 
@@ -8,9 +10,11 @@ from src.apis.admin.users.api import ROUTER as admin_users_router
 ADMINS_ROUTER = APIRouter(
     prefix="/admin",
     tags=["admin"],
-    dependencies=[Depends(authenticated_admin_user)],
+    dependencies=[Depends(async_authenticated_admin)],
 )
 
 ADMINS_ROUTER.include_router(category_router)
 ADMINS_ROUTER.include_router(products_router)
 ADMINS_ROUTER.include_router(admin_users_router)
+ADMINS_ROUTER.include_router(orders_router)
+ADMINS_ROUTER.include_router(monitoring_router)
@@ -1,7 +1,6 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Path, status
-from fastapi_pagination.limit_offset import LimitOffsetPage
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.apis.admin.categories.schemas import (
     CategoryCreate,
@@ -9,8 +8,19 @@ from src.apis.admin.categories.schemas import (
     CategoryFilterParams,
 )
 from src.apis.common_errors import ErrorResponse, build_http_exception_response
-from src.apis.services.category_service import CategoryAlreadyExists, CategoryService
-from src.database.db import get_db_session
+from src.apis.http_cache import conditional_get
+from src.apis.pagination import (
+    CountedLimitOffsetPage,
+    CursorPage,
+    CursorParams,
+    InvalidCursor,
+)
+from src.apis.services.category_service import (
+    AsyncCategoryService,
+    CategoryAlreadyExists,
+)
+from src.database.db import get_async_db_session
+from src.database.models import Category
 
 
 ROUTER = APIRouter(prefix="/categories")
@@ -25,15 +35,15 @@ ROUTER = APIRouter(prefix="/categories")
         status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
     },
 )
-def create_category_api(
+async def create_category_api(
     category_data: CategoryCreate,
-    db_session: Session = Depends(get_db_session),
+    db_session: AsyncSession = Depends(get_async_db_session),
 ):
     """Create new Category entity."""
-    service = CategoryService(db_session)
+    service = AsyncCategoryService(db_session)
 
     try:
-        category = service.create_category(category_data)
+        category = await service.create_category(category_data)
     except CategoryAlreadyExists as error:
         return build_http_exception_response(
             message=error.message,
@@ -43,21 +53,48 @@ def create_category_api(
     return category
 
 
-@ROUTER.get("/")
-def get_categories_list_api(
+@ROUTER.get("/", dependencies=[Depends(conditional_get(Category.__table__))])
+async def get_categories_list_api(
     filters: Annotated[CategoryFilterParams, Depends()],
-    db_session: Session = Depends(get_db_session),
-) -> LimitOffsetPage[CategoryOutSchema]:
+    db_session: AsyncSession = Depends(get_async_db_session),
+) -> CountedLimitOffsetPage[CategoryOutSchema]:
     """Return list of all existing Category entities."""
-    service = CategoryService(db_session)
-    return service.read_all(filters.sort, filters.dict(exclude={"sort"}))
+    service = AsyncCategoryService(db_session)
+    return await service.read_all(filters.sort, filters.dict(exclude={"sort"}))
+
+
+@ROUTER.get(
+    "/cursor",
+    responses={status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse}},
+    dependencies=[Depends(conditional_get(Category.__table__))],
+)
+async def get_categories_cursor_list_api(
+    filters: Annotated[CategoryFilterParams, Depends()],
+    page_params: Annotated[CursorParams, Depends()],
+    db_session: AsyncSession = Depends(get_async_db_session),
+) -> CursorPage[CategoryOutSchema]:
+    """Return page of Category entities, which follow the given cursor."""
+    service = AsyncCategoryService(db_session)
+
+    try:
+        return await service.read_all_by_cursor(
+            filters.sort,
+            filters.dict(exclude={"sort"}),
+            page_params.cursor,
+            page_params.size,
+        )
+    except InvalidCursor as error:
+        return build_http_exception_response(
+            message=error.message,
+            code=status.HTTP_400_BAD_REQUEST,
+        )
 
 
 @ROUTER.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_category_api(
+async def delete_category_api(
     category_id: int = Path(..., gt=0),
-    db_session: Session = Depends(get_db_session),
+    db_session: AsyncSession = Depends(get_async_db_session),
 ) -> None:
     """Delete Category entity with the given ID."""
-    service = CategoryService(db_session)
-    service.delete(category_id)
+    service = AsyncCategoryService(db_session)
+    await service.delete(category_id)
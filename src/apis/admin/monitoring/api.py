@@ -0,0 +1,83 @@
+from fastapi import APIRouter, status
+
+from src.apis.admin.monitoring.schemas import (
+    DatabasePoolsStatsOutSchema,
+    PasswordHasherStatsSchema,
+    ResultCacheStatsSchema,
+    SlowQuerySchema,
+)
+from src.apis.common_errors import ErrorResponse
+from src.apis.services.password_hasher import password_hasher
+from src.apis.services.result_cache import result_cache
+from src.database.db import (
+    async_engine,
+    async_replica_engines,
+    engine,
+    query_logger,
+    replica_engines,
+)
+from src.database.pool_metrics import get_pool_stats
+
+
+ROUTER = APIRouter(prefix="/monitoring")
+
+
+@ROUTER.get(
+    "/db-pools",
+    response_model=DatabasePoolsStatsOutSchema,
+    responses={
+        status.HTTP_200_OK: {"model": DatabasePoolsStatsOutSchema},
+        status.HTTP_403_FORBIDDEN: {"model": ErrorResponse},
+    },
+)
+async def get_db_pools_stats_api():
+    """Return state and usage metrics of the database connection pools."""
+    return {
+        "sync_pool": get_pool_stats(engine.pool),
+        "async_pool": get_pool_stats(async_engine.pool),
+        "sync_replica_pools": [
+            get_pool_stats(replica.pool) for replica in replica_engines
+        ],
+        "async_replica_pools": [
+            get_pool_stats(replica.pool) for replica in async_replica_engines
+        ],
+    }
+
+
+@ROUTER.get(
+    "/slow-queries",
+    response_model=list[SlowQuerySchema],
+    responses={
+        status.HTTP_200_OK: {"model": list[SlowQuerySchema]},
+        status.HTTP_403_FORBIDDEN: {"model": ErrorResponse},
+    },
+)
+async def get_slow_queries_api():
+    """Return recently logged slow SQL queries, the most recent ones first."""
+    return query_logger.get_slow_queries()
+
+
+@ROUTER.get(
+    "/result-cache",
+    response_model=ResultCacheStatsSchema,
+    responses={
+        status.HTTP_200_OK: {"model": ResultCacheStatsSchema},
+        status.HTTP_403_FORBIDDEN: {"model": ErrorResponse},
+    },
+)
+async def get_result_cache_stats_api():
+    """Return hits and misses of the lists result cache."""
+    return result_cache.get_stats()
+
+
+@ROUTER.get(
+    "/password-hasher",
+    response_model=PasswordHasherStatsSchema,
+    responses={
+        status.HTTP_200_OK: {"model": PasswordHasherStatsSchema},
+        status.HTTP_403_FORBIDDEN: {"model": ErrorResponse},
+    },
+)
+async def get_password_hasher_stats_api():
+    """Return queue depth and duration of the password hashings."""
+    return password_hasher.get_stats()
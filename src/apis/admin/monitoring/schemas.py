@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Any, Optional
+from pydantic import BaseModel
+
+
+class HistogramBucketSchema(BaseModel):
+    upper_bound: Optional[float]
+    count: int
+
+
+class HistogramSchema(BaseModel):
+    buckets: list[HistogramBucketSchema]
+    count: int
+    sum: float
+
+
+class PoolStatsSchema(BaseModel):
+    """Schema representing connection pool state and usage metrics."""
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    checkout_timeouts: int
+    connections_created: int
+    max_checked_out: int
+    checkout_wait_time: HistogramSchema
+
+
+class DatabasePoolsStatsOutSchema(BaseModel):
+    sync_pool: PoolStatsSchema
+    async_pool: PoolStatsSchema
+    sync_replica_pools: list[PoolStatsSchema]
+    async_replica_pools: list[PoolStatsSchema]
+
+
+class SlowQuerySchema(BaseModel):
+    """Schema representing logged slow SQL query."""
+
+    statement: str
+    parameters_shape: Any
+    duration: float
+    recorded_at: datetime
+    explain_plan: Optional[str]
+
+
+class ResultCacheStatsSchema(BaseModel):
+    """Schema representing usage metrics of the lists result cache."""
+
+    enabled: bool
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class PasswordHasherStatsSchema(BaseModel):
+    """Schema representing queue depth and duration of the password hashings."""
+
+    workers: int
+    max_pending: int
+    pending: int
+    max_pending_seen: int
+    rejected: int
+    failed: int
+    duration: HistogramSchema
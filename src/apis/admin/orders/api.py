@@ -0,0 +1,29 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.apis.admin.orders.schemas import AdminOrderFilterParams
+from src.apis.export import ExportParams, create_export_response
+from src.apis.services.order_service import AsyncOrderService
+from src.apis.users.schemas import OrderBaseSchema
+from src.database.db import get_async_db_session
+from src.settings import settings
+
+
+ROUTER = APIRouter(prefix="/orders")
+
+
+@ROUTER.get("/export", response_class=StreamingResponse)
+async def export_orders_api(
+    filters: Annotated[AdminOrderFilterParams, Depends()],
+    export_params: Annotated[ExportParams, Depends()],
+    db_session: AsyncSession = Depends(get_async_db_session),
+) -> StreamingResponse:
+    """Stream all existing Order entities as NDJSON or CSV."""
+    service = AsyncOrderService(db_session)
+    partitions = service.stream_all(
+        filters.sort, filters.dict(exclude={"sort"}), settings.export_batch_size
+    )
+    return create_export_response(partitions, OrderBaseSchema, export_params, "orders")
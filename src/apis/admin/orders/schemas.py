@@ -0,0 +1,16 @@
+from typing import Optional
+
+from fastapi import Query
+from pydantic import BaseModel, validator
+
+from src.apis.utils import check_provided_sort_field
+from src.database.models import Order
+
+
+class AdminOrderFilterParams(BaseModel):
+    sort: Optional[str] = Query(None)
+    user_id: Optional[int] = Query(None, gt=0)
+
+    @validator("sort")
+    def validate_sort(cls, value):
+        return check_provided_sort_field(Order.SORTABLE_FIELDS, value)
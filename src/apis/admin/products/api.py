@@ -1,18 +1,35 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Path, status
-from fastapi_pagination.limit_offset import LimitOffsetPage
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.apis.common_errors import ErrorResponse, build_http_exception_response
+from src.apis.export import ExportParams, create_export_response
+from src.apis.http_cache import conditional_get
+from src.apis.pagination import (
+    CountStrategy,
+    CountedLimitOffsetPage,
+    CursorPage,
+    CursorParams,
+    InvalidCursor,
+)
 from src.apis.admin.products.schemas import (
+    ProductBaseSchema,
     ProductCreate,
     ProductOutSchema,
     ProductFilterParams,
 )
-from src.apis.services.category_service import CategoryDoesNotExist, CategoryService
+from src.apis.services.category_service import (
+    AsyncCategoryService,
+    CategoryDoesNotExist,
+)
 from src.apis.services.picture_saver import ServerPictureSaver
-from src.apis.services.product_service import ProductAlreadyExists, ProductService
-from src.database.db import get_db_session
+from src.apis.services.product_service import (
+    AsyncProductService,
+    ProductAlreadyExists,
+)
+from src.database.db import get_async_db_session
+from src.database.models import Product
 from src.settings import settings
 
 
@@ -28,17 +45,19 @@ ROUTER = APIRouter(prefix="/products")
         status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
     },
 )
-def create_product_api(
+async def create_product_api(
     product_data: ProductCreate,
-    db_session: Session = Depends(get_db_session),
+    db_session: AsyncSession = Depends(get_async_db_session),
 ):
     """Create new Product entity."""
     picture_saver = ServerPictureSaver(settings)
-    product_service = ProductService(picture_saver=picture_saver, db_session=db_session)
-    category_service = CategoryService(db_session)
+    product_service = AsyncProductService(
+        picture_saver=picture_saver, db_session=db_session
+    )
+    category_service = AsyncCategoryService(db_session)
 
     try:
-        category_service.get_by_id(product_data.category_id)
+        await category_service.get_by_id(product_data.category_id)
     except CategoryDoesNotExist as error:
         return build_http_exception_response(
             message=error.message,
@@ -46,7 +65,7 @@ def create_product_api(
         )
 
     try:
-        product = product_service.create_product(product_data)
+        product = await product_service.create_product(product_data)
     except ProductAlreadyExists as error:
         return build_http_exception_response(
             message=error.message,
@@ -56,21 +75,70 @@ def create_product_api(
     return product
 
 
-@ROUTER.get("/")
-def get_products_list_api(
+@ROUTER.get(
+    "/",
+    response_model=CountedLimitOffsetPage[ProductOutSchema].with_custom_options(
+        count=CountStrategy.CACHED
+    ),
+    dependencies=[Depends(conditional_get(Product.__table__))],
+)
+async def get_products_list_api(
     filters: Annotated[ProductFilterParams, Depends()],
-    db_session: Session = Depends(get_db_session),
-) -> LimitOffsetPage[ProductOutSchema]:
+    db_session: AsyncSession = Depends(get_async_db_session),
+) -> CountedLimitOffsetPage[ProductOutSchema]:
     """Return list of all existing Product entities."""
-    service = ProductService(db_session)
-    return service.read_all(filters.sort, filters.dict(exclude={"sort"}))
+    service = AsyncProductService(db_session)
+    return await service.read_all(filters.sort, filters.dict(exclude={"sort"}))
+
+
+@ROUTER.get(
+    "/cursor",
+    responses={status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse}},
+    dependencies=[Depends(conditional_get(Product.__table__))],
+)
+async def get_products_cursor_list_api(
+    filters: Annotated[ProductFilterParams, Depends()],
+    page_params: Annotated[CursorParams, Depends()],
+    db_session: AsyncSession = Depends(get_async_db_session),
+) -> CursorPage[ProductOutSchema]:
+    """Return page of Product entities, which follow the given cursor."""
+    service = AsyncProductService(db_session)
+
+    try:
+        return await service.read_all_by_cursor(
+            filters.sort,
+            filters.dict(exclude={"sort"}),
+            page_params.cursor,
+            page_params.size,
+        )
+    except InvalidCursor as error:
+        return build_http_exception_response(
+            message=error.message,
+            code=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+@ROUTER.get("/export", response_class=StreamingResponse)
+async def export_products_api(
+    filters: Annotated[ProductFilterParams, Depends()],
+    export_params: Annotated[ExportParams, Depends()],
+    db_session: AsyncSession = Depends(get_async_db_session),
+) -> StreamingResponse:
+    """Stream all existing Product entities as NDJSON or CSV."""
+    service = AsyncProductService(db_session)
+    partitions = service.stream_all(
+        filters.sort, filters.dict(exclude={"sort"}), settings.export_batch_size
+    )
+    return create_export_response(
+        partitions, ProductBaseSchema, export_params, "products"
+    )
 
 
 @ROUTER.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_product_api(
+async def delete_product_api(
     product_id: int = Path(..., gt=0),
-    db_session: Session = Depends(get_db_session),
+    db_session: AsyncSession = Depends(get_async_db_session),
 ) -> None:
     """Delete Product entity with the given ID."""
-    service = ProductService(db_session)
-    service.delete(product_id)
+    service = AsyncProductService(db_session)
+    await service.delete(product_id)
@@ -1,19 +1,30 @@
 from fastapi import Depends, APIRouter, Path, status
+from fastapi.responses import StreamingResponse
 
 from src.apis.admin.users.schemas import (
     UserExtendedCreateSchema,
     UserExtendedOutSchema,
     UserExtendedFilterParams,
+    UserExtendedSchema,
 )
-from fastapi_pagination.limit_offset import LimitOffsetPage
 from typing import Annotated
 from src.apis.common_errors import ErrorResponse, build_http_exception_response
-from src.database.db import get_db_session
-from sqlalchemy.orm import Session
+from src.apis.export import ExportParams, create_export_response
+from src.apis.http_cache import conditional_get
+from src.apis.pagination import (
+    CountStrategy,
+    CountedLimitOffsetPage,
+    CursorPage,
+    CursorParams,
+    InvalidCursor,
+)
+from src.database.db import get_async_db_session
+from src.settings import settings
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.apis.services.user_service import (
+    AsyncUserService,
     UserAlreadyExists,
     UserDoesNotExist,
-    UserService,
 )
 
 ROUTER = APIRouter(prefix="/users")
@@ -28,13 +39,14 @@ ROUTER = APIRouter(prefix="/users")
         status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
     },
 )
-def create_user_by_admin_api(
-    user_data: UserExtendedCreateSchema, db_session: Session = Depends(get_db_session)
+async def create_user_by_admin_api(
+    user_data: UserExtendedCreateSchema,
+    db_session: AsyncSession = Depends(get_async_db_session),
 ):
-    service = UserService(db_session)
+    service = AsyncUserService(db_session)
 
     try:
-        user = service.create_user(user_data)
+        user = await service.create_user(user_data)
     except UserAlreadyExists as error:
         return build_http_exception_response(
             message=error.message,
@@ -44,14 +56,63 @@ def create_user_by_admin_api(
     return user
 
 
-@ROUTER.get("/")
-def get_users_list_api(
+@ROUTER.get(
+    "/",
+    response_model=CountedLimitOffsetPage[UserExtendedOutSchema].with_custom_options(
+        count=CountStrategy.CACHED
+    ),
+    dependencies=[Depends(conditional_get())],
+)
+async def get_users_list_api(
     filters: Annotated[UserExtendedFilterParams, Depends()],
-    db_session: Session = Depends(get_db_session),
-) -> LimitOffsetPage[UserExtendedOutSchema]:
+    db_session: AsyncSession = Depends(get_async_db_session),
+) -> CountedLimitOffsetPage[UserExtendedOutSchema]:
     """Return list of all existing User entities."""
-    service = UserService(db_session)
-    return service.read_all(filters.sort, filters.dict(exclude={"sort"}))
+    service = AsyncUserService(db_session)
+    return await service.read_all(filters.sort, filters.dict(exclude={"sort"}))
+
+
+@ROUTER.get(
+    "/cursor",
+    responses={status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse}},
+    dependencies=[Depends(conditional_get())],
+)
+async def get_users_cursor_list_api(
+    filters: Annotated[UserExtendedFilterParams, Depends()],
+    page_params: Annotated[CursorParams, Depends()],
+    db_session: AsyncSession = Depends(get_async_db_session),
+) -> CursorPage[UserExtendedOutSchema]:
+    """Return page of User entities, which follow the given cursor."""
+    service = AsyncUserService(db_session)
+
+    try:
+        return await service.read_all_by_cursor(
+            filters.sort,
+            filters.dict(exclude={"sort"}),
+            page_params.cursor,
+            page_params.size,
+        )
+    except InvalidCursor as error:
+        return build_http_exception_response(
+            message=error.message,
+            code=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+@ROUTER.get("/export", response_class=StreamingResponse)
+async def export_users_api(
+    filters: Annotated[UserExtendedFilterParams, Depends()],
+    export_params: Annotated[ExportParams, Depends()],
+    db_session: AsyncSession = Depends(get_async_db_session),
+) -> StreamingResponse:
+    """Stream all existing User entities as NDJSON or CSV."""
+    service = AsyncUserService(db_session)
+    partitions = service.stream_all(
+        filters.sort, filters.dict(exclude={"sort"}), settings.export_batch_size
+    )
+    return create_export_response(
+        partitions, UserExtendedSchema, export_params, "users"
+    )
 
 
 @ROUTER.get(
@@ -61,15 +122,17 @@ def get_users_list_api(
         status.HTTP_200_OK: {"model": UserExtendedOutSchema},
         status.HTTP_404_NOT_FOUND: {"model": ErrorResponse},
     },
+    dependencies=[Depends(conditional_get())],
 )
-def get_user_api(
-    user_id: int = Path(..., gt=0), db_session: Session = Depends(get_db_session)
+async def get_user_api(
+    user_id: int = Path(..., gt=0),
+    db_session: AsyncSession = Depends(get_async_db_session),
 ):
     """Return information about user with the provided id."""
-    service = UserService(db_session)
+    service = AsyncUserService(db_session)
 
     try:
-        user = service.get_by_id(user_id)
+        user = await service.get_by_id(user_id)
     except UserDoesNotExist as error:
         return build_http_exception_response(
             message=error.message,
@@ -80,9 +143,9 @@ def get_user_api(
 
 
 @ROUTER.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user_api(
+async def delete_user_api(
     user_id: int = Path(..., gt=0),
-    db_session: Session = Depends(get_db_session),
+    db_session: AsyncSession = Depends(get_async_db_session),
 ):
-    service = UserService(db_session)
-    service.delete(user_id)
+    service = AsyncUserService(db_session)
+    await service.delete(user_id)
@@ -1,18 +1,58 @@
 from datetime import datetime
+from typing import TypeVar
 
 from fastapi import Depends, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.apis.services.user_service import UserService
+from src.apis.services.last_login import last_login_recorder
+from src.apis.services.user_service import (
+    AsyncUserService,
+    UserDoesNotExist,
+    UserService,
+)
 from src.apis.token_backend import (
     APITokenBackend,
     InvalidToken,
+    TokenClaims,
     create_jwt_token_backend,
 )
-from src.database.db import get_db_session
+from src.database.db import get_async_db_session, get_db_session
 from src.database.models import User
 from src.apis.common_errors import build_http_exception_response
+from src.settings import settings
+
+
+class AuthenticatedPrincipal:
+    """User authenticated by the token, whose row is loaded only when needed.
+
+    In the claims-only mode roles are taken from the verified access token,
+    so requests, which don't need the user row, don't query the users table
+    and don't record the login. Otherwise, and for tokens without roles, the
+    user is loaded by the dependency and roles are taken from the row.
+    """
+
+    def __init__(self, claims: TokenClaims, service: AsyncUserService) -> None:
+        self.user_id = claims.user_id
+        self.is_admin = claims.is_admin
+        self.is_employee = claims.is_employee
+        self._service = service
+        self._user: User | None = None
+
+    async def get_user(self) -> User:
+        """Load the authenticated user and record the login on first call."""
+        if self._user is None:
+            self._user = await self._service.run_sync(
+                _load_user, self.user_id, self._service.service
+            )
+            self.is_admin = self._user.is_admin
+            self.is_employee = self._user.is_employee
+
+        return self._user
+
+
+AuthorizedUser = TypeVar("AuthorizedUser", bound=User | AuthenticatedPrincipal)
 
 
 def authenticated_user(
@@ -21,26 +61,100 @@ def authenticated_user(
     token_backend: APITokenBackend = Depends(create_jwt_token_backend),
 ) -> User:
     """Protect API endpoints with JWT token authentication."""
-    service = UserService(db_session)
-
-    if credentials is not None:
-        try:
-            user = token_backend.get_user_from_token(credentials.credentials, service)
-        except InvalidToken:
-            return build_http_exception_response(
-                message="Token is not valid.", code=status.HTTP_403_FORBIDDEN
-            )
-    else:
+    return _authenticate_user(credentials, token_backend, UserService(db_session))
+
+
+async def async_authenticated_user(
+    credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer(auto_error=False)),
+    db_session: AsyncSession = Depends(get_async_db_session),
+    token_backend: APITokenBackend = Depends(create_jwt_token_backend),
+) -> User:
+    """Protect async API endpoints with JWT token authentication."""
+    service = AsyncUserService(db_session)
+    return await service.run_sync(
+        _authenticate_user, credentials, token_backend, service.service
+    )
+
+
+async def async_authenticated_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer(auto_error=False)),
+    db_session: AsyncSession = Depends(get_async_db_session),
+    token_backend: APITokenBackend = Depends(create_jwt_token_backend),
+) -> AuthenticatedPrincipal:
+    """Protect async API endpoints, which may not need the user row."""
+    if credentials is None:
         return build_http_exception_response(
             message="Not authenticated.", code=status.HTTP_403_FORBIDDEN
         )
 
-    service.update_user_last_login_date(user.id, new_last_login_time=datetime.utcnow())
+    try:
+        claims = token_backend.get_claims_from_token(credentials.credentials)
+    except InvalidToken:
+        return build_http_exception_response(
+            message="Token is not valid.", code=status.HTTP_403_FORBIDDEN
+        )
+
+    principal = AuthenticatedPrincipal(claims, AsyncUserService(db_session))
 
-    return user
+    if not settings.claims_only_authentication or claims.is_admin is None:
+        await principal.get_user()
+
+    return principal
 
 
 def authenticated_admin_user(user: User = Depends(authenticated_user)):
+    return _check_admin_permissions(user)
+
+
+async def async_authenticated_admin(
+    principal: AuthenticatedPrincipal = Depends(async_authenticated_principal),
+) -> AuthenticatedPrincipal:
+    """Protect async admin API endpoints, authorizing by the token roles if enabled."""
+    return _check_admin_permissions(principal)
+
+
+def _authenticate_user(
+    credentials: HTTPAuthorizationCredentials | None,
+    token_backend: APITokenBackend,
+    service: UserService,
+) -> User:
+    user = _get_user_from_credentials(credentials, token_backend, service)
+    # last login is written later in a batch, so requests don't write the users
+    last_login_recorder.record(user, login_time=datetime.utcnow())
+    return user
+
+
+def _load_user(user_id: int, service: UserService) -> User:
+    try:
+        user = service.get_authenticated_user(user_id)
+    except UserDoesNotExist:
+        return build_http_exception_response(
+            message="Token is not valid.", code=status.HTTP_403_FORBIDDEN
+        )
+
+    last_login_recorder.record(user, login_time=datetime.utcnow())
+    return user
+
+
+def _get_user_from_credentials(
+    credentials: HTTPAuthorizationCredentials | None,
+    token_backend: APITokenBackend,
+    service: UserService,
+) -> User:
+    if credentials is None:
+        return build_http_exception_response(
+            message="Not authenticated.", code=status.HTTP_403_FORBIDDEN
+        )
+
+    try:
+        return token_backend.get_user_from_token(credentials.credentials, service)
+    except InvalidToken:
+        return build_http_exception_response(
+            message="Token is not valid.", code=status.HTTP_403_FORBIDDEN
+        )
+
+
+def _check_admin_permissions(user: AuthorizedUser) -> AuthorizedUser:
     if user.is_admin is False:
         return build_http_exception_response(
             message="Access denied.", code=status.HTTP_403_FORBIDDEN
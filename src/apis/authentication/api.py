@@ -7,16 +7,19 @@ from src.apis.token_backend import (
 )
 from src.apis.common_errors import build_http_exception_response, ErrorResponse
 from src.apis.services.user_service import (
+    AsyncUserService,
     UserService,
     UserDoesNotExist,
     UserAlreadyExists,
 )
 from fastapi.security import OAuth2PasswordRequestForm
-from src.database.db import get_db_session
+from src.database.db import get_async_db_session, get_db_session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src.settings import settings
 from src.apis.authentication.schemas import (
     RefreshToken,
+    TokenRevocation,
     TokensData,
     AccessToken,
     SignUpResponseSchema,
@@ -35,24 +38,22 @@ ROUTER = APIRouter(prefix="/auth", tags=["auth"])
         status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
     },
 )
-def create_user_api(
+async def create_user_api(
     user_data: UserCreateSchema,
-    db_session: Session = Depends(get_db_session),
+    db_session: AsyncSession = Depends(get_async_db_session),
     token_backend: APITokenBackend = Depends(create_jwt_token_backend),
 ):
-    service = UserService(db_session)
+    service = AsyncUserService(db_session)
 
     try:
-        user = service.create_user(user_data)
+        user = await service.create_user(user_data)
     except UserAlreadyExists as error:
         return build_http_exception_response(
             message=error.message,
             code=status.HTTP_400_BAD_REQUEST,
         )
 
-    access_token = token_backend.create_api_token_for_user(
-        user, settings.access_token_lifetime
-    )
+    access_token = token_backend.create_access_token_for_user(user)
     refresh_token = token_backend.create_api_token_for_user(
         user, settings.refresh_token_lifetime
     )
@@ -72,25 +73,24 @@ def create_user_api(
     },
     response_model=TokensData,
 )
-def get_tokens_for_user(
+async def get_tokens_for_user(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db_session: Session = Depends(get_db_session),
+    db_session: AsyncSession = Depends(get_async_db_session),
     token_backend: APITokenBackend = Depends(create_jwt_token_backend),
 ):
     """Create and return a new access and refresh tokens after successful login."""
-    service = UserService(db_session)
-    user = service.get_by_field_value("email", form_data.username)
+    service = AsyncUserService(db_session)
+    user = await service.get_by_field_value("email", form_data.username)
 
-    if user is None or not user.verify_password(form_data.password, user.password_hash):
+    # password hashing is CPU bound, so it runs in the process pool
+    if user is None or not await service.verify_password(user, form_data.password):
         return build_http_exception_response(
             message="Incorrect username or password",
             code=status.HTTP_401_UNAUTHORIZED,
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = token_backend.create_api_token_for_user(
-        user, settings.access_token_lifetime
-    )
+    access_token = token_backend.create_access_token_for_user(user)
     refresh_token = token_backend.create_api_token_for_user(
         user, settings.refresh_token_lifetime
     )
@@ -128,8 +128,26 @@ def refresh_token(
             message="Refresh token is invalid", code=status.HTTP_401_UNAUTHORIZED
         )
 
-    access_token = token_backend.create_api_token_for_user(
-        user, settings.access_token_lifetime
-    )
+    access_token = token_backend.create_access_token_for_user(user)
 
     return {"access_token": access_token}
+
+
+@ROUTER.post(
+    "/revoke",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponse},
+    },
+)
+async def revoke_token(
+    token: TokenRevocation,
+    token_backend: APITokenBackend = Depends(create_jwt_token_backend),
+):
+    """Revoke access or refresh token, so it is not accepted anymore."""
+    try:
+        await token_backend.revoke_token(token.token)
+    except InvalidToken:
+        return build_http_exception_response(
+            message="Token is invalid", code=status.HTTP_401_UNAUTHORIZED
+        )
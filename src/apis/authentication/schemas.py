@@ -10,6 +10,10 @@ class RefreshToken(BaseModel):
     refresh_token: str
 
 
+class TokenRevocation(BaseModel):
+    token: str
+
+
 class TokensData(RefreshToken, AccessToken):
     """Schema representing authorization tokens for the user."""
 
@@ -1,2 +1,3 @@
 DEFAULT_LIMIT = 50
 DEFAULT_OFFSET = 0
+MAX_LIMIT = 100
@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+import zlib
+from enum import Enum
+from typing import Any, AsyncIterator, Sequence, Type
+
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+# gzip container instead of the raw zlib stream
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+class ExportParams(BaseModel):
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Export format")
+    gzip: bool = Query(False, description="Compress the export with gzip")
+
+
+def create_export_response(
+    partitions: AsyncIterator[Sequence[Any]],
+    schema: Type[BaseModel],
+    params: ExportParams,
+    filename: str,
+) -> StreamingResponse:
+    """Create response, which streams the exported records as they are fetched.
+
+    Every partition of the records is encoded to one chunk of the response, so
+    only one partition is kept in memory at a time.
+
+    Args:
+        partitions (AsyncIterator[Sequence[Any]]): partitions of the records
+        schema (Type[BaseModel]): orm mode schema of one exported record
+        params (ExportParams): export format and compression
+        filename (str): name of the exported file without extension
+
+    Returns:
+        StreamingResponse: response with the exported records
+    """
+    content = _encode_partitions(partitions, schema, params.format)
+    headers = {
+        "Content-Disposition": (
+            f'attachment; filename="{filename}.{params.format.value}"'
+        )
+    }
+
+    if params.gzip:
+        content = _compress(content)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        content, media_type=EXPORT_MEDIA_TYPES[params.format], headers=headers
+    )
+
+
+async def _encode_partitions(
+    partitions: AsyncIterator[Sequence[Any]],
+    schema: Type[BaseModel],
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    field_names = list(schema.__fields__)
+
+    if export_format == ExportFormat.CSV:
+        yield _encode_csv_rows([field_names])
+
+    async for partition in partitions:
+        # json of the schema applies its encoders, e.g. of the enums
+        records = [json.loads(schema.from_orm(row).json()) for row in partition]
+
+        if export_format == ExportFormat.CSV:
+            yield _encode_csv_rows(
+                [_to_csv_value(record[name]) for name in field_names]
+                for record in records
+            )
+        else:
+            yield "".join(f"{json.dumps(record)}\n" for record in records).encode()
+
+
+def _encode_csv_rows(rows: Any) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _to_csv_value(value: Any) -> Any:
+    # nested values, e.g. order items, are stored as json in one column
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+
+    return value
+
+
+async def _compress(content: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+
+    async for chunk in content:
+        if compressed_chunk := compressor.compress(chunk):
+            yield compressed_chunk
+
+    yield compressor.flush()
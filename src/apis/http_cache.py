@@ -0,0 +1,103 @@
+"""Conditional GET responses with strong ETags and Cache-Control policies.
+
+Routes opt in with the `conditional_get` dependency. ETag of their responses
+is a hash of the serialized body, which is computed by the
+`ConditionalGetMiddleware`. Routes, which read only the given tables, get
+ETags from the versions of the tables instead, when the versions are shared
+by all workers and the request reads from the primary, so `If-None-Match`
+hits are answered before the page query.
+
+Cache-Control of the route is taken from `route_cache_control` setting by
+the route name, e.g. `{"get_categories_list_api": "private, max-age=30"}`,
+and from `default_cache_control` otherwise.
+"""
+import hashlib
+from typing import Callable, cast
+
+from fastapi import Request, Response, status
+from sqlalchemy import FromClause, Table
+
+from src.apis.services.result_cache import result_cache
+from src.database.db import may_read_from_replica
+from src.settings import settings
+
+CACHE_CONTROL_STATE_KEY = "cache_control"
+ETAG_STATE_KEY = "etag"
+# responses depend on the authenticated user
+VARY_HEADER = "Authorization"
+
+
+class NotModified(Exception):
+    """Raised when the client already has the current version of the response."""
+
+    def __init__(self, etag: str, cache_control: str) -> None:
+        self.etag = etag
+        self.cache_control = cache_control
+
+
+def conditional_get(*tables: FromClause) -> Callable[[Request], None]:
+    """Create dependency, which enables conditional responses of the route.
+
+    Args:
+        tables (FromClause): tables of the models, e.g. `Product.__table__`,
+            whose versions identify the response data, if the route reads only
+            the tables changed through the services
+
+    Returns:
+        Callable[[Request], None]: route dependency
+    """
+    # declarative models are mapped to tables
+    versioned_tables = cast(tuple[Table, ...], tables)
+
+    # sync dependency runs in the threadpool, so the versions backend doesn't
+    # block the event loop
+    def check_conditional_request(request: Request) -> None:
+        cache_control = settings.route_cache_control.get(
+            request.scope["endpoint"].__name__, settings.default_cache_control
+        )
+        setattr(request.state, CACHE_CONTROL_STATE_KEY, cache_control)
+
+        # versions are read before the page query, which may go to a lagging
+        # replica, so the old body would get the ETag of the current versions
+        if (
+            not versioned_tables
+            or may_read_from_replica(request)
+            or (versions := result_cache.get_versions_tag(versioned_tables)) is None
+        ):
+            return
+
+        etag = create_etag(f"{versions}:{request.url.path}?{request.url.query}")
+        setattr(request.state, ETAG_STATE_KEY, etag)
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise NotModified(etag, cache_control)
+
+    return check_conditional_request
+
+
+def not_modified_exception_handler(request: Request, error: NotModified) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=get_cache_headers(error.etag, error.cache_control),
+    )
+
+
+def create_etag(content: str | bytes) -> str:
+    if isinstance(content, str):
+        content = content.encode()
+
+    return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check `If-None-Match` header with the weak comparison, as RFC 9110 requires."""
+    if if_none_match is None:
+        return False
+    elif if_none_match.strip() == "*":
+        return True
+
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def get_cache_headers(etag: str, cache_control: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control, "Vary": VARY_HEADER}
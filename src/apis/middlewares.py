@@ -0,0 +1,158 @@
+import logging
+import time
+
+from fastapi import status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.apis.http_cache import (
+    CACHE_CONTROL_STATE_KEY,
+    ETAG_STATE_KEY,
+    create_etag,
+    etag_matches,
+    get_cache_headers,
+)
+from src.database.db import READ_ONLY_HTTP_METHODS
+from src.database.query_stats import QueryStats, collect_query_stats
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PrimaryPinMiddleware:
+    """Pin client to the primary database after a successful write request.
+
+    The pin is stored in a cookie with the expiration timestamp, which is
+    checked by the database session dependencies. Until it expires, reads of
+    the client are not routed to replicas, so the client sees its own writes.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in READ_ONLY_HTTP_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                headers.append("set-cookie", self._create_pin_cookie())
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin_cookie)
+
+    def _create_pin_cookie(self) -> str:
+        pin_lifetime = int(settings.primary_pin_lifetime.total_seconds())
+        pinned_until = int(time.time()) + pin_lifetime
+
+        return (
+            f"{settings.primary_pin_cookie_name}={pinned_until}; "
+            + f"Max-Age={pin_lifetime}; Path=/; HttpOnly; SameSite=lax"
+        )
+
+
+class QueryStatsMiddleware:
+    """Count SQL statements and total database time of every request.
+
+    Stats are logged after the request is processed, including statements
+    executed by the dependencies teardown, e.g. the final flush. Statements
+    repeated at least `repeated_query_threshold` times, which usually are
+    lazy loads in a loop (N+1 queries), are reported with a warning.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_query_stats() as stats:
+            await self.app(scope, receive, send)
+
+        self._log_query_stats(scope, stats)
+
+    def _log_query_stats(self, scope: Scope, stats: QueryStats) -> None:
+        endpoint = f"{scope['method']} {scope['path']}"
+        logger.debug(
+            "%s executed %d queries in %.4fs", endpoint, stats.count, stats.duration
+        )
+
+        repeated_statements = stats.get_repeated_statements(
+            settings.repeated_query_threshold
+        )
+
+        for statement, count in repeated_statements.items():
+            logger.warning(
+                "Possible N+1 query, %s executed statement %d times: %s",
+                endpoint,
+                count,
+                statement,
+            )
+
+
+class ConditionalGetMiddleware:
+    """Add ETag and Cache-Control to the successful responses of opted in routes.
+
+    Body of the response is buffered to compute its hash, unless ETag was
+    already found by the route dependency. If it matches `If-None-Match`
+    header of the request, body is dropped and `304 Not Modified` is sent.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        response_start: Message | None = None
+        body_parts: list[bytes] = []
+
+        async def send_conditional(message: Message) -> None:
+            nonlocal response_start
+
+            if message["type"] == "http.response.start":
+                state = scope.get("state", {})
+
+                if message["status"] == 200 and CACHE_CONTROL_STATE_KEY in state:
+                    response_start = message
+                else:
+                    await send(message)
+            elif response_start is None or message["type"] != "http.response.body":
+                await send(message)
+            else:
+                body_parts.append(message.get("body", b""))
+
+                if not message.get("more_body", False):
+                    await self._send_response(
+                        scope, response_start, b"".join(body_parts), send
+                    )
+
+        await self.app(scope, receive, send_conditional)
+
+    async def _send_response(
+        self, scope: Scope, response_start: Message, body: bytes, send: Send
+    ) -> None:
+        state = scope["state"]
+        etag = state.get(ETAG_STATE_KEY) or create_etag(body)
+        headers = MutableHeaders(scope=response_start)
+
+        for name, value in get_cache_headers(
+            etag, state[CACHE_CONTROL_STATE_KEY]
+        ).items():
+            headers[name] = value
+
+        if etag_matches(Headers(scope=scope).get("if-none-match"), etag):
+            del headers["content-length"]
+            del headers["content-type"]
+            response_start["status"] = status.HTTP_304_NOT_MODIFIED
+            body = b""
+
+        await send(response_start)
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,327 @@
+import base64
+import binascii
+import json
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Generic, Optional, Sequence, TypeVar
+
+from fastapi import Query
+from fastapi_pagination.api import create_page, resolve_params
+from fastapi_pagination.bases import AbstractPage, AbstractParams
+from fastapi_pagination.ext.sqlalchemy import count_query
+from fastapi_pagination.limit_offset import LimitOffsetParams
+from fastapi_pagination.types import GreaterEqualOne, GreaterEqualZero
+from pydantic import BaseModel
+from pydantic.generics import GenericModel
+from sqlalchemy import Column, ClauseElement, Executable, Select, Table, func, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.compiler import SQLCompiler
+
+from src.apis.common_errors import ServiceBaseError
+from src.apis.constants import DEFAULT_LIMIT, MAX_LIMIT
+from src.settings import settings
+
+T = TypeVar("T")
+
+TOTAL_COUNT_LABEL = "total_count"
+
+
+class CountStrategy(str, Enum):
+    """How the total number of records of the limit/offset page is found.
+
+    * `exact` - with the window function in the same query as the page rows,
+    * `estimated` - from the table statistics for unfiltered lists and from
+      the planner row estimate otherwise, cheap but approximate,
+    * `cached` - exact count, which is reused for `count_cache_ttl` seconds,
+    * `none` - total is not returned, `has_more` flag is returned instead.
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+    NONE = "none"
+
+
+class CountedLimitOffsetParams(LimitOffsetParams):
+    count: CountStrategy = Query(
+        CountStrategy.EXACT, description="Strategy of the total count"
+    )
+
+
+class CountedLimitOffsetPage(AbstractPage[T], Generic[T]):
+    """Limit/offset page, whose total is found with the requested strategy.
+
+    Fields are the ones of `LimitOffsetPage`, but the total is optional.
+    Endpoints change the default strategy with their response model, e.g. the
+    admin lists use `CountedLimitOffsetPage[Schema].with_custom_options(
+    count=CountStrategy.CACHED)`.
+    """
+
+    items: Sequence[T]
+    total: Optional[GreaterEqualZero]
+    limit: Optional[GreaterEqualOne]
+    offset: Optional[GreaterEqualZero]
+    has_more: Optional[bool] = None
+
+    __params_type__ = CountedLimitOffsetParams
+
+    @classmethod
+    def create(
+        cls,
+        items: Sequence[T],
+        params: AbstractParams,
+        *,
+        total: Optional[int] = None,
+        **kwargs: Any,
+    ) -> "CountedLimitOffsetPage[T]":
+        raw_params = params.to_raw_params().as_limit_offset()
+        return cls(
+            items=items,
+            total=total,
+            limit=raw_params.limit,
+            offset=raw_params.offset,
+            **kwargs,
+        )
+
+
+class InvalidCursor(ServiceBaseError):
+    """Raised in case when received cursor can't be decoded or used."""
+
+
+class CursorParams(BaseModel):
+    cursor: Optional[str] = Query(None, description="Cursor of the page")
+    size: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT, description="Page size")
+
+
+class CursorPage(GenericModel, Generic[T]):
+    """Page of the keyset pagination.
+
+    `next_cursor` is None on the last page. Cursor is opaque for the clients,
+    they should pass it back unchanged together with the same `sort`.
+    """
+
+    items: Sequence[T]
+    size: int
+    next_cursor: Optional[str]
+
+    class Config:
+        orm_mode = True
+
+
+def encode_cursor(sort: str | None, values: Sequence[Any]) -> str:
+    """Encode sort parameter and sort key of the last row of the page.
+
+    Args:
+        sort (str | None): sort parameter of the page
+        values (Sequence[Any]): values of the sort columns, `id` is the last one
+
+    Returns:
+        str: URL safe cursor
+    """
+    payload = json.dumps({"sort": sort, "key": [_to_json(value) for value in values]})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str | None, columns: Sequence[Column]) -> list:
+    """Decode sort key of the cursor to the python types of the sort columns.
+
+    Args:
+        cursor (str): cursor received from the client
+        sort (str | None): sort parameter of the current request
+        columns (Sequence[Column]): sort columns, `id` is the last one
+
+    Raises:
+        InvalidCursor: if the cursor is malformed or was issued for other sort
+
+    Returns:
+        list: values of the sort columns
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        values = payload["key"]
+
+        if payload["sort"] != sort or len(values) != len(columns):
+            raise ValueError("Cursor does not match the sort parameter.")
+
+        return [
+            _from_json(value, column.type.python_type)
+            for value, column in zip(values, columns)
+        ]
+    except (ValueError, TypeError, KeyError, binascii.Error) as error:
+        raise InvalidCursor(message="Invalid cursor.") from error
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    elif isinstance(value, Decimal):
+        return str(value)
+
+    return value
+
+
+def _from_json(value: Any, python_type: type[Any]) -> Any:
+    # datetime is a subclass of date
+    if issubclass(python_type, date):
+        return python_type.fromisoformat(value)
+
+    return python_type(value)
+
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` of the statement, executed with its parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: SQLCompiler, **kwargs: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
+
+
+class CountCache:
+    """Exact counts of the queries, which expire after `ttl` seconds."""
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._counts: dict[Any, tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> int | None:
+        with self._lock:
+            expires_at, count = self._counts.get(key, (0.0, 0))
+
+            if expires_at < time.monotonic():
+                self._counts.pop(key, None)
+                return None
+
+            return count
+
+    def set(self, key: Any, count: int) -> None:
+        with self._lock:
+            if key not in self._counts and len(self._counts) >= self.max_size:
+                # dicts keep insertion order, so the oldest count is removed
+                self._counts.pop(next(iter(self._counts)), None)
+
+            self._counts[key] = (time.monotonic() + self.ttl, count)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+count_cache = CountCache(settings.count_cache_ttl, settings.count_cache_max_size)
+
+
+def paginate(
+    session: Session, query: Select, params: AbstractParams | None = None
+) -> AbstractPage:
+    """Return page of the query rows, total is found with the params strategy.
+
+    Args:
+        session (Session): session to execute the queries
+        query (Select): query of the list, which selects one entity
+        params (AbstractParams | None, optional): page params, taken from the
+            request context if None
+
+    Returns:
+        AbstractPage: page of the response model of the current endpoint
+    """
+    params = resolve_params(params)
+    raw_params = params.to_raw_params().as_limit_offset()
+    strategy = getattr(params, "count", CountStrategy.EXACT)
+    page_query = query.offset(raw_params.offset)
+
+    if strategy == CountStrategy.EXACT:
+        return _paginate_with_window_count(session, query, params)
+    elif strategy == CountStrategy.NONE:
+        limit = raw_params.limit
+        # one more row is fetched to find out whether the next page exists
+        items = session.scalars(
+            page_query.limit(None if limit is None else limit + 1)
+        ).all()
+        has_more = limit is not None and len(items) > limit
+        return create_page(items[:limit], total=None, params=params, has_more=has_more)
+
+    items = session.scalars(page_query.limit(raw_params.limit)).all()
+
+    if strategy == CountStrategy.ESTIMATED:
+        total = get_estimated_count(session, query)
+    else:
+        total = get_cached_count(session, query)
+
+    return create_page(items, total=total, params=params)
+
+
+def _paginate_with_window_count(
+    session: Session, query: Select, params: AbstractParams
+) -> AbstractPage:
+    raw_params = params.to_raw_params().as_limit_offset()
+    page_query = (
+        query.add_columns(func.count().over().label(TOTAL_COUNT_LABEL))
+        .offset(raw_params.offset)
+        .limit(raw_params.limit)
+    )
+    rows = session.execute(page_query).all()
+
+    if rows:
+        total = rows[0][-1]
+    elif raw_params.offset:
+        # page is after the last row, so window function has nothing to count
+        total = session.scalar(count_query(query))
+    else:
+        total = 0
+
+    return create_page([row[0] for row in rows], total=total, params=params)
+
+
+def get_estimated_count(session: Session, query: Select) -> int:
+    """Estimate number of the query rows without executing the query.
+
+    Number of rows of the unfiltered table is taken from `pg_class.reltuples`,
+    which is maintained by autovacuum and `ANALYZE`. Otherwise or if the table
+    has never been analyzed, planner row estimate of the query is used.
+    """
+    froms = query.get_final_froms()
+
+    if query.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+        estimate = session.scalar(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": froms[0].name},
+        )
+
+        if estimate is not None and estimate >= 0:
+            return int(estimate)
+
+    plan = session.scalar(Explain(query.order_by(None)))
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_cached_count(session: Session, query: Select) -> int:
+    """Return exact number of the query rows, which may be stale for the TTL."""
+    cache_key = query._generate_cache_key()
+
+    if cache_key is None:
+        return session.scalar(count_query(query))
+
+    # cache key of the statement doesn't include values of its parameters
+    key = (
+        cache_key.key,
+        repr([bind.effective_value for bind in cache_key.bindparams]),
+    )
+
+    if (count := count_cache.get(key)) is None:
+        count = session.scalar(count_query(query))
+        count_cache.set(key, count)
+
+    return count
@@ -1,16 +1,38 @@
-from typing import Any, Generic, Type, TypeVar, Mapping
+from typing import Any, AsyncIterator, Callable, Generic, Type, TypeVar, Mapping, cast
 
-from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import or_, select
+from sqlalchemy import Column, Table, bindparam, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.sql.selectable import Select
 from sqlalchemy import desc
 from src.apis.common_errors import ServiceBaseError
+from fastapi_pagination.api import create_page, resolve_params
+from fastapi_pagination.bases import AbstractPage, AbstractParams
+from src.apis.pagination import CursorPage, decode_cursor, encode_cursor, paginate
+from src.apis.services.result_cache import get_dependent_tables, result_cache
 from src.database.models import Base
+from src.database.db import reads_from_replica
 
 BaseModel = TypeVar("BaseModel", bound=Base)
 DataObject = Mapping[str, Any]
 FilterData = Mapping[str, Any]
+ReturnType = TypeVar("ReturnType")
+
+# Statements, which are built once and reused. SQLAlchemy memoizes the cache
+# key of the statement object, so reused statement skips both construction
+# and cache key generation and hits the compiled cache directly.
+PREBUILT_QUERIES: dict[tuple[type, str], Select] = {}
+
+LIKE_ESCAPE_CHARACTER = "\\"
+
+
+def escape_like_pattern(value: str) -> str:
+    """Escape LIKE wildcards, so the value is matched literally."""
+    return (
+        value.replace(LIKE_ESCAPE_CHARACTER, LIKE_ESCAPE_CHARACTER * 2)
+        .replace("%", f"{LIKE_ESCAPE_CHARACTER}%")
+        .replace("_", f"{LIKE_ESCAPE_CHARACTER}_")
+    )
 
 
 class BaseService(Generic[BaseModel]):
@@ -18,6 +40,9 @@ class BaseService(Generic[BaseModel]):
 
     model: Type[BaseModel]
     _entity_not_found_error: ServiceBaseError
+    # pages of `read_all` are cached until the table of the model is changed,
+    # enabled for the lists, which are read much more often than changed
+    cache_read_all: bool = False
 
     def __init__(self, db_session: Session) -> None:
         self.db_session = db_session
@@ -26,14 +51,27 @@ class BaseService(Generic[BaseModel]):
         entity = self.model(**kwargs)
         self.db_session.add(entity)
         self.db_session.flush()
+        self._invalidate_cached_results()
         return entity
 
     def get_by_field_value(self, field_name: str, value: str) -> BaseModel | None:
-        query = self._get_list_query()
-        query = query.where(getattr(self.model, field_name) == value)
-        return self.db_session.scalars(query).first()
+        query = self._get_by_field_value_query(field_name)
+        return self.db_session.scalars(query, {"value": value}).first()
+
+    def _get_by_field_value_query(self, field_name: str) -> Select:
+        cache_key = (type(self), field_name)
+
+        if (query := PREBUILT_QUERIES.get(cache_key)) is None:
+            query = self._get_list_query().where(
+                getattr(self.model, field_name) == bindparam("value")
+            )
+            PREBUILT_QUERIES[cache_key] = query
+
+        return query
 
     def get_by_id(self, entity_id: int) -> BaseModel:
+        # Session.get checks the identity map first and its load statement
+        # is already cached by SQLAlchemy
         entity = self.db_session.get(self.model, entity_id)
 
         if entity is None:
@@ -45,7 +83,7 @@ class BaseService(Generic[BaseModel]):
         self,
         sort: str | None,
         filters: FilterData,
-    ) -> list[BaseModel]:
+    ) -> AbstractPage:
         """Retrieve a list of records from the database.
 
         Records will be optionally filtered by a search pattern and sorted.
@@ -59,12 +97,119 @@ class BaseService(Generic[BaseModel]):
             filters (FilterData | None, optional): filters to apply to result list
 
         Returns:
-            list[BaseModel]: A list of BaseModel objects representing the retrieved
-            records.
+            AbstractPage: page of the retrieved records
         """
         query = self._get_list_query()
         query = self._prepare_read_all_query(query, sort, filters)
-        return paginate(conn=self.db_session, query=query)
+
+        if not (self.cache_read_all and result_cache.enabled):
+            return paginate(self.db_session, query)
+
+        params: AbstractParams = resolve_params()
+        key_parts = (
+            self.model.__name__,
+            sorted((name, value) for name, value in filters.items() if value),
+            sort,
+            type(params).__name__,
+            sorted(vars(params).items()),
+        )
+
+        def load_page() -> dict[str, Any]:
+            # page is cached as the data of its items, so the cached value
+            # doesn't depend on the session and the generic page class
+            page = paginate(self.db_session, query, params)
+            page_data = page.dict()
+            return {
+                "items": page_data.pop("items"),
+                "total": page_data.get("total"),
+                "has_more": page_data.get("has_more"),
+            }
+
+        # page read from a lagging replica may be older than the table version
+        # it would be stored under, so only pages read from the primary are
+        # stored, otherwise clients pinned to the primary might get them
+        page_data = result_cache.get_or_load(
+            [self._table],
+            key_parts,
+            load_page,
+            store=not reads_from_replica(self.db_session),
+        )
+        return create_page(
+            page_data["items"],
+            total=page_data["total"],
+            params=params,
+            has_more=page_data["has_more"],
+        )
+
+    def read_all_by_cursor(
+        self,
+        sort: str | None,
+        filters: FilterData,
+        cursor: str | None,
+        size: int,
+    ) -> CursorPage[Any]:
+        """Retrieve a page of records, which follow the row of the cursor.
+
+        Unlike `read_all`, the page is located by the sort key of the last row
+        of the previous page instead of the offset, so the index on the sort
+        column is used to seek directly to the page, regardless of its depth.
+        `id` is added to the sort key to make it unique.
+
+        Args:
+            sort (str | None): sorting order, see `read_all`
+            filters (FilterData): filters to apply to result list
+            cursor (str | None): cursor of the previous page, None for the first
+                page
+            size (int): number of records in the page
+
+        Raises:
+            InvalidCursor: if the cursor is malformed or was issued for other sort
+
+        Returns:
+            CursorPage[Any]: records of the page and the cursor of the next page
+        """
+        columns, descending = self._get_keyset_columns(sort)
+        query = self._prepare_read_all_query(self._get_list_query(), None, filters)
+
+        if cursor is not None:
+            values = decode_cursor(cursor, sort, columns)
+            query = query.where(
+                tuple_(*columns) < tuple_(*values)
+                if descending
+                else tuple_(*columns) > tuple_(*values)
+            )
+
+        query = query.order_by(
+            *(column.desc() if descending else column for column in columns)
+        )
+        # one more row is fetched to find out whether the next page exists
+        items = list(self.db_session.scalars(query.limit(size + 1)).all())
+        next_cursor = None
+
+        if len(items) > size:
+            items = items[:size]
+            next_cursor = encode_cursor(
+                sort, [getattr(items[-1], column.key) for column in columns]
+            )
+
+        return CursorPage[Any](items=items, size=size, next_cursor=next_cursor)
+
+    def get_export_query(self, sort: str | None, filters: FilterData) -> Select:
+        """Return query of all records, filtered and sorted as in `read_all`.
+
+        Records are additionally sorted by id, so every export of the same data
+        has the same order.
+        """
+        query = self._prepare_read_all_query(self._get_list_query(), sort, filters)
+        return query.order_by(self.model.id)
+
+    def _get_keyset_columns(self, sort: str | None) -> tuple[list[Column], bool]:
+        # sortable fields are not nullable, so row comparison never meets NULL
+        if sort is None:
+            return [self.model.id], False
+
+        sort_column = getattr(self.model, sort.lstrip("-"))
+        return [sort_column, self.model.id], sort.startswith("-")
 
     def _prepare_read_all_query(
         self,
@@ -87,6 +232,7 @@ class BaseService(Generic[BaseModel]):
 
         self.db_session.add(entity)
         self.db_session.flush()
+        self._invalidate_cached_results()
         return entity
 
     def delete(self, entity_id: int) -> None:
@@ -97,14 +243,28 @@ class BaseService(Generic[BaseModel]):
             return
 
         self.db_session.delete(entity)
+        self._invalidate_cached_results()
+
+    def _invalidate_cached_results(self) -> None:
+        # rows of the referencing tables are changed by `ON DELETE` actions
+        result_cache.invalidate(self.db_session, get_dependent_tables(self._table))
+
+    @property
+    def _table(self) -> Table:
+        # declarative models are mapped to tables
+        return cast(Table, self.model.__table__)
 
     def _get_filtered_query(self, query: Select, filters: FilterData) -> Select:
         filter_expressions = []
 
         if searched_pattern := filters.get("search", None):
+            # ILIKE on the bare column is served by its GIN trigram index
+            pattern = f"%{escape_like_pattern(searched_pattern)}%"
             filter_expressions.append(
                 or_(
-                    getattr(self.model, field).ilike(f"%{searched_pattern}%")
+                    getattr(self.model, field).ilike(
+                        pattern, escape=LIKE_ESCAPE_CHARACTER
+                    )
                     for field in self.model.SEARCHABLE_FIELDS
                 )
             )
@@ -135,3 +295,81 @@ class BaseService(Generic[BaseModel]):
 
     def _get_list_query(self) -> Select:
         return select(self.model)
+
+
+Service = TypeVar("Service", bound=BaseService)
+
+
+class AsyncBaseService(Generic[Service]):
+    """Base class for async variants of the services.
+
+    Async service wraps its sync counterpart and runs its methods on top of the
+    asyncpg connection via `AsyncSession.run_sync`, so both variants share the
+    same queries and business logic.
+    """
+
+    service_class: Type[Service]
+
+    def __init__(self, db_session: AsyncSession, **service_kwargs: Any) -> None:
+        self.db_session = db_session
+        self.service = self.service_class(db_session.sync_session, **service_kwargs)
+
+    async def run_sync(
+        self, function: Callable[..., ReturnType], *args: Any, **kwargs: Any
+    ) -> ReturnType:
+        """Run the given sync function, which uses the wrapped service session."""
+        return await self.db_session.run_sync(lambda _: function(*args, **kwargs))
+
+    async def get_by_field_value(self, field_name: str, value: str) -> Any:
+        return await self.run_sync(self.service.get_by_field_value, field_name, value)
+
+    async def get_by_id(self, entity_id: int) -> Any:
+        return await self.run_sync(self.service.get_by_id, entity_id)
+
+    async def read_all(self, sort: str | None, filters: FilterData) -> Any:
+        """Retrieve a list of records from the database.
+
+        See `BaseService.read_all` for the details.
+        """
+        return await self.run_sync(self.service.read_all, sort, filters)
+
+    async def stream_all(
+        self, sort: str | None, filters: FilterData, batch_size: int
+    ) -> AsyncIterator[list[Any]]:
+        """Stream all records of the list from a server-side cursor.
+
+        Only `batch_size` rows are fetched from the cursor at once, so memory
+        usage doesn't depend on the number of records.
+
+        Args:
+            sort (str | None): sorting order, see `BaseService.read_all`
+            filters (FilterData): filters to apply to result list
+            batch_size (int): number of records in every yielded partition
+
+        Yields:
+            AsyncIterator[list[Any]]: partitions of the records
+        """
+        query = self.service.get_export_query(sort, filters)
+        result = await self.db_session.stream_scalars(
+            query.execution_options(yield_per=batch_size)
+        )
+
+        async for partition in result.partitions():
+            yield list(partition)
+
+    async def read_all_by_cursor(
+        self, sort: str | None, filters: FilterData, cursor: str | None, size: int
+    ) -> CursorPage[Any]:
+        """Retrieve a page of records, which follow the row of the cursor.
+
+        See `BaseService.read_all_by_cursor` for the details.
+        """
+        return await self.run_sync(
+            self.service.read_all_by_cursor, sort, filters, cursor, size
+        )
+
+    async def update(self, entity: Any, new_data: DataObject) -> Any:
+        return await self.run_sync(self.service.update, entity, new_data)
+
+    async def delete(self, entity_id: int) -> None:
+        await self.run_sync(self.service.delete, entity_id)
@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session
 
 from src.apis.admin.categories.schemas import CategoryCreate
 from src.apis.common_errors import ServiceBaseError
-from src.apis.services.base import BaseService
+from src.apis.services.base import AsyncBaseService, BaseService
 from src.database.models import Category
 
 
@@ -19,6 +19,7 @@ class CategoryService(BaseService):
 
     model = Category
     db_session: Session
+    cache_read_all = True
     _entity_not_found_error = CategoryDoesNotExist(
         message="Category with the provided id was not found."
     )
@@ -46,3 +47,12 @@ class CategoryService(BaseService):
         """
         self._check_if_category_exists(category_data.name)
         return super()._create(name=category_data.name)
+
+
+class AsyncCategoryService(AsyncBaseService[CategoryService]):
+    """Async variant of the CategoryService."""
+
+    service_class = CategoryService
+
+    async def create_category(self, category_data: CategoryCreate) -> Category:
+        return await self.run_sync(self.service.create_category, category_data)
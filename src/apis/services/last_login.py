@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import cast
+
+from sqlalchemy import DateTime, Integer, Table, column, update, values
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.apis.services.result_cache import result_cache
+from src.database.db import async_engine
+from src.database.models import User
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginRecorder:
+    """Buffer of the last login dates, which are written to the database in batches.
+
+    Authenticated requests only record the login time in memory. Recorded
+    times are written periodically by one `UPDATE ... FROM (VALUES ...)`
+    statement, so polling clients don't write the users table on every
+    request. Logins, which happen within `min_interval` after the stored or
+    recorded one, are skipped.
+
+    Args:
+        engine (AsyncEngine): engine of the database, where the dates are written
+        min_interval (timedelta): minimal interval between two stored logins
+    """
+
+    def __init__(self, engine: AsyncEngine, min_interval: timedelta) -> None:
+        self.engine = engine
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._pending: dict[int, datetime] = {}
+        self._recorded: dict[int, datetime] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    def record(self, user: User, login_time: datetime) -> None:
+        """Record login of the user, if the last one is not recent enough."""
+        with self._lock:
+            last_login_time = max(
+                user.last_login_date, self._recorded.get(user.id, datetime.min)
+            )
+
+            if login_time - last_login_time < self.min_interval:
+                return
+
+            self._pending[user.id] = login_time
+            self._recorded[user.id] = login_time
+
+    def flush(self, connection: Connection) -> int:
+        """Write the recorded login dates with the given connection.
+
+        Dates are never moved back, so the order of the flushes of different
+        workers doesn't matter.
+
+        Args:
+            connection (Connection): connection, which is committed by the caller
+
+        Returns:
+            int: number of the written login dates
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            threshold = datetime.utcnow() - self.min_interval
+            self._recorded = {
+                user_id: login_time
+                for user_id, login_time in self._recorded.items()
+                if login_time > threshold
+            }
+
+        if not pending:
+            return 0
+
+        logins = values(
+            column("user_id", Integer),
+            column("login_time", DateTime),
+            name="logins",
+        ).data(list(pending.items()))
+        statement = (
+            update(User)
+            .where(
+                User.id == logins.c.user_id,
+                User.last_login_date < logins.c.login_time,
+            )
+            .values(last_login_date=logins.c.login_time)
+        )
+
+        try:
+            connection.execute(statement)
+        except Exception:
+            self._restore(pending)
+            raise
+
+        return len(pending)
+
+    async def flush_async(self) -> int:
+        """Write the recorded login dates in a separate transaction."""
+        # idle workers don't check out connections
+        if not self._pending:
+            return 0
+
+        async with self.engine.begin() as connection:
+            written = await connection.run_sync(self.flush)
+
+        # the UPDATE doesn't go through the services, so cached pages of the
+        # users, e.g. sorted by the last login date, are invalidated here
+        if written:
+            result_cache.bump_versions([cast(Table, User.__table__)])
+
+        return written
+
+    def start(self, interval: float) -> None:
+        """Start periodic flushes every `interval` seconds."""
+        self._flush_task = asyncio.create_task(self._flush_periodically(interval))
+
+    async def stop(self) -> None:
+        """Stop periodic flushes and write the dates, which are still recorded."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+
+        await self.flush_async()
+
+    async def _flush_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+
+            try:
+                await self.flush_async()
+            except Exception:
+                logger.exception("Failed to write last login dates.")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._recorded.clear()
+
+    def _restore(self, pending: dict[int, datetime]) -> None:
+        # dates recorded after the failed flush are newer, so they are kept
+        with self._lock:
+            for user_id, login_time in pending.items():
+                self._pending.setdefault(user_id, login_time)
+
+
+last_login_recorder = LastLoginRecorder(
+    async_engine, timedelta(seconds=settings.last_login_update_interval)
+)
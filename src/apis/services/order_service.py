@@ -1,14 +1,25 @@
-from sqlalchemy import Select, select, text
-from sqlalchemy.orm import Session
+from typing import NoReturn, cast
+
+from sqlalchemy import (
+    Integer,
+    Select,
+    Subquery,
+    Values,
+    column,
+    func,
+    insert,
+    literal,
+    select,
+    values,
+)
+from sqlalchemy.orm import Session, aliased, noload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.selectable import ExecutableReturnsRows
 
 from src.apis.common_errors import ServiceBaseError
-from src.apis.services.base import BaseService, FilterData
+from src.apis.services.base import AsyncBaseService, BaseService, FilterData
 from src.database.models import Order, OrderItem, Product, User, Address
 from src.apis.users.schemas import OrderCreateSchema, OrderItemSchema
-from sqlalchemy.sql import func
-from sqlalchemy.sql.selectable import Subquery
-
-TOTAL_PRICE_FIELD = "total_price"
 
 
 class ProductDoesNotExist(ServiceBaseError):
@@ -21,69 +32,123 @@ class OrderService(BaseService):
     model = Order
     db_session: Session
 
-    def _get_ordered_products(
-        self, order_items: list[OrderItemSchema]
-    ) -> list[Product]:
-        received_product_ids = {item.product_id for item in order_items}
-        query = select(Product).where(Product.id.in_(received_product_ids))
-        products = self.db_session.scalars(query).all()
-
-        if len(received_product_ids) != len(products):
-            found_product_ids = [product.id for product in products]
-            wrong_product_ids = received_product_ids.difference(found_product_ids)
-            raise ProductDoesNotExist(
-                message=f"Products with ids '{wrong_product_ids}' do not exist."
-            )
-
-        return products
-
     def create_order(
         self, user: User, order_data: OrderCreateSchema, delivery_address: Address
     ) -> Order:
-        products = self._get_ordered_products(order_data.order_items)
-        order_instance = self._create_order_instance(order_data, delivery_address)
-        self._add_order_items_to_order(order_instance, products, order_data.order_items)
-        user.orders.append(order_instance)
+        """Create order of the user with the items priced by the current prices.
 
-        self.db_session.flush()
-        return order_instance
+        Order is inserted with its total price only if all ordered products
+        exist, then all items are inserted by one `INSERT ... SELECT` from the
+        products. Number of the executed statements doesn't depend on the
+        number of the items.
 
-    def _add_order_items_to_order(
-        self,
-        order: Order,
-        ordered_products: list[Product],
-        order_items_data: list[OrderItemSchema],
-    ):
-        for product, order_item_data in zip(
-            sorted(ordered_products, key=lambda x: x.id),
-            sorted(order_items_data, key=lambda x: x.product_id),
+        Args:
+            user (User): user, who places the order
+            order_data (OrderCreateSchema): comments and items of the order
+            delivery_address (Address): persisted delivery address of the user
+
+        Returns:
+            Order: new order with its items and delivery address
+
+        Raises:
+            ProductDoesNotExist: in case when some of the products don't exist
+        """
+        cart = self._get_cart(order_data.order_items)
+        order = self.db_session.scalars(
+            self._get_insert_order_query(user, order_data, delivery_address, cart)
+        ).one_or_none()
+
+        if order is None:
+            self._raise_product_does_not_exist(order_data.order_items)
+
+        order_items = []
+
+        for order_item, product in self.db_session.execute(
+            self._get_insert_order_items_query(order, cart)
         ):
-            order_item = self._create_order_item_instance(product, order_item_data)
-            order.order_items.append(order_item)
+            set_committed_value(order_item, "product", product)
+            order_items.append(order_item)
 
-    def _create_order_instance(
-        self, order_data: OrderCreateSchema, delivery_address: Address
-    ) -> Order:
-        return Order(comments=order_data.comments, address_id=delivery_address.id)
-
-    def _create_order_item_instance(
-        self, product: Product, order_item_data: OrderItemSchema
-    ):
-        return OrderItem(
-            product_id=order_item_data.product_id,
-            quantity=order_item_data.quantity,
-            product_price=product.price,
+        set_committed_value(order, "order_items", order_items)
+        set_committed_value(order, "delivery_address", delivery_address)
+        self._invalidate_cached_results()
+        return order
+
+    def _get_cart(self, order_items: list[OrderItemSchema]) -> Values:
+        return values(
+            column("product_id", Integer), column("quantity", Integer), name="cart"
+        ).data([(item.product_id, item.quantity) for item in order_items])
+
+    def _get_insert_order_query(
+        self,
+        user: User,
+        order_data: OrderCreateSchema,
+        delivery_address: Address,
+        cart: Values,
+    ) -> ExecutableReturnsRows:
+        # order is not inserted, when some of the products are not found
+        ordered_products = (
+            select(
+                literal(user.id),
+                literal(delivery_address.id),
+                literal(order_data.comments),
+                func.sum(Product.price * cart.c.quantity),
+            )
+            .select_from(cart)
+            .join(Product, Product.id == cart.c.product_id)
+            .having(func.count() == len(order_data.order_items))
+        )
+        new_order = (
+            insert(Order)
+            .from_select(
+                [Order.user_id, Order.address_id, Order.comments, Order.total_price],
+                ordered_products,
+            )
+            .returning(Order)
+        )
+        # relationships are set from the inserted rows, so they are not loaded
+        return (
+            select(Order)
+            .from_statement(new_order)
+            .options(noload(Order.order_items), noload(Order.delivery_address))
         )
 
-    def _prepare_read_all_query(
-        self, query: Select, sort: str | None, filters: FilterData
-    ) -> Select:
-        total_price_subquery = self._create_order_total_price_subquery()
-        query = query.join(
-            total_price_subquery,
-            self.model.id == total_price_subquery.c.order_id,
-        ).add_columns(getattr(total_price_subquery.c, TOTAL_PRICE_FIELD))
-        return super()._prepare_read_all_query(query, sort, filters)
+    def _get_insert_order_items_query(self, order: Order, cart: Values) -> Select:
+        new_order_items = (
+            insert(OrderItem)
+            .from_select(
+                [
+                    OrderItem.order_id,
+                    OrderItem.product_id,
+                    OrderItem.quantity,
+                    OrderItem.product_price,
+                ],
+                select(literal(order.id), Product.id, cart.c.quantity, Product.price)
+                .select_from(cart)
+                .join(Product, Product.id == cart.c.product_id),
+            )
+            .returning(*OrderItem.__table__.c)
+            .cte("new_order_items")
+        )
+        # aliased() accepts CTEs, though its hints list only subqueries
+        new_order_item = aliased(OrderItem, cast(Subquery, new_order_items))
+        return (
+            select(new_order_item, Product)
+            .join(Product, Product.id == new_order_items.c.product_id)
+            .order_by(Product.id)
+        )
+
+    def _raise_product_does_not_exist(
+        self, order_items: list[OrderItemSchema]
+    ) -> NoReturn:
+        received_product_ids = {item.product_id for item in order_items}
+        found_product_ids = self.db_session.scalars(
+            select(Product.id).where(Product.id.in_(received_product_ids))
+        )
+        wrong_product_ids = received_product_ids.difference(found_product_ids)
+        raise ProductDoesNotExist(
+            message=f"Products with ids '{wrong_product_ids}' do not exist."
+        )
 
     def _get_filtered_query(self, query: Select, filters: FilterData) -> Select:
         if user_id := filters.get("user_id", None):
@@ -91,28 +156,15 @@ class OrderService(BaseService):
 
         return super()._get_filtered_query(query, filters)
 
-    def _create_order_total_price_subquery(self) -> Subquery:
-        """Create and return subquery to calculate total order price.
 
-        Returns:
-            Subquery: SQLAlchemy Subquery object
-        """
-        return (
-            select(
-                OrderItem.order_id,
-                func.sum(OrderItem.product_price * OrderItem.quantity).label(
-                    TOTAL_PRICE_FIELD
-                ),
-            )
-            .group_by(OrderItem.order_id)
-            .subquery()
-        )
+class AsyncOrderService(AsyncBaseService[OrderService]):
+    """Async variant of the OrderService."""
 
-    def _apply_sorting(self, query: Select, sort: str) -> Select:
-        """Apply sorting to the given query based on the provided sort parameter."""
-        sort_field = sort.lstrip("-")
+    service_class = OrderService
 
-        if sort.startswith("-"):
-            return query.order_by(text(f"{sort_field} DESC"))
-        else:
-            return query.order_by(text(sort_field))
+    async def create_order(
+        self, user: User, order_data: OrderCreateSchema, delivery_address: Address
+    ) -> Order:
+        return await self.run_sync(
+            self.service.create_order, user, order_data, delivery_address
+        )
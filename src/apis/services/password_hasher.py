@@ -0,0 +1,120 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from src.apis.common_errors import ServiceBaseError
+from src.database.models.user import hash_password, verify_password
+from src.database.pool_metrics import Histogram
+from src.settings import settings
+
+ReturnType = TypeVar("ReturnType")
+
+# bcrypt takes about 0.1-0.3s, waiting in the queue may take much longer
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PasswordHasherBusy(ServiceBaseError):
+    """Raised when too many passwords are already waiting to be hashed."""
+
+
+class PasswordHasher:
+    """Hash and verify passwords in a pool of worker processes.
+
+    bcrypt is CPU bound and holds the GIL, so running it in the request
+    process blocks all other requests of the worker. Hashing is awaited
+    instead, and at most `max_pending` hashings may wait for the pool, the
+    following ones are rejected with `PasswordHasherBusy`.
+
+    Pool is started on the first use. Its processes are spawned, so they
+    don't inherit connections and locks of the application process.
+
+    Args:
+        workers (int): number of the worker processes
+        max_pending (int): maximal number of the submitted hashings
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._max_pending_seen = 0
+        self._rejected = 0
+        self._failed = 0
+        self._duration = Histogram(DURATION_BUCKETS)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "max_pending_seen": self._max_pending_seen,
+                "rejected": self._rejected,
+                "failed": self._failed,
+                "duration": self._duration.snapshot(),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._max_pending_seen = self._pending
+            self._rejected = 0
+            self._failed = 0
+            self._duration = Histogram(DURATION_BUCKETS)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _run(self, function: Callable[..., ReturnType], *args: Any) -> ReturnType:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusy(
+                    message="Too many login attempts, please retry later."
+                )
+
+            self._pending += 1
+            self._max_pending_seen = max(self._max_pending_seen, self._pending)
+            executor = self._get_executor()
+
+        started_at = time.perf_counter()
+
+        try:
+            return await asyncio.wrap_future(executor.submit(function, *args))
+        except Exception:
+            with self._lock:
+                self._failed += 1
+
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._duration.observe(time.perf_counter() - started_at)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        return self._executor
+
+
+password_hasher = PasswordHasher(
+    settings.password_hasher_workers, settings.password_hasher_max_pending
+)
@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session
 
 from src.apis.common_errors import ServiceBaseError
 from src.apis.admin.products.schemas import ProductCreate
-from src.apis.services.base import BaseService
+from src.apis.services.base import AsyncBaseService, BaseService
 from src.apis.services.picture_saver import PictureSaver
 from src.database.models import Product
 
@@ -20,6 +20,7 @@ class ProductService(BaseService):
 
     model = Product
     db_session: Session
+    cache_read_all = True
     _entity_not_found_error = ProductDoesNotExist(
         message="Product with the provided id was not found."
     )
@@ -58,3 +59,12 @@ class ProductService(BaseService):
 
     def _save_product_picture(self):
         pass
+
+
+class AsyncProductService(AsyncBaseService[ProductService]):
+    """Async variant of the ProductService."""
+
+    service_class = ProductService
+
+    async def create_product(self, product_data: ProductCreate) -> Product:
+        return await self.run_sync(self.service.create_product, product_data)
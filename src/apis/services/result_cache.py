@@ -0,0 +1,290 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Protocol
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Table, event
+from sqlalchemy.orm import Session
+
+from src.settings import settings
+
+INVALIDATED_TABLES_INFO_KEY = "result_cache_invalidated_tables"
+MEMORY_BACKEND_URL = "memory://"
+
+
+class CacheBackend(Protocol):
+    """Storage of the cached results and versions of the tables."""
+
+    # whether versions of the tables are the same in all processes
+    shared: bool
+
+    def get(self, key: str) -> bytes | None:
+        ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    def get_version(self, key: str) -> int:
+        ...
+
+    def increment_version(self, key: str) -> None:
+        ...
+
+
+class InMemoryCacheBackend:
+    """Cache of one process, which evicts the least recently used results.
+
+    Versions of the tables are kept separately and are never evicted.
+    """
+
+    shared = False
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._results: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            expires_at, value = self._results.get(key, (0.0, None))
+
+            if expires_at < time.monotonic():
+                self._results.pop(key, None)
+                return None
+
+            self._results.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._results[key] = (time.monotonic() + ttl, value)
+            self._results.move_to_end(key)
+
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+    def get_version(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    def increment_version(self, key: str) -> None:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+
+class RedisCacheBackend:
+    """Cache shared by all processes, stored in Redis or compatible server.
+
+    Client should implement `get`, `set` and `incr` of the `redis` package
+    client. Results are stored with expiration, LRU eviction is configured on
+    the server with `maxmemory-policy allkeys-lru`.
+    """
+
+    shared = True
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        try:
+            import redis
+        except ImportError as error:
+            raise ImportError(
+                "'redis' package is required to use Redis result cache."
+            ) from error
+
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(key, value, px=int(ttl * 1000))
+
+    def get_version(self, key: str) -> int:
+        return int(self.client.get(key) or 0)
+
+    def increment_version(self, key: str) -> None:
+        self.client.incr(key)
+
+
+def create_cache_backend(url: str | None, max_size: int) -> CacheBackend | None:
+    """Create backend by its URL, `memory://` or `redis://...`, None disables cache."""
+    if not url:
+        return None
+    elif url == MEMORY_BACKEND_URL:
+        return InMemoryCacheBackend(max_size)
+
+    return RedisCacheBackend.from_url(url)
+
+
+class ResultCache:
+    """Cache of the query results, invalidated by versions of the tables.
+
+    Every table has a version counter, which is a part of the keys of the
+    results read from the table. Services mark the tables they change, and
+    their versions are incremented after the transaction is committed, so the
+    cached results become unreachable and expire.
+    """
+
+    def __init__(
+        self, backend: CacheBackend | None, ttl: float, key_prefix: str = "results"
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def get_or_load(
+        self,
+        tables: Iterable[Table],
+        key_parts: Any,
+        load: Callable[[], Any],
+        store: bool = True,
+    ) -> Any:
+        """Return cached result or load and cache it.
+
+        Results are stored as JSON, so the loaded result is returned converted
+        with `jsonable_encoder` as well, e.g. datetimes become strings.
+
+        Args:
+            tables (Iterable[Table]): tables, which are read by the query
+            key_parts (Any): hashable by repr parameters of the query
+            load (Callable[[], Any]): function, which loads the result
+            store (bool, optional): whether the loaded result may be cached,
+                e.g. results read from a lagging replica may not
+
+        Returns:
+            Any: cached or loaded result
+        """
+        if self.backend is None:
+            return jsonable_encoder(load())
+
+        versions = self._get_versions(self.backend, tables)
+        digest = hashlib.sha256(repr((versions, key_parts)).encode()).hexdigest()
+        key = f"{self.key_prefix}:{digest}"
+
+        if (value := self.backend.get(key)) is not None:
+            self._count(hit=True)
+            return json.loads(value)
+
+        self._count(hit=False)
+        result = jsonable_encoder(load())
+
+        if store:
+            self.backend.set(key, json.dumps(result).encode(), self.ttl)
+
+        return result
+
+    def get_versions_tag(self, tables: Iterable[Table]) -> str | None:
+        """Return tag of the current versions of the tables.
+
+        Tag changes, when any of the tables is changed through the services. It
+        is None, if the cache is disabled or the versions are local to the
+        process, since other processes don't see changes made by this one.
+        """
+        if self.backend is None or not self.backend.shared:
+            return None
+
+        return repr(self._get_versions(self.backend, tables))
+
+    def invalidate(self, session: Session, tables: Iterable[Table]) -> None:
+        """Mark tables as changed, their versions are bumped after commit."""
+        session.info.setdefault(INVALIDATED_TABLES_INFO_KEY, set()).update(tables)
+
+    def bump_versions(self, tables: Iterable[Table]) -> None:
+        """Bump versions of the tables, which are changed outside of the services.
+
+        Should be called after the changes are committed, e.g. by bulk writes,
+        which don't go through the session of the services.
+        """
+        if self.backend is not None:
+            for table in tables:
+                self.backend.increment_version(self._get_version_key(table.name))
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / requests if requests else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _bump_versions(self, session: Session) -> None:
+        self.bump_versions(session.info.pop(INVALIDATED_TABLES_INFO_KEY, ()))
+
+    def _discard_invalidations(self, session: Session) -> None:
+        session.info.pop(INVALIDATED_TABLES_INFO_KEY, None)
+
+    def _get_versions(
+        self, backend: CacheBackend, tables: Iterable[Table]
+    ) -> list[tuple[str, int]]:
+        return [
+            (table.name, backend.get_version(self._get_version_key(table.name)))
+            for table in tables
+        ]
+
+    def _get_version_key(self, table_name: str) -> str:
+        return f"{self.key_prefix}:version:{table_name}"
+
+
+def get_dependent_tables(table: Table) -> set[Table]:
+    """Return the table and tables, whose rows are changed by its deletes.
+
+    Foreign keys with `ON DELETE` action change rows of the referencing
+    tables in the database, without the session knowing about it. Rows
+    deleted by `CASCADE` change the tables, which reference them, in turn.
+    """
+    tables = {table}
+    changed_tables = [table]
+
+    while changed_tables:
+        changed_table = changed_tables.pop()
+
+        for other_table in table.metadata.tables.values():
+            ondelete_actions = {
+                fk.ondelete.upper()
+                for fk in other_table.foreign_keys
+                if fk.column.table is changed_table and fk.ondelete is not None
+            }
+
+            if ondelete_actions and other_table not in tables:
+                tables.add(other_table)
+
+                if "CASCADE" in ondelete_actions:
+                    changed_tables.append(other_table)
+
+    return tables
+
+
+result_cache = ResultCache(
+    create_cache_backend(settings.result_cache_url, settings.result_cache_max_size),
+    settings.result_cache_ttl,
+)
+
+event.listen(Session, "after_commit", result_cache._bump_versions)
+event.listen(Session, "after_rollback", result_cache._discard_invalidations)
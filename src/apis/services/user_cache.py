@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from src.database.models import User
+from src.settings import settings
+
+INVALIDATED_USERS_INFO_KEY = "authenticated_user_cache_invalidated_ids"
+
+
+class AuthenticatedUserCache:
+    """Column values of the recently authenticated users, kept for `ttl` seconds.
+
+    Users are restored into the session of the request without the query, so
+    the authentication doesn't read the users table. Users changed through
+    `UserService` are removed after the transaction is committed. The cache is
+    local to the process, so changes made by other processes are visible after
+    the TTL at the latest.
+    """
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._users: OrderedDict[int, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def get(self, session: Session, user_id: int) -> User | None:
+        """Return cached user attached to the session or None.
+
+        Args:
+            session (Session): session of the request
+            user_id (int): unique user identifier
+
+        Returns:
+            User | None: persistent user of the session, None if not cached
+        """
+        # user loaded by the session may have changes, which aren't cached yet
+        if (user := session.identity_map.get(identity_key(User, user_id))) is not None:
+            return user
+
+        with self._lock:
+            expires_at, values = self._users.get(user_id, (0.0, None))
+
+            if values is None:
+                return None
+
+            if expires_at < time.monotonic():
+                self._users.pop(user_id, None)
+                return None
+
+            self._users.move_to_end(user_id)
+
+        user = User(**values)
+        # user is marked as loaded from the database without attribute changes,
+        # so merge only puts it into the identity map
+        make_transient_to_detached(user)
+        return session.merge(user, load=False)
+
+    def set(self, user: User) -> None:
+        values = {
+            attribute.key: getattr(user, attribute.key)
+            for attribute in inspect(User).column_attrs
+        }
+
+        with self._lock:
+            self._users[user.id] = (time.monotonic() + self.ttl, values)
+            self._users.move_to_end(user.id)
+
+            while len(self._users) > self.max_size:
+                self._users.popitem(last=False)
+
+    def invalidate(self, session: Session, user_ids: Iterable[int]) -> None:
+        """Mark users as changed, they are removed from the cache after commit."""
+        session.info.setdefault(INVALIDATED_USERS_INFO_KEY, set()).update(user_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+    def _remove_invalidated(self, session: Session) -> None:
+        user_ids = session.info.pop(INVALIDATED_USERS_INFO_KEY, ())
+
+        with self._lock:
+            for user_id in user_ids:
+                self._users.pop(user_id, None)
+
+    def _discard_invalidations(self, session: Session) -> None:
+        session.info.pop(INVALIDATED_USERS_INFO_KEY, None)
+
+
+authenticated_user_cache = AuthenticatedUserCache(
+    settings.authenticated_user_cache_ttl, settings.authenticated_user_cache_max_size
+)
+
+event.listen(Session, "after_commit", authenticated_user_cache._remove_invalidated)
+event.listen(Session, "after_rollback", authenticated_user_cache._discard_invalidations)
@@ -1,13 +1,16 @@
-from datetime import datetime
-from typing import Optional, TYPE_CHECKING, Union
-from sqlalchemy import and_, select
+from typing import Any, Optional, TYPE_CHECKING, Union
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert
 
 from sqlalchemy.orm import Session
 
 from src.apis.common_errors import ServiceBaseError
-from src.apis.services.base import BaseService, DataObject
+from src.apis.services.base import AsyncBaseService, BaseService, DataObject
+from src.apis.services.password_hasher import password_hasher
+from src.apis.services.user_cache import authenticated_user_cache
 from src.apis.users.schemas import UserCreateSchema, AddressSchema
 from src.database.models import User, Address
+from src.database.models.address import get_address_fingerprint
 
 if TYPE_CHECKING:
     from src.apis.admin.users.schemas import UserExtendedCreateSchema
@@ -21,11 +24,16 @@ class UserDoesNotExist(ServiceBaseError):
     """Raised in case when user with received id does not exist."""
 
 
+class AddressAlreadyExists(ServiceBaseError):
+    """Raised when user already has the same address."""
+
+
 class UserService(BaseService):
     """Service is responsible for working with the User entity."""
 
     model = User
     db_session: Session
+    cache_read_all = True
     _entity_not_found_error = UserDoesNotExist(
         message="User with the provided id was not found."
     )
@@ -39,12 +47,16 @@ class UserService(BaseService):
             )
 
     def create_user(
-        self, user_data: Union["UserExtendedCreateSchema", "UserCreateSchema"]
+        self,
+        user_data: Union["UserExtendedCreateSchema", "UserCreateSchema"],
+        password_hash: str | None = None,
     ) -> User:
         """Create and persist new user.
 
         Args:
             user_data (UserCreate): new user data
+            password_hash (str | None, optional): hash of the user password,
+                password is hashed in the current process if None
 
         Returns:
             User: new user instance
@@ -53,32 +65,56 @@ class UserService(BaseService):
             UserAlreadyExists: in case when user with provided email already exists
         """
         self._check_if_user_exists(user_data.email)
+        password_data = (
+            {"password": user_data.password}
+            if password_hash is None
+            else {"password_hash": password_hash}
+        )
         return super()._create(
             first_name=user_data.first_name,
             last_name=user_data.last_name,
             email=user_data.email,
-            password=user_data.password,
+            **password_data,
             phone_number=user_data.phone_number,
             birth_date=user_data.birth_date,
             is_admin=getattr(user_data, "is_admin", False),
             is_employee=getattr(user_data, "is_employee", False),
         )
 
-    def update_user_last_login_date(
-        self, user_id: int, new_last_login_time: datetime
-    ) -> User:
-        """Update last_login attribute value for the specified user.
+    def get_authenticated_user(self, user_id: int) -> User:
+        """Return user, who is authenticated by the request.
+
+        Recently authenticated users are restored from the cache without
+        reading the users table.
 
         Args:
             user_id (int): unique user identifier
-            new_last_login_time (datetime): time for last login update
+
+        Raises:
+            UserDoesNotExist: in case when user with provided id does not exist
 
         Returns:
-            User: user entity with update last login time
+            User: user entity attached to the service session
         """
-        user = self.get_by_id(user_id)
+        user = authenticated_user_cache.get(self.db_session, user_id)
+
+        if user is None:
+            user = self.get_by_id(user_id)
+            authenticated_user_cache.set(user)
+
+        return user
+
+    def update(self, entity: Any, new_data: DataObject) -> Any:
+        entity = super().update(entity, new_data)
+
+        if isinstance(entity, User):
+            authenticated_user_cache.invalidate(self.db_session, [entity.id])
+
+        return entity
 
-        return self.update(user, {"last_login_date": new_last_login_time})
+    def delete(self, entity_id: int) -> None:
+        super().delete(entity_id)
+        authenticated_user_cache.invalidate(self.db_session, [entity_id])
 
     def update_user_data(self, user_id: int, new_user_data: DataObject) -> User:
         """Update data for the user with the provided id.
@@ -98,70 +134,135 @@ class UserService(BaseService):
 
         return self.update(user, new_user_data)
 
-    def _find_user_address(
-        self,
-        user: User,
-        address_data: AddressSchema,
-    ) -> Optional[Address]:
-        filters = []
-
-        for key, value in address_data:
-            filters.append(getattr(Address, key) == value)
-
-        query = (
-            select(Address)
-            .join(self.model)
-            .where(and_(self.model.id == user.id, *filters))
-        )
-
-        return self.db_session.scalars(query).first()
-
     def add_address(self, user: User, address_data: AddressSchema) -> Address:
         """Add new user address.
 
         If user address already exists, function does not create a new one.
+        Addresses are the same, when their fingerprints are equal. Existing
+        address is found by the unique fingerprint index in the same
+        statement, so concurrent requests don't create duplicates.
 
         Args:
             user (User): user for which address should be created
             address_data (AddressBase): new address data
 
         Returns:
-            Address: created address entity
+            Address: created or existing address entity
         """
-        address = self._find_user_address(user, address_data)
-
-        if address is not None:
-            return address
-
-        address = self._create_address_instance(address_data)
-        user.addresses.append(address)
-        self.db_session.flush()
-        return address
-
-    def _create_address_instance(self, address_data: AddressSchema) -> Address:
-        return Address(
-            city=address_data.city,
-            street=address_data.street,
-            street_number=address_data.street_number,
-            postal_code=address_data.postal_code,
+        statement = insert(Address).values(
+            user_id=user.id,
+            fingerprint=get_address_fingerprint(**address_data.dict()),
+            **address_data.dict(),
+        )
+        statement = (
+            statement.on_conflict_do_update(
+                index_elements=[Address.user_id, Address.fingerprint],
+                # no-op update makes the existing row returned unchanged
+                set_={"fingerprint": statement.excluded.fingerprint},
+            )
+            .returning(Address)
+            .execution_options(populate_existing=True)
         )
+        return self.db_session.scalars(statement).one()
 
     def get_user_delivery_address(
         self, user: User, address_id: Optional[int] = None
     ) -> Optional[Address]:
-        filters = [Address.user_id == user.id]
+        user_id = user.id
+        query = lambda_stmt(lambda: select(Address).where(Address.user_id == user_id))
 
         if address_id is not None:
-            filters.append(Address.id == address_id)
+            query += lambda s: s.where(Address.id == address_id)
 
-        query = (
-            select(Address)
-            .where(and_(*filters))
-            .order_by(Address.created_at.desc())
-            .limit(1)
-        )
+        query += lambda s: s.order_by(Address.created_at.desc()).limit(1)
 
         return self.db_session.scalars(query).first()
 
     def update_user_address_data(self, address: Address, new_address_data: DataObject):
+        """Update data of the user address.
+
+        Args:
+            address (Address): updated address
+            new_address_data (DataObject): changed fields of the address
+
+        Returns:
+            Address: updated address
+
+        Raises:
+            AddressAlreadyExists: in case when user already has the same address
+        """
+        fingerprint = get_address_fingerprint(
+            **{
+                field_name: new_address_data.get(
+                    field_name, getattr(address, field_name)
+                )
+                for field_name in ("city", "street", "street_number", "postal_code")
+            }
+        )
+        query = select(Address.id).where(
+            Address.user_id == address.user_id,
+            Address.fingerprint == fingerprint,
+            Address.id != address.id,
+        )
+
+        if self.db_session.scalars(query).first() is not None:
+            raise AddressAlreadyExists(message="The same address already exists.")
+
         return self.update(address, new_address_data)
+
+
+class AsyncUserService(AsyncBaseService[UserService]):
+    """Async variant of the UserService."""
+
+    service_class = UserService
+
+    async def create_user(
+        self, user_data: Union["UserExtendedCreateSchema", "UserCreateSchema"]
+    ) -> User:
+        """Create and persist new user, password is hashed by the process pool.
+
+        See `UserService.create_user` for the details.
+        """
+        # signups with a registered email don't take a slot of the pool
+        await self.run_sync(self.service._check_if_user_exists, user_data.email)
+        password_hash = await password_hasher.hash(user_data.password)
+        return await self.run_sync(self.service.create_user, user_data, password_hash)
+
+    async def update_user_data(self, user_id: int, new_user_data: DataObject) -> User:
+        """Update data of the user, new password is hashed by the process pool.
+
+        See `UserService.update_user_data` for the details.
+        """
+        if (password := new_user_data.get("password")) is not None:
+            new_user_data = {
+                **{
+                    key: value
+                    for key, value in new_user_data.items()
+                    if key != "password"
+                },
+                "password_hash": await password_hasher.hash(password),
+            }
+
+        return await self.run_sync(
+            self.service.update_user_data, user_id, new_user_data
+        )
+
+    async def verify_password(self, user: User, password: str) -> bool:
+        return await password_hasher.verify(password, user.password_hash)
+
+    async def add_address(self, user: User, address_data: AddressSchema) -> Address:
+        return await self.run_sync(self.service.add_address, user, address_data)
+
+    async def get_user_delivery_address(
+        self, user: User, address_id: Optional[int] = None
+    ) -> Optional[Address]:
+        return await self.run_sync(
+            self.service.get_user_delivery_address, user, address_id
+        )
+
+    async def update_user_address_data(
+        self, address: Address, new_address_data: DataObject
+    ) -> Address:
+        return await self.run_sync(
+            self.service.update_user_address_data, address, new_address_data
+        )
@@ -1,17 +1,44 @@
 import abc
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import logging
+import math
+import secrets
+import threading
+import time
 from calendar import timegm
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Mapping, Protocol
+from typing import Any, Iterable, Mapping, NamedTuple, Protocol
 
-from jose.exceptions import JWTError
+from jose.exceptions import (
+    ExpiredSignatureError,
+    JWTClaimsError,
+    JWTError,
+)
 from jose import jwt
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from src.apis.services.user_service import UserService, UserDoesNotExist
-from src.database.models import User
+from src.database.db import async_engine
+from src.database.models import RevokedToken, User
 from src.settings import settings
 
+logger = logging.getLogger(__name__)
+
 TokenPayload = Mapping[str, Any]
 
+# ids of the concurrent revocations may be committed out of order, so the
+# last ids are read again by the next refresh
+REFRESH_OVERLAP = 100
+
 
 class InvalidToken(Exception):
     """Raised in case when API token is not valid."""
@@ -19,6 +46,17 @@ class InvalidToken(Exception):
     pass
 
 
+class TokenClaims(NamedTuple):
+    """Identity and roles of the user from the verified token.
+
+    Roles are None, when the token doesn't carry them.
+    """
+
+    user_id: int
+    is_admin: bool | None
+    is_employee: bool | None
+
+
 class JWTBackendProtocol(Protocol):
     """JWT service implementation for API token operations."""
 
@@ -39,12 +77,30 @@ class APITokenBackend(abc.ABC):
     _expiration_time_claim_name = settings.expiration_time_claim_name
     _issued_at_time_claim_name = settings.issued_at_time_claim_name
     _user_id_claim_name = settings.user_id_claim_name
+    _admin_claim_name = settings.admin_claim_name
+    _employee_claim_name = settings.employee_claim_name
+    _token_id_claim_name = settings.token_id_claim_name
 
     @abc.abstractmethod
     def create_api_token_for_user(self, user: User, token_lifetime: timedelta) -> str:
         """Set create token interface for all subclasses."""
         pass
 
+    @abc.abstractmethod
+    def create_access_token_for_user(self, user: User) -> str:
+        """Set create access token interface for all subclasses."""
+        pass
+
+    @abc.abstractmethod
+    def get_claims_from_token(self, token: str) -> TokenClaims:
+        """Set get claims from token interface for all subclasses."""
+        pass
+
+    @abc.abstractmethod
+    async def revoke_token(self, token: str) -> None:
+        """Set revoke token interface for all subclasses."""
+        pass
+
     @abc.abstractmethod
     def get_user_from_token(self, token: str, user_service: UserService) -> User:
         """Set get user from token interface for all subclasses."""
@@ -56,6 +112,361 @@ class APITokenBackend(abc.ABC):
         pass
 
 
+class HS256JWTCodec:
+    """JWT codec with the HMAC key prepared once for the HS256 tokens.
+
+    Tokens are encoded the same way as by python-jose, so both can decode
+    tokens of each other. Codec encodes and decodes tokens signed with the
+    prepared secret and HS256 algorithm itself, other tokens are handled by
+    the `fallback` backend. Claims are validated as python-jose does with the
+    default options.
+
+    Args:
+        secret (str): secret, which the HMAC key is prepared for
+        fallback (JWTBackendProtocol): backend for other secrets and algorithms
+    """
+
+    algorithm = "HS256"
+    _encoded_header = base64.urlsafe_b64encode(
+        json.dumps(
+            {"alg": algorithm, "typ": "JWT"}, separators=(",", ":"), sort_keys=True
+        ).encode()
+    ).rstrip(b"=")
+
+    def __init__(self, secret: str, fallback: JWTBackendProtocol = jwt) -> None:
+        self.fallback = fallback
+        self._secret = secret
+        # copies of the keyed HMAC don't hash the key again
+        self._mac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+    def encode(self, payload: TokenPayload, secret: str, algorithm: str) -> str:
+        if not self._is_prepared_for(secret, algorithm):
+            return self.fallback.encode(payload, secret, algorithm)
+
+        encoded_payload = _base64url_encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        )
+        signing_input = self._encoded_header + b"." + encoded_payload
+        signature = _base64url_encode(self._sign(signing_input))
+        return (signing_input + b"." + signature).decode()
+
+    def decode(self, token: str, secret: str, algorithm: str) -> Mapping[str, Any]:
+        if not self._is_prepared_for(secret, algorithm):
+            return self.fallback.decode(token, secret, algorithm)
+
+        try:
+            signing_input, encoded_signature = token.encode().rsplit(b".", 1)
+            encoded_header, encoded_payload = signing_input.split(b".")
+            header = json.loads(_base64url_decode(encoded_header))
+            signature = _base64url_decode(encoded_signature)
+        except (ValueError, binascii.Error):
+            raise JWTError("Error decoding token headers.")
+
+        if not isinstance(header, dict) or header.get("alg") != self.algorithm:
+            raise JWTError("The specified alg value is not allowed")
+
+        if not hmac.compare_digest(self._sign(signing_input), signature):
+            raise JWTError("Signature verification failed.")
+
+        try:
+            payload = json.loads(_base64url_decode(encoded_payload))
+        except (ValueError, binascii.Error):
+            raise JWTError("Invalid payload string.")
+
+        if not isinstance(payload, dict):
+            raise JWTError("Invalid payload string: must be a json object")
+
+        self._validate_claims(payload)
+        return payload
+
+    def _is_prepared_for(self, secret: str, algorithm: str) -> bool:
+        return algorithm == self.algorithm and secret == self._secret
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    @staticmethod
+    def _validate_claims(payload: dict[str, Any]) -> None:
+        try:
+            times = {
+                claim: int(payload[claim])
+                for claim in ("iat", "nbf", "exp")
+                if claim in payload
+            }
+        except (TypeError, ValueError):
+            raise JWTClaimsError("Time claims must be integers.")
+
+        now = int(time.time())
+
+        if times.get("nbf", now) > now:
+            raise JWTClaimsError("The token is not yet valid (nbf)")
+        elif times.get("exp", now) < now:
+            raise ExpiredSignatureError("Signature has expired.")
+        elif "aud" in payload:
+            raise JWTClaimsError("Invalid audience")
+        elif any(
+            not isinstance(payload.get(claim, ""), str) for claim in ("sub", "jti")
+        ):
+            raise JWTClaimsError("Subject and JWT ID claims must be strings.")
+
+
+def _base64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _base64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class VerifiedTokenCache:
+    """Payloads of the verified tokens, which are kept until the tokens expire.
+
+    Tokens are identified by the digest of the token, secret and algorithm, so
+    the payload is reused only by the backend, which verified it. Payload is
+    never returned after its `exp` claim, and the least recently used tokens
+    are evicted, when the cache is full.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._payloads: OrderedDict[bytes, tuple[float, TokenPayload]] = OrderedDict()
+
+    def get(self, key: bytes) -> TokenPayload | None:
+        with self._lock:
+            expires_at, payload = self._payloads.get(key, (0.0, None))
+
+            if expires_at <= time.time():
+                self._payloads.pop(key, None)
+                return None
+
+            self._payloads.move_to_end(key)
+            return payload
+
+    def set(self, key: bytes, payload: TokenPayload, expires_at: float) -> None:
+        with self._lock:
+            self._payloads[key] = (expires_at, payload)
+            self._payloads.move_to_end(key)
+
+            while len(self._payloads) > self.max_size:
+                self._payloads.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._payloads.clear()
+
+    @staticmethod
+    def get_key(token: str, secret: str, algorithm: str) -> bytes:
+        return hashlib.sha256(f"{algorithm}:{secret}:{token}".encode()).digest()
+
+
+verified_token_cache = VerifiedTokenCache(settings.verified_token_cache_max_size)
+
+
+class BloomFilter:
+    """Set of strings, which may answer false positives, but no false negatives.
+
+    Args:
+        capacity (int): number of the items, which keep the false positive rate
+        false_positive_rate (float): expected rate of the false positives
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        self.capacity = max(capacity, 1)
+        self.count = 0
+        self._size = math.ceil(
+            -self.capacity * math.log(false_positive_rate) / math.log(2) ** 2
+        )
+        self._hash_count = max(1, round(self._size / self.capacity * math.log(2)))
+        self._bits = bytearray(math.ceil(self._size / 8))
+
+    def add(self, item: str) -> None:
+        for position in self._get_positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._get_positions(item)
+        )
+
+    def _get_positions(self, item: str) -> Iterable[int]:
+        # positions are derived from two hashes by the double hashing
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first_hash = int.from_bytes(digest[:8], "little")
+        second_hash = int.from_bytes(digest[8:], "little") | 1
+        return (
+            (first_hash + index * second_hash) % self._size
+            for index in range(self._hash_count)
+        )
+
+
+class TokenRevocationList:
+    """Snapshot of the revoked token ids, which is refreshed from the database.
+
+    Revocations are persisted in the `revoked_tokens` table until the tokens
+    expire. Each worker keeps ids of the revoked tokens in the exact set and
+    in the Bloom filter in front of it, so the check of a token, which is not
+    revoked, usually ends with one filter lookup and costs no I/O.
+
+    Snapshot is refreshed periodically with the revocations added after the
+    last refresh, so revocations of other workers take effect after the
+    refresh interval. Snapshot is rebuilt without the expired tokens, when
+    the filter is full or the rebuild interval has passed.
+
+    Args:
+        engine (AsyncEngine): engine of the database with the revocations
+        capacity (int): initial capacity of the Bloom filter
+        false_positive_rate (float): false positive rate of the Bloom filter
+        rebuild_interval (float): interval between the rebuilds in seconds
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        capacity: int,
+        false_positive_rate: float,
+        rebuild_interval: float,
+    ) -> None:
+        self.engine = engine
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self._filter = BloomFilter(capacity, false_positive_rate)
+        self._revoked: dict[str, datetime] = {}
+        self._last_id = 0
+        self._rebuilt_at = time.monotonic()
+        self._refresh_task: asyncio.Task | None = None
+
+    def is_revoked(self, jti: str) -> bool:
+        if jti not in self._filter:
+            return False
+
+        with self._lock:
+            expires_at = self._revoked.get(jti)
+
+        return expires_at is not None and expires_at > datetime.utcnow()
+
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        """Persist revocation of the token and add it to the snapshot."""
+        statement = (
+            insert(RevokedToken)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+
+        async with self.engine.begin() as connection:
+            await connection.execute(statement)
+
+        with self._lock:
+            self._add(jti, expires_at)
+
+    def refresh(self, connection: Connection) -> int:
+        """Add revocations, which were persisted after the last refresh.
+
+        Args:
+            connection (Connection): connection used to read the revocations
+
+        Returns:
+            int: number of the read revocations
+        """
+        if (
+            self._filter.count >= self._filter.capacity
+            or time.monotonic() - self._rebuilt_at >= self.rebuild_interval
+        ):
+            return self.rebuild(connection)
+
+        rows = connection.execute(
+            select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+            .where(RevokedToken.id > self._last_id - REFRESH_OVERLAP)
+            .order_by(RevokedToken.id)
+        ).all()
+
+        with self._lock:
+            for row in rows:
+                if row.jti not in self._revoked:
+                    self._add(row.jti, row.expires_at)
+
+                self._last_id = max(self._last_id, row.id)
+
+        return len(rows)
+
+    def rebuild(self, connection: Connection) -> int:
+        """Delete expired revocations and load the rest into a new snapshot."""
+        now = datetime.utcnow()
+        connection.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        rows = connection.execute(
+            select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+        ).all()
+        # filter is sized, so it isn't full right after the rebuild
+        revocation_filter = BloomFilter(
+            max(self.capacity, 2 * len(rows)), self.false_positive_rate
+        )
+        revoked = {}
+
+        for row in rows:
+            revocation_filter.add(row.jti)
+            revoked[row.jti] = row.expires_at
+
+        with self._lock:
+            self._filter = revocation_filter
+            self._revoked = revoked
+            self._last_id = max((row.id for row in rows), default=self._last_id)
+            self._rebuilt_at = time.monotonic()
+
+        return len(rows)
+
+    async def refresh_async(self) -> int:
+        async with self.engine.begin() as connection:
+            return await connection.run_sync(self.refresh)
+
+    async def start(self, interval: float) -> None:
+        """Load the snapshot and start refreshing it every `interval` seconds."""
+        async with self.engine.begin() as connection:
+            await connection.run_sync(self.rebuild)
+
+        self._refresh_task = asyncio.create_task(self._refresh_periodically(interval))
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+    async def _refresh_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+
+            try:
+                await self.refresh_async()
+            except Exception:
+                logger.exception("Failed to refresh revoked tokens.")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._filter = BloomFilter(self.capacity, self.false_positive_rate)
+            self._revoked = {}
+            self._last_id = 0
+            self._rebuilt_at = time.monotonic()
+
+    def _add(self, jti: str, expires_at: datetime) -> None:
+        self._filter.add(jti)
+        self._revoked[jti] = expires_at
+
+
+token_revocation_list = TokenRevocationList(
+    async_engine,
+    settings.revoked_tokens_capacity,
+    settings.revoked_tokens_false_positive_rate,
+    settings.revoked_tokens_rebuild_interval,
+)
+
+
 class JWTTokenBackend(APITokenBackend):
     """Backend service is responsible for API token operations."""
 
@@ -64,36 +475,96 @@ class JWTTokenBackend(APITokenBackend):
         jwt_backend: JWTBackendProtocol,
         shared_secret: str = settings.secret_key,
         algorithm="HS256",
+        role_claims: bool = False,
     ):
         self.jwt_backend = jwt_backend
         self.shared_secret = shared_secret
         self.algorithm = algorithm
-        self._current_time = datetime.utcnow()
+        self.role_claims = role_claims
 
     def create_api_token_for_user(self, user: User, token_lifetime: timedelta) -> str:
         """Create new API token for the given user."""
         payload = self._create_user_token_payload(user, token_lifetime)
         return self.jwt_backend.encode(payload, self.shared_secret, self.algorithm)
 
+    def create_access_token_for_user(self, user: User) -> str:
+        """Create new access token, which carries roles of the user if enabled."""
+        payload = self._create_user_token_payload(user, settings.access_token_lifetime)
+
+        if self.role_claims:
+            payload = {
+                **payload,
+                self._admin_claim_name: user.is_admin,
+                self._employee_claim_name: user.is_employee,
+            }
+
+        return self.jwt_backend.encode(payload, self.shared_secret, self.algorithm)
+
+    def get_claims_from_token(self, token: str) -> TokenClaims:
+        """Return identity of the user and roles given in token payload."""
+        token_payload = self.verify(token)
+        is_admin = token_payload.get(self._admin_claim_name)
+        is_employee = token_payload.get(self._employee_claim_name)
+
+        if not all(
+            isinstance(role, (bool, type(None))) for role in (is_admin, is_employee)
+        ):
+            raise InvalidToken
+
+        return TokenClaims(
+            token_payload[self._user_id_claim_name], is_admin, is_employee
+        )
+
+    async def revoke_token(self, token: str) -> None:
+        """Revoke the token, so it is not accepted before it expires."""
+        token_payload = self.verify(token)
+
+        if (jti := token_payload.get(self._token_id_claim_name)) is None:
+            raise InvalidToken
+
+        expires_at = datetime.utcfromtimestamp(
+            token_payload[self._expiration_time_claim_name]
+        )
+        await token_revocation_list.revoke(jti, expires_at)
+
     def get_user_from_token(self, token: str, user_service: UserService) -> User:
         """Return user instance with email given in token payload."""
         token_payload = self.verify(token)
 
         try:
-            user = user_service.get_by_id(token_payload[self._user_id_claim_name])
+            user = user_service.get_authenticated_user(
+                token_payload[self._user_id_claim_name]
+            )
         except UserDoesNotExist:
             raise InvalidToken
 
         return user
 
     def verify(self, token: str) -> TokenPayload:
+        # signature and claims of the token are checked once, expiration time
+        # is checked on every call
+        cache_key = verified_token_cache.get_key(
+            token, self.shared_secret, self.algorithm
+        )
+
         try:
-            payload = self._decode_api_token(token)
-            self._verify_payload_claims(payload)
+            if (payload := verified_token_cache.get(cache_key)) is None:
+                payload = self._decode_api_token(token)
+                self._verify_payload_claims(payload)
+                verified_token_cache.set(
+                    cache_key, payload, payload[self._expiration_time_claim_name]
+                )
+
             self._check_token_expiration_time(payload[self._expiration_time_claim_name])
         except (JWTError, KeyError):
             raise InvalidToken
 
+        # tokens issued before the revocation support have no id
+        jti = payload.get(self._token_id_claim_name)
+
+        if jti is not None and token_revocation_list.is_revoked(jti):
+            raise InvalidToken
+
         return payload
 
     def _decode_api_token(self, token: str) -> TokenPayload:
@@ -105,9 +576,7 @@ class JWTTokenBackend(APITokenBackend):
         return payload
 
     def _check_token_expiration_time(self, expiration_timestamp: int):
-        expiration_time = datetime.fromtimestamp(expiration_timestamp)
-
-        if self._current_time >= expiration_time:
+        if time.time() >= expiration_timestamp:
             raise JWTError
 
     def _verify_payload_claims(self, payload: TokenPayload) -> None:
@@ -123,13 +592,13 @@ class JWTTokenBackend(APITokenBackend):
     def _create_user_token_payload(
         self, user: User, token_lifetime: timedelta
     ) -> TokenPayload:
-        expiration_date = token_lifetime + self._current_time
+        current_time = datetime.utcnow()
+        expiration_date = token_lifetime + current_time
 
         return {
             self._user_id_claim_name: user.id,
-            self._issued_at_time_claim_name: self._convert_to_timestamp(
-                self._current_time
-            ),
+            self._issued_at_time_claim_name: self._convert_to_timestamp(current_time),
+            self._token_id_claim_name: secrets.token_urlsafe(16),
             self._expiration_time_claim_name: self._convert_to_timestamp(
                 expiration_date
             ),
@@ -139,5 +608,12 @@ class JWTTokenBackend(APITokenBackend):
         return timegm(date.utctimetuple())
 
 
+# backend is stateless, so all requests of the process share it
+jwt_token_backend = JWTTokenBackend(
+    HS256JWTCodec(settings.secret_key),
+    role_claims=settings.claims_only_authentication,
+)
+
+
 def create_jwt_token_backend() -> APITokenBackend:
-    return JWTTokenBackend(jwt)
+    return jwt_token_backend
@@ -1,12 +1,26 @@
 from fastapi import APIRouter, Body, Depends, status
-from fastapi_pagination import LimitOffsetPage
 from pydantic import EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import BackgroundTasks
-from src.apis.auth_dependencies import authenticated_user
+from src.apis.auth_dependencies import (
+    AuthenticatedPrincipal,
+    async_authenticated_principal,
+    async_authenticated_user,
+    authenticated_user,
+)
 from src.apis.common_errors import ErrorResponse, build_http_exception_response
-from src.apis.services.order_service import OrderService, ProductDoesNotExist
+from src.apis.http_cache import conditional_get
+from src.apis.pagination import (
+    CountedLimitOffsetPage,
+    CursorPage,
+    CursorParams,
+    InvalidCursor,
+)
+from src.apis.services.order_service import AsyncOrderService, ProductDoesNotExist
 from src.apis.services.user_service import (
+    AddressAlreadyExists,
+    AsyncUserService,
     UserAlreadyExists,
     UserService,
 )
@@ -26,7 +40,7 @@ from src.apis.users.schemas import (
     AddressUpdateSchema,
     OrderFilterParamsSchema,
 )
-from src.database.db import get_db_session
+from src.database.db import get_async_db_session, get_db_session
 from src.database.models import User
 from src.apis.token_backend import (
     create_jwt_token_backend,
@@ -66,21 +80,25 @@ async def obtain_reset_password_email(
         status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
     },
 )
-def reset_user_password(
+async def reset_user_password(
     reset_password_data: PasswordResetSchema,
-    db_session: Session = Depends(get_db_session),
+    db_session: AsyncSession = Depends(get_async_db_session),
     token_backend: APITokenBackend = Depends(create_jwt_token_backend),
 ):
-    service = UserService(db_session)
+    service = AsyncUserService(db_session)
 
     try:
-        user = token_backend.get_user_from_token(reset_password_data.token, service)
+        user = await service.run_sync(
+            token_backend.get_user_from_token,
+            reset_password_data.token,
+            service.service,
+        )
     except InvalidToken:
         raise build_http_exception_response(
             "The provided token is not valid.", status.HTTP_400_BAD_REQUEST
         )
 
-    service.update_user_data(user.id, {"password": reset_password_data.password})
+    await service.update_user_data(user.id, {"password": reset_password_data.password})
 
 
 @ME_ROUTER.get(
@@ -90,6 +108,7 @@ def reset_user_password(
         status.HTTP_200_OK: {"model": UserOutSchema},
         status.HTTP_403_FORBIDDEN: {"model": ErrorResponse},
     },
+    dependencies=[Depends(conditional_get())],
 )
 def get_authenticated_user_info(
     user: User = Depends(authenticated_user),
@@ -168,16 +187,16 @@ async def create_authenticated_user_order_api(
     order: OrderCreateSchema,
     delivery_address: AddressSchema,
     background_tasks: BackgroundTasks,
-    user: User = Depends(authenticated_user),
-    db_session: Session = Depends(get_db_session),
+    user: User = Depends(async_authenticated_user),
+    db_session: AsyncSession = Depends(get_async_db_session),
 ):
     """Create order for an authenticated user."""
-    order_service = OrderService(db_session)
-    user_service = UserService(db_session)
-    address = user_service.add_address(user, delivery_address)
+    order_service = AsyncOrderService(db_session)
+    user_service = AsyncUserService(db_session)
+    address = await user_service.add_address(user, delivery_address)
 
     try:
-        new_order = order_service.create_order(user, order, address)
+        new_order = await order_service.create_order(user, order, address)
     except ProductDoesNotExist as error:
         return build_http_exception_response(
             message=error.message,
@@ -218,9 +237,15 @@ def update_auth_user_address(
             code=status.HTTP_400_BAD_REQUEST,
         )
 
-    updated_address = service.update_user_address_data(
-        user_address, address_data.dict(exclude_unset=True)
-    )
+    try:
+        updated_address = service.update_user_address_data(
+            user_address, address_data.dict(exclude_unset=True)
+        )
+    except AddressAlreadyExists as error:
+        return build_http_exception_response(
+            message=error.message,
+            code=status.HTTP_400_BAD_REQUEST,
+        )
 
     return {"delivery_address": updated_address}
 
@@ -232,12 +257,43 @@ def update_auth_user_address(
         status.HTTP_403_FORBIDDEN: {"model": ErrorResponse},
         status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
     },
+    dependencies=[Depends(conditional_get())],
 )
-def get_auth_user_orders(
+async def get_auth_user_orders(
     filters: OrderFilterParamsSchema = Depends(OrderFilterParamsSchema),
-    db_session: Session = Depends(get_db_session),
-    user: User = Depends(authenticated_user),
-) -> LimitOffsetPage[OrderOutSchema]:
-    service = OrderService(db_session)
-    order_filters = {**filters.dict(exclude={"sort"}), "user_id": user.id}
-    return service.read_all(filters.sort, filters=order_filters)
+    db_session: AsyncSession = Depends(get_async_db_session),
+    principal: AuthenticatedPrincipal = Depends(async_authenticated_principal),
+) -> CountedLimitOffsetPage[OrderOutSchema]:
+    service = AsyncOrderService(db_session)
+    order_filters = {**filters.dict(exclude={"sort"}), "user_id": principal.user_id}
+    return await service.read_all(filters.sort, filters=order_filters)
+
+
+@ME_ROUTER.get(
+    "/orders/cursor",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_403_FORBIDDEN: {"model": ErrorResponse},
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
+    },
+    dependencies=[Depends(conditional_get())],
+)
+async def get_auth_user_orders_by_cursor(
+    filters: OrderFilterParamsSchema = Depends(OrderFilterParamsSchema),
+    page_params: CursorParams = Depends(CursorParams),
+    db_session: AsyncSession = Depends(get_async_db_session),
+    principal: AuthenticatedPrincipal = Depends(async_authenticated_principal),
+) -> CursorPage[OrderOutSchema]:
+    """Return page of the authenticated user orders, which follow the cursor."""
+    service = AsyncOrderService(db_session)
+    order_filters = {**filters.dict(exclude={"sort"}), "user_id": principal.user_id}
+
+    try:
+        return await service.read_all_by_cursor(
+            filters.sort, order_filters, page_params.cursor, page_params.size
+        )
+    except InvalidCursor as error:
+        return build_http_exception_response(
+            message=error.message,
+            code=status.HTTP_400_BAD_REQUEST,
+        )
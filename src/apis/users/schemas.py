@@ -25,23 +25,7 @@ class OrderOuterGetter(GetterDict):
         if key == "order":
             return self._obj
         elif key == "delivery_address":
-            return self._obj.Order.delivery_address
-
-
-class OrderBaseGetter(GetterDict):
-    """Class to provide a dictionary-like interface to outer order base response.
-
-    Since paginator returns 'Raw' object instead of 'Order' object, this
-    should be properly handled when getting data for encoding.
-    """
-
-    def get(self, key: str, default: Any) -> Any:
-        if isinstance(self._obj, Order):
-            return getattr(self._obj, key, default)
-        else:
-            if key != "total_price":
-                return getattr(self._obj.Order, key, default)
-            return getattr(self._obj, key, default)
+            return self._obj.delivery_address
 
 
 class AddressId(BaseModel):
@@ -159,7 +143,7 @@ class OrderSchema(BaseModel):
 
 
 class OrderCreateSchema(OrderSchema):
-    pass
+    order_items: list[OrderItemSchema] = Field(..., min_items=1)
 
 
 class OrderBaseSchema(OrderSchema, OrderId):
@@ -169,7 +153,6 @@ class OrderBaseSchema(OrderSchema, OrderId):
     total_price: int
 
     class Config:
-        getter_dict = OrderBaseGetter
         json_encoders = {OrderStatus: lambda status: status.name}
 
 
@@ -3,15 +3,69 @@ from fastapi_pagination import add_pagination
 from fastapi.exceptions import ValidationError
 from fastapi.responses import JSONResponse
 from src.apis import ROUTER_V1
+from src.apis.http_cache import NotModified, not_modified_exception_handler
+from src.apis.middlewares import (
+    ConditionalGetMiddleware,
+    PrimaryPinMiddleware,
+    QueryStatsMiddleware,
+)
+from src.apis.services.last_login import last_login_recorder
+from src.apis.services.password_hasher import PasswordHasherBusy, password_hasher
+from src.apis.token_backend import token_revocation_list
+from src.settings import settings
 from fastapi.encoders import jsonable_encoder
 
 app = FastAPI()
+app.add_middleware(PrimaryPinMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ConditionalGetMiddleware)
+app.add_exception_handler(NotModified, not_modified_exception_handler)
 
 add_pagination(app)
 
 app.include_router(ROUTER_V1)
 
 
+@app.on_event("startup")
+async def start_last_login_recorder():
+    last_login_recorder.start(settings.last_login_flush_interval)
+
+
+@app.on_event("shutdown")
+async def stop_last_login_recorder():
+    # recorded logins are written before the worker exits
+    await last_login_recorder.stop()
+
+
+@app.on_event("startup")
+async def start_token_revocation_list():
+    await token_revocation_list.start(settings.revoked_tokens_refresh_interval)
+
+
+@app.on_event("shutdown")
+async def stop_token_revocation_list():
+    await token_revocation_list.stop()
+
+
+@app.on_event("shutdown")
+def stop_password_hasher():
+    password_hasher.shutdown()
+
+
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy_exception_handler(request, exc):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "detail": {
+                "message": exc.message,
+                "code": status.HTTP_503_SERVICE_UNAVAILABLE,
+            }
+        },
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.exception_handler(ValidationError)
 def validation_exception_handler(request, exc):
     return JSONResponse(
@@ -1,19 +1,291 @@
+import random
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator, Sequence
+
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
-from src.settings import settings
+from sqlalchemy.sql import Select
+from src.database.pool_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine_pool,
+)
+from src.database.query_log import QueryLogger
+from src.database.query_stats import QueryStatsRecorder
+from src.settings import Settings, settings
+
+ASYNC_DRIVER_NAME = "postgresql+asyncpg"
+READ_ONLY_HTTP_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+USE_REPLICA_INFO_KEY = "use_replica"
+READ_ONLY_INFO_KEY = "read_only"
+
+
+class RoutingSession(Session):
+    """Session which can send reads to one of the replica databases.
+
+    When reads are allowed to use a replica, SELECT statements are executed on
+    the replica chosen at session creation, so all of them see the same data.
+    Flushes and all other statements are always executed on the primary.
+
+    Read-only session executes statements on the primary through the
+    `read_only_bind`, which starts READ ONLY transactions.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        replicas: Sequence[Engine] = (),
+        read_only_bind: Engine | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica = random.choice(replicas) if replicas else None
+        self.read_only_bind = read_only_bind
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.replica is not None
+            and self.info.get(USE_REPLICA_INFO_KEY, False)
+            and not self._flushing
+            and isinstance(clause, Select)
+        ):
+            return self.replica
+
+        if self.read_only_bind is not None and self.info.get(READ_ONLY_INFO_KEY):
+            return self.read_only_bind
+
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def get_async_connection_url(connection_string: str | URL) -> URL:
+    """Return connection URL with the driver replaced by the async one.
+
+    Args:
+        connection_string (str | URL): database connection string, e.g. psycopg2 one
+
+    Returns:
+        URL: SQLAlchemy URL object which uses asyncpg driver
+    """
+    return make_url(connection_string).set(drivername=ASYNC_DRIVER_NAME)
+
+
+def get_pool_options(app_settings: Settings) -> dict[str, Any]:
+    """Return connection pool options for the engine.
+
+    Args:
+        app_settings (Settings): application settings
+
+    Returns:
+        dict[str, Any]: keyword arguments for the `create_engine` function
+    """
+    return {
+        "pool_size": app_settings.db_pool_size,
+        "max_overflow": app_settings.db_max_overflow,
+        "pool_timeout": app_settings.db_pool_timeout,
+        "pool_recycle": app_settings.db_pool_recycle,
+        "pool_pre_ping": app_settings.db_pool_pre_ping,
+    }
+
+
+query_logger = QueryLogger(
+    slow_query_threshold=settings.slow_query_threshold,
+    fast_query_sample_rate=settings.fast_query_sample_rate,
+    explain_threshold=settings.explain_threshold,
+    explain_enabled=settings.explain_slow_queries,
+    max_stored_queries=settings.max_stored_slow_queries,
+)
+query_stats_recorder = QueryStatsRecorder()
+
+
+def create_db_engine(connection_string: str) -> Engine:
+    db_engine = create_engine(
+        connection_string,
+        echo=settings.db_echo,
+        poolclass=InstrumentedQueuePool,
+        **get_pool_options(settings),
+    )
+    instrument_engine_pool(db_engine)
+    query_logger.instrument(db_engine)
+    query_stats_recorder.instrument(db_engine)
+    return db_engine
+
+
+def create_async_db_engine(connection_string: str) -> AsyncEngine:
+    db_engine = create_async_engine(
+        get_async_connection_url(connection_string),
+        echo=settings.db_echo,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        connect_args={
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size
+        },
+        **get_pool_options(settings),
+    )
+    instrument_engine_pool(db_engine.sync_engine)
+    query_logger.instrument(db_engine.sync_engine)
+    query_stats_recorder.instrument(db_engine.sync_engine)
+    return db_engine
+
+
+def is_pinned_to_primary(request: Request) -> bool:
+    """Check whether the client has written data recently.
+
+    Replicas may lag behind the primary, so such client should read from
+    the primary to see its own changes.
+    """
+    pinned_until = request.cookies.get(settings.primary_pin_cookie_name)
+
+    try:
+        return pinned_until is not None and float(pinned_until) > time.time()
+    except ValueError:
+        return False
+
+
+def is_read_only_request(request: Request) -> bool:
+    return request.method in READ_ONLY_HTTP_METHODS
 
-engine = create_engine(settings.db_connection_string, echo=True)
-db_session = sessionmaker(engine)
 
+def may_read_from_replica(request: Request) -> bool:
+    """Check whether reads of the request may be sent to a replica.
 
-def get_db_session() -> Session:
+    Read-only requests of the clients, which aren't pinned to the primary,
+    read from a replica, when replicas are configured.
+    """
+    return (
+        bool(settings.db_replica_connection_strings)
+        and is_read_only_request(request)
+        and not is_pinned_to_primary(request)
+    )
+
+
+def route_reads_to_replica(session: Session, request: Request) -> None:
+    """Allow session to read from a replica in case of a read-only request."""
+    use_replica = is_read_only_request(request) and not is_pinned_to_primary(request)
+    session.info[USE_REPLICA_INFO_KEY] = use_replica
+
+
+def reads_from_replica(session: Session) -> bool:
+    """Check whether SELECT statements of the session are sent to a replica.
+
+    Replica may lag behind the primary, so results read from it may be older
+    than the data already committed by other requests.
+    """
+    return getattr(session, "replica", None) is not None and session.info.get(
+        USE_REPLICA_INFO_KEY, False
+    )
+
+
+def get_read_only_bind(db_engine: Engine) -> Engine:
+    """Return engine copy, which starts READ ONLY transactions.
+
+    The copy shares the pool with the given engine. Transaction mode is set
+    by the driver in the BEGIN statement, so it costs no extra round trip.
+    """
+    return db_engine.execution_options(postgresql_readonly=True)
+
+
+@contextmanager
+def begin_request_session(
+    session_factory: sessionmaker[RoutingSession], request: Request
+) -> Iterator[Session]:
+    """Create a session for the request and end its transaction afterwards.
+
+    Session is committed in case of the successful processing of the request,
+    otherwise it is rolled back. Read-only requests get a read-only session,
+    which is just closed, since there is nothing to commit.
+
+    Args:
+        session_factory (sessionmaker[RoutingSession]): factory of the sessions
+        request (Request): current request
+
+    Yields:
+        Iterator[Session]: SQLAlchemy session object
+    """
+    if is_read_only_request(request):
+        with session_factory(info={READ_ONLY_INFO_KEY: True}) as session:
+            route_reads_to_replica(session, request)
+            yield session
+    else:
+        with session_factory.begin() as session:
+            route_reads_to_replica(session, request)
+            yield session
+
+
+@asynccontextmanager
+async def begin_async_request_session(
+    session_factory: async_sessionmaker[AsyncSession], request: Request
+) -> AsyncIterator[AsyncSession]:
+    """Async variant of the `begin_request_session`."""
+    if is_read_only_request(request):
+        async with session_factory(info={READ_ONLY_INFO_KEY: True}) as session:
+            route_reads_to_replica(session.sync_session, request)
+            yield session
+    else:
+        async with session_factory.begin() as session:
+            route_reads_to_replica(session.sync_session, request)
+            yield session
+
+
+engine = create_db_engine(settings.db_connection_string)
+replica_engines = [
+    create_db_engine(connection_string)
+    for connection_string in settings.db_replica_connection_strings
+]
+db_session = sessionmaker(
+    engine,
+    class_=RoutingSession,
+    expire_on_commit=False,
+    replicas=replica_engines,
+    read_only_bind=get_read_only_bind(engine),
+)
+
+async_engine = create_async_db_engine(settings.db_connection_string)
+async_replica_engines = [
+    create_async_db_engine(connection_string)
+    for connection_string in settings.db_replica_connection_strings
+]
+async_db_session = async_sessionmaker(
+    async_engine,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    replicas=[replica.sync_engine for replica in async_replica_engines],
+    read_only_bind=get_read_only_bind(async_engine.sync_engine),
+)
+
+
+def get_db_session(request: Request) -> Iterator[Session]:
     """Create and yield an SQLAlchemy database session.
 
     The session will be automatically committed in case of successful
-    processing of the request. Otherwise it will be rolledback.
+    processing of the request. Otherwise it will be rolledback. Read-only
+    requests use READ ONLY transactions, which are not committed, and their
+    reads are routed to a replica, if it is configured. Connection is checked
+    out from the pool only when the session executes the first statement.
 
     Yields:
         Iterator[Session]: SQLAlchemy session object
     """
-    with db_session.begin() as session:
+    with begin_request_session(db_session, request) as session:
+        yield session
+
+
+async def get_async_db_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Create and yield an SQLAlchemy async database session.
+
+    Works the same way as `get_db_session`, but the session uses asyncpg
+    driver, so the request does not hold a threadpool thread while waiting
+    for the database.
+
+    Yields:
+        AsyncIterator[AsyncSession]: SQLAlchemy async session object
+    """
+    async with begin_async_request_session(async_db_session, request) as session:
         yield session
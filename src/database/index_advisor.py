@@ -0,0 +1,297 @@
+"""Suggest indexes for the models and generate migration, which creates them.
+
+Suggestions are based on the model metadata:
+
+* foreign key columns, which are used by joins, relationship loads and
+  cascades of the referenced rows,
+* `SORTABLE_FIELDS`, which are used by the lists sorting,
+* `FILTERABLE_FIELDS` combined with `SORTABLE_FIELDS`, e.g. orders of the
+  user sorted by some field, which are served by one composite index,
+* `SEARCHABLE_FIELDS`, which are matched with `ILIKE '%pattern%'`. Btree
+  index can't serve such pattern, so GIN trigram indexes are suggested.
+
+Index is not suggested if its columns are already a leading part of some
+existing index of the same type, unique constraint or primary key.
+
+Usage:
+    poetry run python -m src.database.index_advisor [--database URL]
+        [--revision "added indexes"]
+
+Without `--database` existing indexes are taken from the model metadata,
+with it they are reflected from the database.
+"""
+import argparse
+from typing import Iterable, Mapping, NamedTuple, Sequence
+
+from alembic.autogenerate import render_python_code
+from alembic.config import Config
+from alembic.operations import ops
+from alembic.script import ScriptDirectory
+from alembic.util import rev_id
+from sqlalchemy import (
+    Column,
+    DateTime,
+    PrimaryKeyConstraint,
+    Table,
+    TextClause,
+    UniqueConstraint,
+    create_engine,
+    inspect,
+    text,
+)
+from sqlalchemy.orm import Mapper
+
+from src.database.models import Base
+from src.database.models.search import PG_TRGM_EXTENSION
+
+ALEMBIC_CONFIG_FILE = "alembic.ini"
+BTREE = "btree"
+GIN_TRIGRAM = "gin"
+
+
+class ExistingIndex(NamedTuple):
+    columns: Sequence[str]
+    using: str = BTREE
+
+
+class IndexSuggestion(NamedTuple):
+    table: str
+    columns: tuple[str, ...]
+    descending: frozenset[str]
+    reason: str
+    using: str = BTREE
+
+    @property
+    def name(self) -> str:
+        suffix = "_trgm" if self.using == GIN_TRIGRAM else ""
+        return f"ix_{self.table}_{'_'.join(self.columns)}{suffix}"
+
+    def to_operation(self) -> ops.CreateIndexOp:
+        if self.using == GIN_TRIGRAM:
+            return ops.CreateIndexOp(
+                self.name,
+                self.table,
+                list(self.columns),
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops" for column in self.columns},
+            )
+
+        columns: list[str | TextClause] = [
+            text(f"{column} DESC") if column in self.descending else column
+            for column in self.columns
+        ]
+        return ops.CreateIndexOp(self.name, self.table, columns)
+
+    def __str__(self) -> str:
+        columns = ", ".join(
+            f"{column} DESC" if column in self.descending else column
+            for column in self.columns
+        )
+        return f"{self.table} USING {self.using} ({columns}) -- {self.reason}"
+
+
+def get_metadata_indexes(table: Table) -> list[ExistingIndex]:
+    """Return indexes, unique constraints and primary key of the table.
+
+    Args:
+        table (Table): table from the model metadata
+
+    Returns:
+        list[ExistingIndex]: columns names of every index in the column order
+    """
+    indexes = [
+        ExistingIndex(
+            [column.name for column in index.columns],
+            index.dialect_options["postgresql"]["using"] or BTREE,
+        )
+        for index in table.indexes
+    ]
+    indexes.extend(
+        ExistingIndex([column.name for column in constraint.columns])
+        for constraint in table.constraints
+        if isinstance(constraint, (UniqueConstraint, PrimaryKeyConstraint))
+    )
+    return indexes
+
+
+def get_database_indexes(
+    connection_string: str, tables: Iterable[str]
+) -> Mapping[str, list[ExistingIndex]]:
+    """Reflect indexes, unique constraints and primary keys.
+
+    Args:
+        connection_string (str): database connection string
+        tables (Iterable[str]): names of the tables to inspect
+
+    Returns:
+        Mapping[str, list[ExistingIndex]]: existing indexes of every table
+    """
+    engine = create_engine(connection_string)
+    inspector = inspect(engine)
+    indexes: dict[str, list[ExistingIndex]] = {}
+
+    for table in tables:
+        table_indexes = [
+            ExistingIndex(
+                index["column_names"],  # type: ignore
+                index.get("dialect_options", {}).get("postgresql_using", BTREE),
+            )
+            for index in inspector.get_indexes(table)
+        ]
+        table_indexes.extend(
+            ExistingIndex(constraint["column_names"])
+            for constraint in inspector.get_unique_constraints(table)
+        )
+        table_indexes.append(
+            ExistingIndex(inspector.get_pk_constraint(table)["constrained_columns"])
+        )
+        indexes[table] = table_indexes
+
+    engine.dispose()
+    return indexes
+
+
+def is_covered(suggestion: IndexSuggestion, indexes: Iterable[ExistingIndex]):
+    """Check whether some index of the same type starts with the given columns."""
+    return any(
+        index.using == suggestion.using
+        and list(index.columns[: len(suggestion.columns)]) == list(suggestion.columns)
+        for index in indexes
+    )
+
+
+def suggest_indexes(
+    mappers: Iterable[Mapper],
+    existing_indexes: Mapping[str, list[ExistingIndex]] | None = None,
+) -> list[IndexSuggestion]:
+    """Suggest missing indexes for the models.
+
+    Args:
+        mappers (Iterable[Mapper]): mappers of the models
+        existing_indexes (Mapping[str, list[ExistingIndex]] | None, optional):
+            existing indexes of every table, taken from metadata if None
+
+    Returns:
+        list[IndexSuggestion]: suggested indexes, composite ones first
+    """
+    suggestions: list[IndexSuggestion] = []
+
+    for mapper in mappers:
+        table: Table = mapper.local_table  # type: ignore
+        indexes = list(
+            existing_indexes[table.name]
+            if existing_indexes is not None
+            else get_metadata_indexes(table)
+        )
+
+        for suggestion in _get_table_candidates(mapper.class_, table):
+            if not is_covered(suggestion, indexes):
+                suggestions.append(suggestion)
+                indexes.append(ExistingIndex(suggestion.columns, suggestion.using))
+
+    return suggestions
+
+
+def _get_table_candidates(model: type, table: Table) -> list[IndexSuggestion]:
+    filterable = _get_columns(table, getattr(model, "FILTERABLE_FIELDS", ()))
+    sortable = _get_columns(table, getattr(model, "SORTABLE_FIELDS", ()))
+    candidates = [
+        IndexSuggestion(
+            table.name,
+            (filter_column.name, sort_column.name),
+            _get_descending_columns([sort_column]),
+            f"filter by {filter_column.name}, sort by {sort_column.name}",
+        )
+        for filter_column in filterable
+        for sort_column in sortable
+    ]
+    candidates.extend(
+        IndexSuggestion(table.name, (fk.parent.name,), frozenset(), "foreign key")
+        for fk in sorted(table.foreign_keys, key=lambda fk: fk.parent.name)
+    )
+    # lists of the models with filterable fields are always filtered
+    if not filterable:
+        candidates.extend(
+            IndexSuggestion(table.name, (column.name,), frozenset(), "sortable field")
+            for column in sortable
+        )
+
+    candidates.extend(
+        IndexSuggestion(
+            table.name, (column.name,), frozenset(), "searchable field", GIN_TRIGRAM
+        )
+        for column in _get_columns(table, getattr(model, "SEARCHABLE_FIELDS", ()))
+    )
+    return candidates
+
+
+def _get_columns(table: Table, field_names: Iterable[str]) -> list[Column]:
+    # lists get the fields from the model, so they may be expressions, e.g.
+    # hybrid or column properties, which have no table column to index
+    return [
+        table.columns[name] for name in sorted(field_names) if name in table.columns
+    ]
+
+
+def _get_descending_columns(columns: Iterable[Column]) -> frozenset[str]:
+    # lists sorted by time usually show the most recent rows first
+    return frozenset(
+        column.name for column in columns if isinstance(column.type, DateTime)
+    )
+
+
+def create_revision(suggestions: list[IndexSuggestion], message: str) -> None:
+    """Generate alembic revision, which creates the suggested indexes."""
+    upgrade_ops = ops.UpgradeOps(
+        [suggestion.to_operation() for suggestion in suggestions]
+    )
+
+    if any(suggestion.using == GIN_TRIGRAM for suggestion in suggestions):
+        upgrade_ops.ops.insert(
+            0, ops.ExecuteSQLOp(f"CREATE EXTENSION IF NOT EXISTS {PG_TRGM_EXTENSION}")
+        )
+
+    downgrade_ops = ops.DowngradeOps(
+        [
+            ops.DropIndexOp(suggestion.name, suggestion.table)
+            for suggestion in reversed(suggestions)
+        ]
+    )
+
+    script_directory = ScriptDirectory.from_config(Config(ALEMBIC_CONFIG_FILE))
+    script_directory.generate_revision(
+        rev_id(),
+        message,
+        head="head",
+        upgrades=render_python_code(upgrade_ops),
+        downgrades=render_python_code(downgrade_ops),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--database", help="inspect indexes of this database")
+    parser.add_argument("--revision", help="generate migration with this message")
+    args = parser.parse_args()
+
+    mappers = sorted(Base.registry.mappers, key=lambda mapper: mapper.class_.__name__)
+    existing_indexes = None
+
+    if args.database:
+        existing_indexes = get_database_indexes(
+            args.database, [mapper.local_table.name for mapper in mappers]
+        )
+
+    suggestions = suggest_indexes(mappers, existing_indexes)
+
+    print("Suggested indexes:")
+    print("\n".join(f"  {suggestion}" for suggestion in suggestions) or "  none")
+
+    if args.revision and suggestions:
+        create_revision(suggestions, args.revision)
+
+
+if __name__ == "__main__":
+    main()
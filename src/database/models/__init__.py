@@ -6,6 +6,7 @@ from .order import Order
 from .order_item import OrderItem
 from .user import User
 from .employee_profile import EmployeeProfile
+from .revoked_token import RevokedToken
 
 __all__ = [
     "Address",
@@ -15,5 +16,6 @@ __all__ = [
     "Category",
     "User",
     "EmployeeProfile",
+    "RevokedToken",
     "Base",
 ]
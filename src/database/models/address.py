@@ -1,9 +1,29 @@
-from sqlalchemy import ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+import hashlib
+from typing import Any
+
+from sqlalchemy import ForeignKey, Index, String, event
+from sqlalchemy.orm import Mapped, WriteOnlyMapped, mapped_column, relationship
 
 from src.database.models import Base
 from src.database.models.types import timestamp
 
+FINGERPRINT_LENGTH = 32
+
+
+def get_address_fingerprint(
+    city: str, street: str, street_number: int, postal_code: str
+) -> str:
+    """Return fingerprint of the address, which ignores case and extra spaces.
+
+    Changing the normalization requires a migration, which recomputes the
+    stored fingerprints.
+    """
+    normalized_address = "\x1f".join(
+        " ".join(str(part).split()).casefold()
+        for part in (city, street, street_number, postal_code)
+    )
+    return hashlib.sha256(normalized_address.encode()).hexdigest()[:FINGERPRINT_LENGTH]
+
 
 class Address(Base):
     __tablename__ = "addresses"
@@ -13,13 +33,38 @@ class Address(Base):
     street: Mapped[str] = mapped_column(nullable=False)
     street_number: Mapped[int] = mapped_column(nullable=False)
     postal_code: Mapped[str] = mapped_column(nullable=False)
+    # maintained on every flush of the address, see `update_fingerprint`
+    fingerprint: Mapped[str] = mapped_column(String(FINGERPRINT_LENGTH), nullable=False)
     user: Mapped["User"] = relationship(back_populates="addresses")
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     created_at: Mapped[timestamp]
-    orders: Mapped[list["Order"]] = relationship(back_populates="delivery_address")
+    orders: WriteOnlyMapped["Order"] = relationship(
+        back_populates="delivery_address", passive_deletes=True
+    )
+
+    FILTERABLE_FIELDS = {"user_id"}
+    SORTABLE_FIELDS = {"created_at"}
 
     @property
     def full_address(self):
         return f"{self.street}, {self.street_number}, {self.postal_code}, {self.city}"
+
+
+Index("ix_addresses_user_id_created_at", Address.user_id, Address.created_at.desc())
+# addresses are deduplicated by `INSERT ... ON CONFLICT` on this index
+Index(
+    "ix_addresses_user_id_fingerprint",
+    Address.user_id,
+    Address.fingerprint,
+    unique=True,
+)
+
+
+@event.listens_for(Address, "before_insert")
+@event.listens_for(Address, "before_update")
+def update_fingerprint(mapper: Any, connection: Any, address: Address) -> None:
+    address.fingerprint = get_address_fingerprint(
+        address.city, address.street, address.street_number, address.postal_code
+    )
@@ -1,5 +1,15 @@
+from sqlalchemy import event
 from sqlalchemy.orm import DeclarativeBase
 
+from src.database.models.search import create_pg_trgm_extension, is_pg_trgm_available
+
 
 class Base(DeclarativeBase):
     pass
+
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    create_pg_trgm_extension.execute_if(callable_=is_pg_trgm_available),
+)
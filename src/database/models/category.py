@@ -1,7 +1,8 @@
 from sqlalchemy import String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, WriteOnlyMapped, mapped_column, relationship
 
 from src.database.models import Base
+from src.database.models.search import create_trigram_index
 from src.database.models.constants import MAX_CATEGORY_NAME_LENGTH
 
 
@@ -12,7 +13,12 @@ class Category(Base):
     name: Mapped[str] = mapped_column(
         String(MAX_CATEGORY_NAME_LENGTH), unique=True, nullable=False
     )
-    products: Mapped[list["Product"]] = relationship(back_populates="category")
+    products: WriteOnlyMapped["Product"] = relationship(
+        back_populates="category", passive_deletes=True
+    )
 
     SEARCHABLE_FIELDS = {"name"}
     SORTABLE_FIELDS = {"name"}
+
+
+create_trigram_index(Category.name)
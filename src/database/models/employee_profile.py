@@ -11,5 +11,7 @@ class EmployeeProfile(Base):
     salary: Mapped[float] = mapped_column(Numeric(7, 2), nullable=False)
     available_holidays: Mapped[int]
     hire_date: Mapped[date] = mapped_column(nullable=True)
-    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
     user: Mapped["User"] = relationship(back_populates="employee_profile")
@@ -1,9 +1,13 @@
 from enum import Enum
+from itertools import chain
+from typing import Any
 
-from sqlalchemy import ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey, Index, Numeric, event
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
+from sqlalchemy.orm.attributes import get_history
 
 from src.database.models import Base
+from src.database.models.order_item import OrderItem
 from src.database.models.types import timestamp
 
 
@@ -31,14 +35,46 @@ class Order(Base):
         lazy="selectin",
     )
     address_id: Mapped[int] = mapped_column(
-        ForeignKey("addresses.id", ondelete="SET NULL"), nullable=False
+        ForeignKey("addresses.id", ondelete="SET NULL"), nullable=False, index=True
     )
     delivery_address: Mapped["Address"] = relationship(
         back_populates="orders", lazy="selectin"
     )
 
+    FILTERABLE_FIELDS = {"user_id"}
     SORTABLE_FIELDS = {"total_price"}
 
-    @property
-    def total_price(self):
-        return sum([item.product_price * item.quantity for item in self.order_items])
+    # maintained on every flush of the order items, see `update_total_prices`
+    total_price: Mapped[float] = mapped_column(
+        Numeric(10, 2), nullable=False, default=0, server_default="0"
+    )
+
+
+Index("ix_orders_user_id_total_price", Order.user_id, Order.total_price)
+
+
+@event.listens_for(Session, "before_flush")
+def update_total_prices(session: Session, flush_context: Any, instances: Any) -> None:
+    """Update stored total price of the orders, whose items are being flushed.
+
+    Items of the changed orders are already loaded in most cases, e.g. when
+    the order is created, so usually no additional queries are executed.
+    """
+    changed_objects = list(chain(session.new, session.dirty, session.deleted))
+    orders = {
+        order
+        for order in changed_objects
+        if isinstance(order, Order) and get_history(order, "order_items").has_changes()
+    }
+    orders.update(
+        item.order
+        for item in changed_objects
+        if isinstance(item, OrderItem) and item.order is not None
+    )
+
+    for order in orders:
+        order.total_price = sum(
+            item.product_price * item.quantity
+            for item in order.order_items
+            if item not in session.deleted
+        )
@@ -12,7 +12,9 @@ class OrderItem(Base):
     order_id: Mapped[int] = mapped_column(
         ForeignKey("orders.id", ondelete="CASCADE"), nullable=False
     )
-    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False)
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id"), nullable=False, index=True
+    )
     product: Mapped["Product"] = relationship(back_populates="order_items")
     quantity: Mapped[int] = mapped_column(nullable=False)
     product_price: Mapped[float] = mapped_column(Numeric(6, 2), nullable=False)
@@ -1,9 +1,10 @@
 from typing import Optional
 
 from sqlalchemy import ForeignKey, Numeric, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, WriteOnlyMapped, mapped_column, relationship
 
 from src.database.models import Base
+from src.database.models.search import create_trigram_index
 from src.database.models.constants import MAX_PRODUCT_NAME_LENGTH
 
 
@@ -15,13 +16,18 @@ class Product(Base):
         String(MAX_PRODUCT_NAME_LENGTH), unique=True, nullable=False
     )
     summary: Mapped[Optional[str]] = mapped_column(Text)
-    price: Mapped[float] = mapped_column(Numeric(6, 2), nullable=False)
+    price: Mapped[float] = mapped_column(Numeric(6, 2), nullable=False, index=True)
     image_file: Mapped[Optional[str]] = mapped_column(nullable=True)
     category: Mapped["Category"] = relationship(back_populates="products")
-    order_items: Mapped[list["OrderItem"]] = relationship(back_populates="product")
+    order_items: WriteOnlyMapped["OrderItem"] = relationship(
+        back_populates="product", passive_deletes=True
+    )
     category_id: Mapped[int] = mapped_column(
-        ForeignKey("categories.id"), nullable=False
+        ForeignKey("categories.id"), nullable=False, index=True
     )
 
     SEARCHABLE_FIELDS = {"name"}
     SORTABLE_FIELDS = {"name", "price"}
+
+
+create_trigram_index(Product.name)
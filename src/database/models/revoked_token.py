@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.models import Base
+from src.database.models.types import timestamp
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # ids grow with the revocations, so workers read only the new ones
+    id: Mapped[int] = mapped_column(primary_key=True)
+    jti: Mapped[str] = mapped_column(unique=True)
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+    revoked_at: Mapped[timestamp]
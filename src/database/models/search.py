@@ -0,0 +1,48 @@
+from typing import Any
+
+from sqlalchemy import DDL, Index, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import InstrumentedAttribute
+
+PG_TRGM_EXTENSION = "pg_trgm"
+
+create_pg_trgm_extension = DDL(f"CREATE EXTENSION IF NOT EXISTS {PG_TRGM_EXTENSION}")
+
+
+def is_pg_trgm_available(
+    ddl: Any, target: Any, bind: Connection | None, *args: Any, **kwargs: Any
+) -> bool:
+    """Check whether the database server ships the pg_trgm extension.
+
+    Trigram indexes are skipped by `create_all` on the servers without it,
+    e.g. minimal local builds. Searches still work there, but scan the table.
+    DDL compiled without a connection includes the indexes.
+    """
+    if bind is None:
+        return True
+
+    return bool(
+        bind.scalar(
+            text(
+                "SELECT EXISTS (SELECT FROM pg_available_extensions WHERE name = :name)"
+            ),
+            {"name": PG_TRGM_EXTENSION},
+        )
+    )
+
+
+def create_trigram_index(column: InstrumentedAttribute) -> Index:
+    """Create GIN trigram index, which serves `ILIKE '%pattern%'` searches.
+
+    Args:
+        column (InstrumentedAttribute): searchable model column
+
+    Returns:
+        Index: index on the column using `gin_trgm_ops` operator class
+    """
+    return Index(
+        f"ix_{column.class_.__tablename__}_{column.key}_trgm",
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column.key: "gin_trgm_ops"},
+    ).ddl_if(callable_=is_pg_trgm_available)
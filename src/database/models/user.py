@@ -3,34 +3,47 @@ from typing import Optional
 
 from passlib.context import CryptContext
 from sqlalchemy import String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, WriteOnlyMapped, mapped_column, relationship
 from sqlalchemy.sql import expression
 
 from src.database.models import Base
+from src.database.models.search import create_trigram_index
 from src.database.models.constants import MAX_FIRST_NAME_LENGTH, MAX_LAST_NAME_LENGTH
 from src.database.models.types import timestamp
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
 class User(Base):
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(primary_key=True)
     email: Mapped[str] = mapped_column(unique=True)
     password_hash: Mapped[str]
-    first_name: Mapped[str] = mapped_column(String(MAX_FIRST_NAME_LENGTH))
-    last_name: Mapped[str] = mapped_column(String(MAX_LAST_NAME_LENGTH))
+    first_name: Mapped[str] = mapped_column(String(MAX_FIRST_NAME_LENGTH), index=True)
+    last_name: Mapped[str] = mapped_column(String(MAX_LAST_NAME_LENGTH), index=True)
     phone_number: Mapped[Optional[str]] = mapped_column(nullable=True)
     is_admin: Mapped[bool] = mapped_column(server_default=expression.false())
     is_employee: Mapped[bool] = mapped_column(server_default=expression.false())
-    registered_at: Mapped[timestamp]
-    last_login_date: Mapped[timestamp]
+    registered_at: Mapped[timestamp] = mapped_column(index=True)
+    last_login_date: Mapped[timestamp] = mapped_column(index=True)
     birth_date: Mapped[Optional[date]] = mapped_column(nullable=True)
-    addresses: Mapped[list["Address"]] = relationship(
+    # collections may be large, so they are never loaded as a whole, use
+    # `user.orders.select()` to query them
+    addresses: WriteOnlyMapped["Address"] = relationship(
         back_populates="user", cascade="all, delete", passive_deletes=True
     )
-    orders: Mapped[list["Order"]] = relationship(back_populates="user")
+    orders: WriteOnlyMapped["Order"] = relationship(
+        back_populates="user", passive_deletes=True
+    )
     employee_profile: Mapped["EmployeeProfile"] = relationship(
         back_populates="user", cascade="all, delete-orphan"
     )
@@ -47,7 +60,13 @@ class User(Base):
         self.password_hash = self._get_password_hash(password)
 
     def verify_password(self, plain_password, hashed_password):
-        return pwd_context.verify(plain_password, hashed_password)
+        return verify_password(plain_password, hashed_password)
 
     def _get_password_hash(self, password):
-        return pwd_context.hash(password)
+        return hash_password(password)
+
+
+create_trigram_index(User.email)
+create_trigram_index(User.first_name)
+create_trigram_index(User.last_name)
+create_trigram_index(User.phone_number)
@@ -0,0 +1,171 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+CHECKOUT_WAIT_TIME_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+PoolStats = Mapping[str, Any]
+
+
+class Histogram:
+    """Histogram with fixed buckets.
+
+    Each bucket counts observations which are greater than the previous bucket
+    upper bound and less than or equal to its own one. The last bucket has no
+    upper bound.
+    """
+
+    def __init__(self, upper_bounds: Sequence[float]) -> None:
+        self.upper_bounds = tuple(upper_bounds)
+        self.counts = [0] * (len(self.upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        upper_bounds: list[float | None] = [*self.upper_bounds, None]
+        return {
+            "buckets": [
+                {"upper_bound": upper_bound, "count": count}
+                for upper_bound, count in zip(upper_bounds, self.counts)
+            ],
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
+class PoolMetrics:
+    """Connection pool usage metrics.
+
+    Metrics are updated from the pool events and from the instrumented pool
+    classes, which can be accessed from different threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkout_wait_time = Histogram(CHECKOUT_WAIT_TIME_BUCKETS)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.connections_created = 0
+        self.max_checked_out = 0
+
+    def record_checkout_wait_time(self, wait_time: float) -> None:
+        with self._lock:
+            self.checkout_wait_time.observe(wait_time)
+
+    def record_checkout_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def record_checkout(self, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.max_checked_out = max(self.max_checked_out, checked_out)
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connections_created += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "connections_created": self.connections_created,
+                "max_checked_out": self.max_checked_out,
+                "checkout_wait_time": self.checkout_wait_time.snapshot(),
+            }
+
+
+class InstrumentedPoolMixin:
+    """Pool mixin which measures how long the checkout waits for a connection.
+
+    Pool events are fired only after the connection was checked out, so the
+    waiting time can't be measured by the event listeners.
+    """
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> Any:
+        pool = super().recreate()  # type: ignore
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+
+        try:
+            connection_record = super()._do_get()  # type: ignore
+        except exc.TimeoutError:
+            self.metrics.record_checkout_timeout()
+            raise
+
+        self.metrics.record_checkout_wait_time(time.perf_counter() - start)
+        return connection_record
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine_pool(engine: Engine) -> None:
+    """Subscribe engine pool metrics to the pool events.
+
+    Args:
+        engine (Engine): engine, which uses one of the instrumented pool classes
+    """
+
+    @event.listens_for(engine, "connect")
+    def receive_connect(*args: Any) -> None:
+        engine.pool.metrics.record_connect()  # type: ignore
+
+    @event.listens_for(engine, "checkout")
+    def receive_checkout(*args: Any) -> None:
+        engine.pool.metrics.record_checkout(engine.pool.checkedout())  # type: ignore
+
+
+def get_pool_stats(pool: Pool) -> PoolStats:
+    """Return current pool state together with the collected metrics.
+
+    Args:
+        pool (Pool): instrumented queue pool
+
+    Returns:
+        PoolStats: pool statistics
+    """
+    return {
+        "size": pool.size(),  # type: ignore
+        "checked_in": pool.checkedin(),  # type: ignore
+        "checked_out": pool.checkedout(),  # type: ignore
+        "overflow": max(pool.overflow(), 0),  # type: ignore
+        **pool.metrics.snapshot(),  # type: ignore
+    }
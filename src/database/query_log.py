@@ -0,0 +1,172 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+QUERY_START_TIME_INFO_KEY = "query_start_time"
+EXPLAINABLE_STATEMENTS = ("SELECT", "WITH")
+EXPLAIN_SAVEPOINT_NAME = "query_log_explain"
+
+SlowQueryRecord = Mapping[str, Any]
+
+
+def get_parameters_shape(parameters: Any) -> Any:
+    """Return bound parameters with their values replaced by type names.
+
+    Values are not logged, since they may contain personal data.
+
+    Args:
+        parameters (Any): DBAPI parameters, either mapping or sequence
+
+    Returns:
+        Any: parameters shape, e.g. {"email": "str", "id": "int"}
+    """
+    if isinstance(parameters, Mapping):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+
+    if isinstance(parameters, Sequence) and not isinstance(parameters, str):
+        return [type(value).__name__ for value in parameters]
+
+    return type(parameters).__name__
+
+
+class QueryLogger:
+    """Log slow and sampled fast SQL queries.
+
+    Queries, which take longer than `slow_query_threshold` seconds, are logged
+    and stored in memory together with the shape of their bound parameters.
+    Other queries are logged with `fast_query_sample_rate` probability. When
+    `explain_enabled` is set, SELECT queries slower than `explain_threshold`
+    seconds are executed once more with EXPLAIN (ANALYZE, BUFFERS) in a rolled
+    back savepoint and the plan is stored along with the query.
+    """
+
+    def __init__(
+        self,
+        slow_query_threshold: float,
+        fast_query_sample_rate: float = 0,
+        explain_threshold: float | None = None,
+        explain_enabled: bool = False,
+        max_stored_queries: int = 100,
+    ) -> None:
+        self.slow_query_threshold = slow_query_threshold
+        self.fast_query_sample_rate = fast_query_sample_rate
+        self.explain_threshold = explain_threshold
+        self.explain_enabled = explain_enabled
+        self._slow_queries: deque[SlowQueryRecord] = deque(maxlen=max_stored_queries)
+        self._lock = threading.Lock()
+
+    def instrument(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def get_slow_queries(self) -> list[SlowQueryRecord]:
+        """Return stored slow queries, the most recent ones first."""
+        with self._lock:
+            return list(reversed(self._slow_queries))
+
+    def _before_cursor_execute(self, conn: Connection, *args: Any) -> None:
+        conn.info.setdefault(QUERY_START_TIME_INFO_KEY, []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        duration = time.perf_counter() - conn.info[QUERY_START_TIME_INFO_KEY].pop()
+
+        if duration >= self.slow_query_threshold:
+            self._log_slow_query(conn, statement, parameters, duration, executemany)
+        elif (
+            self.fast_query_sample_rate
+            and random.random() < self.fast_query_sample_rate
+        ):
+            logger.info(
+                "Sampled query (%.4fs): %s; parameters: %s",
+                duration,
+                statement,
+                self._get_parameters_shape(parameters, executemany),
+            )
+
+    def _log_slow_query(
+        self,
+        conn: Connection,
+        statement: str,
+        parameters: Any,
+        duration: float,
+        executemany: bool,
+    ) -> None:
+        parameters_shape = self._get_parameters_shape(parameters, executemany)
+        explain_plan = None
+
+        if self._should_explain(statement, duration, executemany):
+            explain_plan = self._explain(conn, statement, parameters)
+
+        logger.warning(
+            "Slow query (%.4fs): %s; parameters: %s%s",
+            duration,
+            statement,
+            parameters_shape,
+            f"\n{explain_plan}" if explain_plan else "",
+        )
+
+        with self._lock:
+            self._slow_queries.append(
+                {
+                    "statement": statement,
+                    "parameters_shape": parameters_shape,
+                    "duration": duration,
+                    "recorded_at": datetime.utcnow(),
+                    "explain_plan": explain_plan,
+                }
+            )
+
+    def _should_explain(self, statement: str, duration: float, executemany: bool):
+        # EXPLAIN ANALYZE executes the statement, so only reads can be explained
+        return (
+            self.explain_enabled
+            and self.explain_threshold is not None
+            and duration >= self.explain_threshold
+            and not executemany
+            and statement.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS)
+        )
+
+    def _explain(self, conn: Connection, statement: str, parameters: Any) -> str | None:
+        # DBAPI cursor is used directly, so the EXPLAIN does not fire the events.
+        # EXPLAIN ANALYZE executes the statement once more, e.g. the INSERT of
+        # a data-modifying WITH query. Savepoint is always rolled back, so the
+        # EXPLAIN changes no data and the request transaction stays usable.
+        cursor = conn.connection.dbapi_connection.cursor()  # type: ignore
+
+        try:
+            cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT_NAME}")
+
+            try:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                return "\n".join(row[0] for row in cursor.fetchall())
+            except Exception:
+                logger.exception("Failed to explain the slow query.")
+                return None
+            finally:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT_NAME}")
+                cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT_NAME}")
+        finally:
+            cursor.close()
+
+    def _get_parameters_shape(self, parameters: Any, executemany: bool) -> Any:
+        if executemany:
+            return [get_parameters_shape(item) for item in parameters[:1]]
+
+        return get_parameters_shape(parameters)
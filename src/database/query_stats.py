@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+STATEMENT_START_TIME_INFO_KEY = "query_stats_start_time"
+
+current_query_stats: ContextVar["QueryStats | None"] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+class QueryStats:
+    """Number and total duration of SQL statements executed in some scope.
+
+    Statements are counted by their SQL text, which contains placeholders
+    instead of the parameter values, so statements repeated with different
+    parameters, e.g. lazy loads in a loop, are counted together.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.statements[statement] += 1
+
+    def get_repeated_statements(self, threshold: int) -> dict[str, int]:
+        """Return statements executed at least `threshold` times.
+
+        Args:
+            threshold (int): minimal number of executions of the statement
+
+        Returns:
+            dict[str, int]: statement text mapped to the number of executions
+        """
+        with self._lock:
+            return {
+                statement: count
+                for statement, count in self.statements.items()
+                if count >= threshold
+            }
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    """Collect stats of the statements executed in the current context.
+
+    Context is copied to the threadpool threads and SQLAlchemy greenlets, so
+    statements of both sync and async sessions are collected.
+
+    Yields:
+        Iterator[QueryStats]: stats, which are updated until the block exits
+    """
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+class QueryStatsRecorder:
+    """Record statements executed by engines to the stats returned by `get_stats`.
+
+    By default statements are recorded to the stats of the current context,
+    see `collect_query_stats`.
+    """
+
+    def __init__(
+        self, get_stats: Callable[[], QueryStats | None] = current_query_stats.get
+    ) -> None:
+        self.get_stats = get_stats
+
+    def instrument(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def remove(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn: Connection, *args: Any) -> None:
+        conn.info.setdefault(STATEMENT_START_TIME_INFO_KEY, []).append(
+            time.perf_counter()
+        )
+
+    def _after_cursor_execute(
+        self, conn: Connection, cursor: Any, statement: str, *args: Any
+    ) -> None:
+        start_time = conn.info[STATEMENT_START_TIME_INFO_KEY].pop()
+
+        if (stats := self.get_stats()) is not None:
+            stats.record(statement, time.perf_counter() - start_time)
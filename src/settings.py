@@ -1,4 +1,5 @@
 from datetime import timedelta
+from typing import Optional
 
 from pydantic import BaseSettings, Field
 
@@ -10,6 +11,7 @@ class Settings(BaseSettings):
     host: str = Field("127.0.0.1")
     port: str = Field("8080")
     db_connection_string: str
+    db_replica_connection_strings: list[str] = []
     test_db_connection_string: str
     secret_key: str = "secret"
     access_token_lifetime: timedelta = timedelta(days=5)
@@ -18,10 +20,81 @@ class Settings(BaseSettings):
     expiration_time_claim_name: str = "exp"
     issued_at_time_claim_name: str = "iat"
     user_id_claim_name: str = "user_id"
+    admin_claim_name: str = "is_admin"
+    employee_claim_name: str = "is_employee"
+    token_id_claim_name: str = "jti"
     static_folder_path: str = "src/static/"
     base_templates_folder_path: str = "src/templates"
     suppress_send: int = 1
 
+    # Database connection pool conf, applied to every uvicorn worker
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = -1
+    db_pool_pre_ping: bool = False
+    # asyncpg server-side prepared statements cache size per connection
+    db_prepared_statement_cache_size: int = 100
+
+    # SQL queries logging conf, thresholds are in seconds
+    db_echo: bool = False
+    slow_query_threshold: float = 0.2
+    fast_query_sample_rate: float = 0.0
+    explain_slow_queries: bool = False
+    explain_threshold: float = 1.0
+    max_stored_slow_queries: int = 100
+    # statement executed so many times in one request is reported as N+1 query
+    repeated_query_threshold: int = 5
+
+    # Page totals of the `cached` count strategy, TTL is in seconds
+    count_cache_ttl: float = 30
+    count_cache_max_size: int = 1000
+
+    # Cache of the rarely changed lists, `memory://` or `redis://...`, TTL is in
+    # seconds, max size is the number of results of the in-process cache
+    result_cache_url: Optional[str] = None
+    result_cache_ttl: float = 60
+    result_cache_max_size: int = 1000
+
+    # Authenticated users are restored from this cache without the query, TTL is
+    # in seconds and bounds staleness of the users changed by other processes
+    authenticated_user_cache_ttl: float = 10
+    authenticated_user_cache_max_size: int = 10000
+
+    # Last login dates are written every flush interval, logins within the
+    # update interval after the stored one are skipped, both are in seconds
+    last_login_flush_interval: float = 10
+    last_login_update_interval: float = 60
+
+    # Cache-Control of the conditional GET routes, overridden by the route name
+    default_cache_control: str = "private, no-cache"
+    route_cache_control: dict[str, str] = {}
+
+    # Number of the verified JWT payloads, which are reused until they expire
+    verified_token_cache_max_size: int = 10000
+    # Access tokens carry the roles of the user, which authorize the requests
+    # without loading the user. Roles may be stale for the access token lifetime.
+    claims_only_authentication: bool = False
+
+    # Revoked token ids are refreshed from the database every refresh interval
+    # and the expired ones are dropped every rebuild interval, both in seconds
+    revoked_tokens_refresh_interval: float = 10
+    revoked_tokens_rebuild_interval: float = 3600
+    revoked_tokens_capacity: int = 100000
+    revoked_tokens_false_positive_rate: float = 0.01
+
+    # Passwords are hashed by the pool of processes, further hashings are
+    # rejected when so many of them are already waiting
+    password_hasher_workers: int = 2
+    password_hasher_max_pending: int = 64
+
+    # Number of rows fetched from the server-side cursor at once by exports
+    export_batch_size: int = 1000
+
+    # Clients are pinned to the primary database after writes to read their changes
+    primary_pin_cookie_name: str = "primary_pin"
+    primary_pin_lifetime: timedelta = timedelta(seconds=5)
+
     # Email conf
     mail_username: str
     mail_password: str